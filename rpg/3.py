@@ -1,5 +1,10 @@
 import random
 
+from content import base_stats, catalog
+
+CONTENT = catalog()
+
+
 # Base Character Class
 class Character:
     def __init__(self, name, hp, attack, defense, level=1, experience=0, inventory=None):
@@ -51,19 +56,19 @@ class Character:
 # Specific Character Classes
 class Warrior(Character):
     def __init__(self, name):
-        super().__init__(name, 120, 25, 10)
+        super().__init__(name, *base_stats("Warrior"))
 
 class Mage(Character):
     def __init__(self, name):
-        super().__init__(name, 80, 35, 5)
+        super().__init__(name, *base_stats("Mage"))
 
 class Rogue(Character):
     def __init__(self, name):
-        super().__init__(name, 90, 30, 8)
+        super().__init__(name, *base_stats("Rogue"))
 
 class Archer(Character):
     def __init__(self, name):
-        super().__init__(name, 85, 28, 7)
+        super().__init__(name, *base_stats("Archer"))
 
 # Item Classes
 class Item:
@@ -78,37 +83,43 @@ class Item:
                 character.hp = character.max_hp
             print(f"{character.name} heals for {self.effect['value']} HP. Total HP: {character.hp}")
 
-class HealingPotion(Item):
+class Potion(Item):
+    """A healing Item named and sized by the content catalog's potions"""
+    def __init__(self, potion_id):
+        potion = CONTENT.potions[potion_id]
+        super().__init__(potion.name, {'type': 'heal', 'value': potion.effects['heal']})
+
+class HealingPotion(Potion):
     def __init__(self):
-        super().__init__("Healing Potion", {'type': 'heal', 'value': 20})
+        super().__init__("HealingPotion")
 
-class SuperHealingPotion(Item):
+class SuperHealingPotion(Potion):
     def __init__(self):
-        super().__init__("Super Healing Potion", {'type': 'heal', 'value': 50})
+        super().__init__("SuperHealingPotion")
 
 # Enemy Classes
 class Goblin(Character):
     def __init__(self):
-        super().__init__("Goblin", 60, 15, 5)
+        super().__init__("Goblin", *base_stats("Goblin"))
 
 class Orc(Character):
     def __init__(self):
-        super().__init__("Orc", 80, 20, 10)
+        super().__init__("Orc", *base_stats("Orc"))
 
 class Dragon(Character):
     def __init__(self):
-        super().__init__("Dragon", 200, 40, 20)
+        super().__init__("Dragon", *base_stats("Dragon"))
 
 class Bandit(Character):
     def __init__(self):
-        super().__init__("Bandit", 70, 18, 8)
+        super().__init__("Bandit", *base_stats("Bandit"))
 
 # Game Class
 class Game:
     def __init__(self):
         self.player = self.create_character()
         self.enemies = [Goblin(), Orc(), Bandit(), Dragon()]
-        self.shop_items = [HealingPotion(), SuperHealingPotion()]
+        self.shop_items = [Potion(potion_id) for potion_id in CONTENT.potions]
         self.quests = [
             {"name": "Defeat the Goblin", "enemy": self.enemies[0], "reward": 10},
             {"name": "Retrieve the Magic Amulet from the Orc", "enemy": self.enemies[1], "reward": 20},
@@ -1,53 +1,78 @@
+import copy
 import random
+from collections import namedtuple
+
+from content import base_stats, catalog, thaw
+from journal import FSYNC_CHECKPOINT, FSYNC_POLICIES, Journal
+from stats import Stats
 
 class GameException(Exception):
     """Custom exception class for game-specific errors"""
     pass
+
+CONTENT = catalog()
+
 # List of actions and descriptions
-ACTIONS = {
-    'normal': {'type': 'physical', 'power': 1.0, 'accuracy': 1.0},  # Add normal attack
-    'slash': {'type': 'physical', 'power': 1.2, 'accuracy': 0.9},
-    'fireball': {'type': 'magical', 'power': 1.5, 'accuracy': 0.8},
-    'heal': {'type': 'support', 'power': 0.3, 'accuracy': 1.0},
-    'dodge': {'type': 'defense', 'power': 0.5, 'accuracy': 0.7}
-}
+ACTIONS = CONTENT.actions
 
 # Combat modifiers
-COMBAT_MODIFIERS = {
-    'critical': 1.5,
-    'miss': 0,
-    'normal': 1.0,
-    'weather_bonus': 1.2,
-    'terrain_penalty': 0.8
-}
+COMBAT_MODIFIERS = CONTENT.combat_modifiers
 
 # Status effects
-STATUS_EFFECTS = {
-    'poison': {'damage': 5, 'duration': 3},
-    'burn': {'damage': 8, 'duration': 2},
-    'freeze': {'damage': 0, 'duration': 2},
-    'stun': {'damage': 0, 'duration': 1}
-}
+STATUS_EFFECTS = CONTENT.status_effects
+
+# Turns that stat buffs last: special moves, and item buffs such as potions
+SPECIAL_BUFF_TURNS = 3
+ITEM_BUFF_TURNS = 5
 
 # Environment conditions
-ENVIRONMENT = {
-    'day': {'attack': 1.1, 'defense': 1.0},
-    'night': {'attack': 0.9, 'defense': 1.1},
-    'rain': {'speed': 0.8, 'accuracy': 0.9},
-    'sunny': {'speed': 1.2, 'accuracy': 1.1}
-}
+ENVIRONMENT = CONTENT.environment
+
+# Every modifier that applies under one set of conditions, folded together:
+# attacks maps attack type -> (damage factor, hit chance), defense scales
+# the defense stat
+CompiledModifiers = namedtuple("CompiledModifiers", ["attacks", "defense"])
+
+# (class, environment, weather) -> CompiledModifiers, shared by every character
+_compiled_modifiers = {}
+
+
+def compile_modifiers(cls, environment, weather=None):
+    """Fold a class's actions with environment and weather modifiers, once per combination"""
+    key = (cls, environment, weather)
+    compiled = _compiled_modifiers.get(key)
+    if compiled is None:
+        conditions = [ENVIRONMENT[environment]]
+        if weather in ENVIRONMENT:
+            conditions.append(ENVIRONMENT[weather])
+        attack = accuracy = defense = 1.0
+        for condition in conditions:
+            attack *= condition.get('attack', 1.0)
+            accuracy *= condition.get('accuracy', 1.0)
+            defense *= condition.get('defense', 1.0)
+        attacks = {name: (action['power'] * attack, action['accuracy'] * accuracy)
+                   for name, action in cls.actions.items()}
+        compiled = _compiled_modifiers[key] = CompiledModifiers(attacks, defense)
+    return compiled
+
+
 # Base Character Class
 class Character:
+    actions = ACTIONS
+
     def __init__(self, name, hp, attack, defense, level=1, experience=0, inventory=None):
         self.name = name
         self.hp = hp
         self.max_hp = hp
-        self.attack = attack
-        self.defense = defense
+        # attack and defense are derived from base values and buffs
+        self.stats = Stats(attack=attack, defense=defense)
         self.level = level
         self.experience = experience
         self.inventory = inventory if inventory else []
         self.status_effects = []
+        self.effect_counts = {}  # Active status effect name -> how many
+        self._modifiers = None
+        self.weather = None
         self.environment = 'day'
         self.stamina = 100
         self.mana = 100
@@ -56,49 +81,87 @@ class Character:
     def is_alive(self):
         return self.hp > 0
 
+    # Assigning to a stat shifts its base value by the change, so `attack += 2`
+    # on level up raises the base by 2 whatever buffs are active
+    @property
+    def attack(self):
+        return self.stats['attack']
+
+    @attack.setter
+    def attack(self, value):
+        self.stats.set_base('attack', self.stats.base['attack'] + value - self.stats['attack'])
+
+    @property
+    def defense(self):
+        return self.stats['defense']
+
+    @defense.setter
+    def defense(self, value):
+        self.stats.set_base('defense', self.stats.base['defense'] + value - self.stats['defense'])
+
+    def buff(self, source, turns=None, **multipliers):
+        """Multiply stats for `turns` turns (None: until removed), replacing the source's old buff"""
+        for stat, multiplier in multipliers.items():
+            self.stats.add(stat, source, multiplier, turns=turns)
+
+    # Environment and weather pick the compiled modifiers, changing either
+    # drops them; stats are not folded in, so buffs never invalidate them
+    @property
+    def environment(self):
+        return self._environment
+
+    @environment.setter
+    def environment(self, value):
+        self._environment = value
+        self._modifiers = None
+
+    @property
+    def weather(self):
+        return self._weather
+
+    @weather.setter
+    def weather(self, value):
+        self._weather = value
+        self._modifiers = None
+
+    @property
+    def modifiers(self):
+        modifiers = self._modifiers
+        if modifiers is None:
+            modifiers = self._modifiers = compile_modifiers(type(self), self._environment, self._weather)
+        return modifiers
+
     def take_damage(self, damage, damage_type="physical"):
-        # Apply environment modifiers
-        env_mod = ENVIRONMENT[self.environment]
-        defense_modifier = env_mod.get('defense', 1.0)
-        
-        # Calculate actual damage with modifiers
-        actual_damage = max((damage - self.defense * defense_modifier), 0)
+        # Calculate actual damage with environment modifiers
+        actual_damage = max((damage - self.defense * self.modifiers.defense), 0)
         self.hp -= actual_damage
         return actual_damage
 
     def attack_enemy(self, enemy, attack_type="normal"):
         # Check if stunned
-        if any(effect.get('name') == 'stun' for effect in self.status_effects):
+        if self.effect_counts.get('stun'):
             print(f"{self.name} is stunned and cannot attack!")
             return
 
-        # Get attack action from ACTIONS dictionary
-        if attack_type not in ACTIONS:
+        compiled = self.modifiers.attacks.get(attack_type)
+        if compiled is None:
             print(f"Unknown attack type: {attack_type}")
             return
+        damage_factor, hit_chance = compiled
 
-        action = ACTIONS[attack_type]
-        
-        # Apply environment modifiers
-        env_mod = ENVIRONMENT[self.environment]
-        attack_modifier = env_mod.get('attack', 1.0)
-        accuracy_modifier = env_mod.get('accuracy', 1.0)
-
-        # Calculate base damage
-        base_damage = self.attack * action['power']
-        
         # Apply critical hit chance (20%)
-        if random.random() < 0.2:
-            base_damage *= COMBAT_MODIFIERS['critical']
+        critical = random.random() < 0.2
+        if critical:
             print("Critical hit!")
 
         # Check for accuracy
-        if random.random() > (action['accuracy'] * accuracy_modifier):
+        if random.random() > hit_chance:
             print(f"{self.name}'s attack missed!")
             return
 
-        # Apply final modifiers
-        final_damage = base_damage * attack_modifier
+        final_damage = self.attack * damage_factor
+        if critical:
+            final_damage *= COMBAT_MODIFIERS['critical']
         print(f"{self.name} attacks {enemy.name} with {attack_type} for {final_damage:.1f} damage!")
         enemy.take_damage(final_damage)
 
@@ -106,17 +169,27 @@ class Character:
         effect = STATUS_EFFECTS[effect_name].copy()
         effect['name'] = effect_name
         self.status_effects.append(effect)
+        self.effect_counts[effect_name] = self.effect_counts.get(effect_name, 0) + 1
         print(f"{self.name} is affected by {effect_name}!")
 
     def update_status_effects(self):
+        for modifier in self.stats.tick():
+            print(f"{modifier.source} {modifier.stat} modifier wore off from {self.name}")
         for effect in self.status_effects[:]:  # Create a copy to iterate
             if effect['name'] in STATUS_EFFECTS:
                 self.hp -= effect.get('damage', 0)
                 effect['duration'] -= 1
                 if effect['duration'] <= 0:
                     self.status_effects.remove(effect)
+                    self.effect_counts[effect['name']] -= 1
                     print(f"{effect['name']} wore off from {self.name}")
 
+    def cure_status_effects(self, names):
+        self.status_effects = [effect for effect in self.status_effects
+                               if effect['name'] not in names]
+        for name in names:
+            self.effect_counts.pop(name, None)
+
     def use_item(self, item):
         if item in self.inventory:
             print(f"{self.name} uses {item.name}.")
@@ -160,7 +233,7 @@ Status Effects: {[effect['name'] for effect in self.status_effects]}
 # Specific Character Classes with special abilities and stats
 class Warrior(Character):
     def __init__(self, name):
-        super().__init__(name, 120, 25, 10)
+        super().__init__(name, *base_stats("Warrior"))
         self.rage = 50
         self.max_rage = 100
         self.special_moves = {
@@ -186,15 +259,13 @@ class Warrior(Character):
             return False
 
         if move_name == 'berserker':
-            self.attack *= 1.5
-            self.defense *= 0.7
+            self.buff(move_name, SPECIAL_BUFF_TURNS, attack=1.5, defense=0.7)
             print(f"{self.name} enters berserker rage!")
         elif move_name == 'shield_wall':
-            self.defense *= 2
+            self.buff(move_name, SPECIAL_BUFF_TURNS, defense=2)
             print(f"{self.name} raises their shield wall!")
         elif move_name == 'battle_cry':
-            self.attack *= 1.2
-            self.defense *= 1.2
+            self.buff(move_name, SPECIAL_BUFF_TURNS, attack=1.2, defense=1.2)
             print(f"{self.name} lets out a mighty battle cry!")
 
         self.stamina -= move['stamina_cost']
@@ -203,7 +274,7 @@ class Warrior(Character):
 
 class Mage(Character):
     def __init__(self, name):
-        super().__init__(name, 80, 35, 5)
+        super().__init__(name, *base_stats("Mage"))
         self.mana = 150  # Mages have more mana
         self.spellbook = {
             'fireball': {'mana_cost': 30, 'power': 1.8},
@@ -241,7 +312,7 @@ class Mage(Character):
     def special_ability(self):
         if self.mana >= 50:
             self.mana -= 50
-            self.attack *= 1.5
+            self.buff('arcane_concentration', SPECIAL_BUFF_TURNS, attack=1.5)
             print(f"{self.name} enters arcane concentration!")
             return True
         print("Not enough mana for special ability!")
@@ -249,7 +320,7 @@ class Mage(Character):
 
 class Rogue(Character):
     def __init__(self, name):
-        super().__init__(name, 90, 30, 8)
+        super().__init__(name, *base_stats("Rogue"))
         self.energy = 100
         self.max_energy = 100
         self.stealth = True
@@ -305,7 +376,7 @@ class Rogue(Character):
 
 class Archer(Character):
     def __init__(self, name):
-        super().__init__(name, hp=85, attack=28, defense=7)
+        super().__init__(name, *base_stats("Archer"))
         self.focus = 100
         self.max_focus = 100
         self.arrow_types = {
@@ -348,12 +419,7 @@ class Item:
         self.effects = effects
         self.rarity = rarity
         self.durability = durability
-        self.rarity_multipliers = {
-            "common": 1.0,
-            "rare": 1.5,
-            "epic": 2.0,
-            "legendary": 3.0
-        }
+        self.rarity_multipliers = CONTENT.rarity_multipliers
 
     def apply_effect(self, character):
         multiplier = self.rarity_multipliers.get(self.rarity, 1.0)
@@ -365,11 +431,9 @@ class Item:
                 print(f"{character.name} heals for {heal_amount} HP. Total HP: {character.hp}")
             
             elif effect_type == 'buff':
-                for stat, mod in value.items():
-                    if stat == 'attack':
-                        character.attack *= (1 + mod * multiplier)
-                    elif stat == 'defense':
-                        character.defense *= (1 + mod * multiplier)
+                character.buff(self.name, ITEM_BUFF_TURNS,
+                               **{stat: 1 + mod * multiplier for stat, mod in value.items()
+                                  if stat in ('attack', 'defense')})
                 print(f"{character.name} gains {self.rarity} buff to {list(value.keys())}")
             
             elif effect_type == 'restore':
@@ -380,80 +444,50 @@ class Item:
                 print(f"{character.name} restores {value}")
             
             elif effect_type == 'status_cure':
-                character.status_effects = [effect for effect in character.status_effects 
-                                         if effect['name'] not in value]
+                character.cure_status_effects(value)
                 print(f"{character.name} is cured of {value}")
 
         self.durability -= 1
         if self.durability <= 0:
             print(f"{self.name} breaks after use!")
 
-class HealingPotion(Item):
-    def __init__(self, rarity="common"):
-        effects = {
-            'heal': 20,
-            'buff': {'defense': 0.1},
-            'restore': {'stamina': 15, 'mana': 15},
-            'status_cure': ['poison', 'burn']
-        }
-        durability = {
-            'common': 1,
-            'rare': 2,
-            'epic': 3,
-            'legendary': 5
-        }
+class Potion(Item):
+    """An Item whose effects and durability per rarity come from the content catalog"""
+    def __init__(self, potion_id, rarity):
+        potion = CONTENT.potions[potion_id]
         super().__init__(
-            f"{rarity.capitalize()} Healing Potion",
-            effects,
+            f"{rarity.capitalize()} {potion.name}",
+            thaw(potion.effects),
             rarity=rarity,
-            durability=durability.get(rarity, 1)
+            durability=potion.durability.get(rarity, potion.default_durability)
         )
 
-class SuperHealingPotion(Item):
+class HealingPotion(Potion):
+    def __init__(self, rarity="common"):
+        super().__init__("HealingPotion", rarity)
+
+class SuperHealingPotion(Potion):
     def __init__(self, rarity="rare"):
-        effects = {
-            'heal': 50,  # More healing than regular potion
-            'buff': {
-                'attack': 0.15,
-                'defense': 0.15
-            },
-            'restore': {
-                'stamina': 30,
-                'mana': 30
-            },
-            'status_cure': ['poison', 'burn', 'freeze', 'stun']  # Cures all status effects
-        }
-        durability = {
-            'rare': 2,
-            'epic': 4,
-            'legendary': 6
-        }
-        super().__init__(
-            f"{rarity.capitalize()} Super Healing Potion",
-            effects,
-            rarity=rarity,
-            durability=durability.get(rarity, 2)
-        )
+        super().__init__("SuperHealingPotion", rarity)
 
 # Enemy Classes
 class Goblin(Character):
     def __init__(self):
-        super().__init__("Goblin", 60, 15, 5)
+        super().__init__("Goblin", *base_stats("Goblin"))
         self.agility = 20
         self.pack_bonus = False
 
     def special_ability(self):
         if not self.pack_bonus and self.hp < self.max_hp * 0.5:
             print("Goblin calls for pack support!")
-            self.attack *= 1.3
-            self.defense *= 1.2
+            self.buff('pack_bonus', attack=1.3, defense=1.2)
             self.pack_bonus = True
             return True
         return False
 
 class Orc(Character):
     def __init__(self):
-        super().__init__("Orc", 80, 20, 10)
+        super().__init__("Orc", *base_stats("Orc"))
         self.rage = 0
         self.berserk_mode = False
 
@@ -465,8 +499,7 @@ class Orc(Character):
     def special_ability(self):
         if self.rage >= 30 and not self.berserk_mode:
             print("Orc enters berserk mode!")
-            self.attack *= 1.5
-            self.defense *= 0.7
+            self.buff('berserk', attack=1.5, defense=0.7)
             self.berserk_mode = True
             self.rage = 0
             return True
@@ -474,7 +507,7 @@ class Orc(Character):
 
 class Dragon(Character):
     def __init__(self):
-        super().__init__("Dragon", 200, 40, 20)
+        super().__init__("Dragon", *base_stats("Dragon"))
         self.breath_cooldown = 0
         self.flying = False
         self.elemental_mode = "fire"
@@ -483,13 +516,13 @@ class Dragon(Character):
         if self.breath_cooldown == 0:
             print(f"Dragon uses {self.elemental_mode} breath attack!")
             self.breath_cooldown = 3
-            self.attack *= 2
+            self.buff('breath', 1, attack=2)
             if random.random() < 0.4:
                 return "burn"
         elif not self.flying and random.random() < 0.3:
             print("Dragon takes to the sky!")
             self.flying = True
-            self.defense *= 1.5
+            self.buff('flying', defense=1.5)
         return False
 
     def update_status_effects(self):
@@ -499,7 +532,7 @@ class Dragon(Character):
 
 class Bandit(Character):
     def __init__(self):
-        super().__init__("Bandit", 70, 18, 8)
+        super().__init__("Bandit", *base_stats("Bandit"))
         self.stealth = False
         self.stolen_items = []
         self.combo_counter = 0
@@ -511,20 +544,78 @@ class Bandit(Character):
             return True
         elif self.combo_counter >= 2:
             print("Bandit unleashes devastating combo attack!")
-            self.attack *= (1.2 + (self.combo_counter * 0.1))
+            self.buff('combo', 1, attack=1.2 + self.combo_counter * 0.1)
             self.combo_counter = 0
             return True
         return False
 
     def attack_enemy(self, enemy, attack_type="normal"):
         if self.stealth:
-            self.attack *= 1.5
+            # The ambush bonus only lasts for this attack
+            self.buff('ambush', attack=1.5)
             self.stealth = False
         super().attack_enemy(enemy, attack_type)
+        self.stats.remove('ambush')
         self.combo_counter += 1
 
+# Save state: plain dicts and lists only, classes are stored by name
+CHARACTER_CLASSES = {cls.__name__: cls for cls in (Character, Warrior, Mage, Rogue, Archer,
+                                                   Goblin, Orc, Dragon, Bandit)}
+ITEM_CLASSES = {cls.__name__: cls for cls in (Item, HealingPotion, SuperHealingPotion)}
+# Game attributes saved as they are, ExtendedGame adds its own
+GAME_FIELDS = ('gold', 'turns', 'time_of_day', 'current_quest', 'current_location',
+               'settings', 'active_buffs', 'quest_log', 'achievement_tracker')
+EXTENDED_FIELDS = ('current_weather', 'weather_duration', 'reputation', 'faction_relations',
+                   'materials', 'combat_combo', 'max_combo', 'combo_multiplier')
+# Combo limits for new games and for saves made before they were stored
+MAX_COMBO = 5
+COMBO_MULTIPLIER = 0.1
+
+DEFAULT_SETTINGS = {
+    'difficulty': 'normal',
+    'permadeath': False,
+    'show_tutorials': True,
+    'auto_save': True,
+    'save_path': 'savegame',   # Journal files are savegame.ckpt and savegame.log
+    'fsync': FSYNC_CHECKPOINT  # See journal.FSYNC_POLICIES
+}
+
+
+def item_state(item):
+    return {'class': type(item).__name__, 'name': item.name, 'effects': copy.deepcopy(item.effects),
+            'rarity': item.rarity, 'durability': item.durability}
+
+
+def item_from_state(state):
+    item = ITEM_CLASSES[state['class']].__new__(ITEM_CLASSES[state['class']])
+    Item.__init__(item, state['name'], state['effects'], state['rarity'], state['durability'])
+    return item
+
+
+def character_state(character):
+    attrs = {name: copy.deepcopy(value) for name, value in vars(character).items()
+             if not name.startswith('_') and name not in ('inventory', 'stats')}
+    return {'class': type(character).__name__, 'attrs': attrs, 'stats': character.stats.to_dict(),
+            'environment': character.environment, 'weather': character.weather,
+            'inventory': [item_state(item) for item in character.inventory]}
+
+
+def character_from_state(state):
+    cls = CHARACTER_CLASSES[state['class']]
+    character = cls.__new__(cls)
+    character._modifiers = None
+    character.stats = Stats.from_dict(state['stats'])
+    character.__dict__.update(state['attrs'])
+    character.environment = state['environment']
+    character.weather = state['weather']
+    character.inventory = [item_from_state(item) for item in state['inventory']]
+    return character
+
+
 # Extending Game Class
 class Game:
+    journal = None  # Opened by the first save or by load_game
+
     def __init__(self):
         self.initialize_game_systems()
         self.player = None  # Initialize player before character creation
@@ -543,24 +634,66 @@ class Game:
         extended_game.current_quest = self.current_quest
         extended_game.turns = self.turns
         extended_game.time_of_day = self.time_of_day
+        extended_game.journal = self.journal
         return extended_game
 
+    def game_state(self):
+        """Everything needed to resume this game, as plain data"""
+        fields = EXTENDED_FIELDS if isinstance(self, ExtendedGame) else ()
+        state = {name: copy.deepcopy(getattr(self, name)) for name in GAME_FIELDS + fields
+                 if hasattr(self, name)}
+        state['kind'] = type(self).__name__
+        state['player'] = character_state(self.player) if self.player is not None else None
+        state['quests'] = [dict(quest, enemy=character_state(quest['enemy'])) for quest in self.quests]
+        return state
+
+    def restore_game_state(self, state):
+        for name, value in state.items():
+            if name in GAME_FIELDS or name in EXTENDED_FIELDS:
+                setattr(self, name, value)
+        self.player = character_from_state(state['player']) if state.get('player') else None
+        self.quests = [dict(quest, enemy=character_from_state(quest['enemy']))
+                       for quest in state.get('quests', [])]
+
+    @classmethod
+    def load_game(cls, path=DEFAULT_SETTINGS['save_path']):
+        """Resume the game saved at `path`, None if there is no save"""
+        journal = Journal(path)
+        state = journal.load()
+        if state is None:
+            return None
+        game_class = ExtendedGame if state.get('kind') == 'ExtendedGame' else Game
+        game = game_class.__new__(game_class)
+        game.player = None
+        game.initialize_game_systems()
+        if game_class is ExtendedGame:
+            game.max_combo = MAX_COMBO
+            game.combo_multiplier = COMBO_MULTIPLIER
+        game.restore_game_state(state)
+        # Later saves follow the fsync policy the game was saved with
+        fsync = game.settings.get('fsync', FSYNC_CHECKPOINT)
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        journal.fsync = fsync
+        game.journal = journal
+        print(f"Loaded saved game for {game.player.name}, turn {game.turns}.")
+        return game
+
     def save_game_state(self):
         """Save the current game state"""
         try:
-            # For now, just print a message
+            if self.journal is None:
+                self.journal = Journal(self.settings.get('save_path', DEFAULT_SETTINGS['save_path']),
+                                       fsync=self.settings.get('fsync', FSYNC_CHECKPOINT))
+                self.journal.load()
+            self.journal.save(self.game_state())
             print("Game state saved!")
         except Exception as e:
             print(f"Failed to save game state: {e}")
 
     def initialize_game_systems(self):
         """Initialize all game systems"""
-        self.settings = {
-            'difficulty': 'normal',
-            'permadeath': False,
-            'show_tutorials': True,
-            'auto_save': True
-        }
+        self.settings = dict(DEFAULT_SETTINGS)
         self.active_buffs = []
         self.quest_log = []
         self.achievement_tracker = {}
@@ -582,12 +715,7 @@ class Game:
             HealingPotion("rare"),
             SuperHealingPotion("rare")
         ]
-        self.item_prices = {
-            "common": 50,
-            "rare": 100,
-            "epic": 200,
-            "legendary": 500
-        }
+        self.item_prices = CONTENT.item_prices
         
     def create_character(self):
         print("Choose your class:")
@@ -896,6 +1024,7 @@ class ExtendedGame(Game):
             print(f"Found {event['gold']} gold!")
         elif event['type'] == 'weather':
             self.current_weather = event['effect']
+            self.player.weather = event['effect']
             print(f"Weather changed to {event['effect']}!")
 
     def initialize_extended_systems(self):
@@ -908,14 +1037,19 @@ class ExtendedGame(Game):
             'kingdom': {'value': 0, 'title': 'Unknown'}
         }
         self.combat_combo = 0
-        self.max_combo = 5
-        self.combo_multiplier = 0.1
+        self.max_combo = MAX_COMBO
+        self.combo_multiplier = COMBO_MULTIPLIER
         self.materials = {'wood': 0, 'iron': 0, 'crystal': 0, 'herb': 0}
         self.initialize_crafting()
 
 if __name__ == "__main__":
     try:
-        game = Game()
+        game = None
+        save_path = DEFAULT_SETTINGS['save_path']
+        if Journal(save_path).exists() and input("Load saved game? (y/n): ").lower() == 'y':
+            game = Game.load_game(save_path)
+        if game is None:
+            game = Game()
         while True:
             if isinstance(game, Game) and not isinstance(game, ExtendedGame):
                 result = game.play()
@@ -1,16 +1,19 @@
+import time
+START_TIME = time.perf_counter()  # Taken before the heavy imports, for time-to-first-frame
+
 import pygame
 import sys
 import os
 import math
-import time
 import random
 from enum import Enum, auto
 
-class Direction(Enum):
-    NORTH = auto()
-    SOUTH = auto()
-    EAST = auto()
-    WEST = auto()
+from effects import EffectsTimeline
+from frame_timer import FrameTimer
+from input_replay import InputRecorder, LiveInput, ScriptedInput
+from quests import KILLS, PICKUPS, SCORE, QuestLine, make_quests
+from renderer import HUD_LAYER, HealthBar, HudText, Renderer, clear_fonts, get_font
+from world import BLACK, GREEN, RED, WHITE, WINDOW_HEIGHT, WINDOW_WIDTH, FixedTimestep, World
 
 class GameState(Enum):
     MENU = auto()
@@ -35,315 +38,200 @@ class TimeOfDay(Enum):
     DAY = auto()
     DUSK = auto()
     NIGHT = auto()
-class QuestStatus(Enum):
-    INACTIVE = auto()
-    ACTIVE = auto()
-    COMPLETED = auto()
-
-class Quest:
-    def __init__(self, description, target_score):
-        self.description = description
-        self.target_score = target_score
-        self.status = QuestStatus.INACTIVE
-    
-    def check_completion(self, score):
-        if self.status == QuestStatus.ACTIVE and score >= self.target_score:
-            self.status = QuestStatus.COMPLETED
-            return True
-        return False
-
-# Quest system
-available_quests = [
-    Quest("Reach 50 points", 50),
-    Quest("Reach 100 points", 100),
-    Quest("Reach 200 points", 200)
-]
-current_quest_index = 0
-
-# Initialize Pygame
-pygame.init()
-
-# Set up the display
-WINDOW_WIDTH = 1000
-WINDOW_HEIGHT = 800
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Simple RPG")
-
-# Colors
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-RED = (255, 0, 0)
-GREEN = (0, 255, 0)
-BLUE = (0, 0, 255)
-
-# Player class
-class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface([30, 30])
-        self.image.fill(BLUE)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        
-        # Enhanced stats
-        self.health = 100
-        self.max_health = 100
-        self.stamina = 100
-        self.max_stamina = 100
-        self.base_speed = 5
-        self.speed = self.base_speed
-        self.attack_power = 10
-        self.defense = 5
-        self.level = 1
-        self.experience = 0
-        
-        # Movement state
-        self.sprinting = False
-        self.direction = Direction.SOUTH
-        self.last_attack = 0
-        self.attack_cooldown = 500  # milliseconds
-
-    def move(self):
-        keys = pygame.key.get_pressed()
-        dx = dy = 0
-        
-        # Sprint mechanic
-        self.sprinting = keys[pygame.K_LSHIFT] and self.stamina > 0
-        self.speed = self.base_speed * (1.5 if self.sprinting else 1)
-        
-        # Diagonal movement
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx -= self.speed
-            self.direction = Direction.WEST
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx += self.speed
-            self.direction = Direction.EAST
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            dy -= self.speed
-            self.direction = Direction.NORTH
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            dy += self.speed
-            self.direction = Direction.SOUTH
-            
-        # Normalize diagonal movement
-        if dx != 0 and dy != 0:
-            dx *= 0.707  # 1/√2
-            dy *= 0.707
-            
-        # Update position with boundary checking
-        new_x = max(0, min(WINDOW_WIDTH - self.rect.width, self.rect.x + dx))
-        new_y = max(0, min(WINDOW_HEIGHT - self.rect.height, self.rect.y + dy))
-        self.rect.x = new_x
-        self.rect.y = new_y
-        
-        # Update stamina
-        if self.sprinting:
-            self.stamina = max(0, self.stamina - 1)
+
+# Move enemies with the NumPy batch instead of one sprite at a time
+BATCH_ENEMIES = os.environ.get("RPG_BATCH_ENEMIES") == "1"
+
+
+METRIC_FIELDS = ("frame", "work_ms", "steps", "enemies", "healing_items", "sprites", "score", "health")
+
+
+class GameEngine:
+    """The action mode: a World on a fixed timestep, its input and its renderer
+
+    Input comes from any object with poll() returning a FrameInput, live
+    keyboard and mouse or a scripted/recorded stream, and the world gets
+    its own seeded RNG, so a script and a seed always play the same game.
+    Headless engines use SDL's dummy video driver and never wait for the
+    frame clock. Every frame appends a row of METRIC_FIELDS to `metrics`.
+    """
+    def __init__(self, input_source=None, seed=None, headless=False, batch=BATCH_ENEMIES,
+                 recorder=None):
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+        self.input = input_source or LiveInput()
+        self.recorder = recorder
+        self.headless = headless
+
+        # Only what the first frame needs, the game has no sound or joystick input
+        pygame.display.init()
+        pygame.font.init()
+
+        # Set up the display
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Simple RPG")
+
+        # The simulation runs on a fixed timestep, the renderer draws the world
+        # interpolated between its last two steps
+        self.world = World(random.Random(seed), batch)
+        self.player = self.world.player
+        self.renderer = Renderer(self.screen, WHITE, group=self.world.all_sprites)
+        self.timestep = FixedTimestep()
+
+        # Game state initialization
+        self.running = True
+        self.game_over = False
+        self.clock = pygame.time.Clock()
+        self.font = get_font(36)
+        self.damage_font = get_font(24)
+        self.health_bar = HealthBar((10, 10), (100, 20), RED, GREEN)
+        self.score_label = HudText(self.font, (10, 40), BLACK, self.renderer.text_cache)
+        self.quest_label = HudText(self.font, (10, 70), BLACK, self.renderer.text_cache)
+        self.renderer.add(self.health_bar, self.score_label, self.quest_label, layer=HUD_LAYER)
+        # Quest progress follows world events, the labels change only when it does
+        self.quests = QuestLine(make_quests())
+        self.score_label.set_text(f'Score: {self.world.score}')
+        self.update_quest_label()
+        self.current_state = GameState.PLAYING
+        self.effects = EffectsTimeline()
+        self.frame_timer = FrameTimer()
+        self.dt = 0  # Milliseconds the previous frame took, from clock.tick
+        self.attack = False  # Click waiting for the next simulation step
+        self.frames = 0
+        self.metrics = []
+        self.first_frame_time = None  # Seconds from START_TIME to the first frame on screen
+
+    def frame(self):
+        """Run one frame, returns False once the game should stop"""
+        world = self.world
+        effects = self.effects
+        self.frame_timer.start()
+        frame = self.input.poll()
+        if frame.quit:
+            # Nothing was played this frame, so it is neither simulated nor measured
+            self.running = False
+            return False
+        dt = frame.dt if frame.dt is not None else self.dt
+        if self.recorder is not None:
+            self.recorder.record(frame.controls, dt)
+        self.attack = self.attack or frame.controls.attack
+        steps = 0
+
+        if not self.game_over:
+            # Update game state in whole steps, the remainder carries over
+            effects.update(dt)
+            steps = self.timestep.advance(dt / 1000)
+            for _ in range(steps):
+                world.step(self.timestep.step, frame.controls._replace(attack=self.attack))
+                self.attack = False
+            world.interpolate(self.timestep.alpha)
+
+            for kind, sprite, amount in world.drain_events():
+                if kind == "damage":
+                    effects.damage_number(self.damage_font, amount, sprite.rect.x, sprite.rect.y - 15)
+                elif kind == "hit":
+                    # Screen shake, applied as a camera offset while drawing
+                    if effects.shaking is None:
+                        effects.flash(RED, 100)
+                    effects.shake(250, 5)
+                elif kind in ("kill", "pickup"):
+                    self.score_label.set_text(f'Score: {world.score}')
+                    changed = self.quests.record(SCORE, amount)
+                    changed |= self.quests.record(KILLS if kind == "kill" else PICKUPS)
+                    if changed:
+                        self.update_quest_label()
+                elif kind == "game_over":
+                    self.current_state = GameState.GAME_OVER
+                # Play heal sound on "pickup" if available
+                # pygame.mixer.Sound('heal.wav').play()
+
+            # Draw game state, HUD sprites only redraw when their value changes
+            self.health_bar.set_value(self.player.health)
+            self.renderer.render(effects.camera_offset(), effects)
+
         else:
-            self.stamina = min(self.max_stamina, self.stamina + 0.5)
-            
-    def attack(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_attack >= self.attack_cooldown:
-            self.last_attack = current_time
-            return True
-        return False
-
-    def level_up(self):
-        if self.experience >= 100:
-            self.level += 1
-            self.experience -= 100
-            self.max_health += 20
-            self.health = self.max_health
-            self.attack_power += 5
-            self.defense += 2
-            return True
-        return False
-
-# Enemy class
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface([20, 20])
-        self.image.fill(RED)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        
-        # Enhanced stats
-        self.health = 50
-        self.max_health = 50
-        self.speed = random.uniform(1.5, 3.0)
-        self.damage = 10
-        self.behavior_type = random.choice(['chase', 'circle', 'ambush'])
-        self.attack_range = 100
-        self.circle_radius = 150
-        self.circle_angle = random.uniform(0, 2 * math.pi)
-        self.last_attack = 0
-        self.attack_cooldown = 1000
-        
-    def move_towards_player(self, player):
-        dx = player.rect.x - self.rect.x
-        dy = player.rect.y - self.rect.y
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        if self.behavior_type == 'chase':
-            if distance > 0:
-                dx = (dx / distance) * self.speed
-                dy = (dy / distance) * self.speed
-                self.rect.x += dx
-                self.rect.y += dy
-                
-        elif self.behavior_type == 'circle':
-            self.circle_angle += 0.02
-            self.rect.x = player.rect.x + math.cos(self.circle_angle) * self.circle_radius
-            self.rect.y = player.rect.y + math.sin(self.circle_angle) * self.circle_radius
-            
-        elif self.behavior_type == 'ambush':
-            if distance > self.attack_range:
-                # Stay still when far
-                pass
-            else:
-                # Charge at player when in range
-                dx = (dx / distance) * self.speed * 2
-                dy = (dy / distance) * self.speed * 2
-                self.rect.x += dx
-                self.rect.y += dy
-        
-        # Keep enemy within screen bounds
-        self.rect.x = max(0, min(WINDOW_WIDTH - self.rect.width, self.rect.x))
-        self.rect.y = max(0, min(WINDOW_HEIGHT - self.rect.height, self.rect.y))
-        
-    def attack_player(self, player, current_time):
-        distance = math.sqrt((player.rect.x - self.rect.x)**2 + (player.rect.y - self.rect.y)**2)
-        if distance < self.attack_range and current_time - self.last_attack >= self.attack_cooldown:
-            player.health -= self.damage
-            self.last_attack = current_time
-            return True
-        return False
-    
-    def take_damage(self, amount):
-        self.health -= amount
-        if self.health <= 0:
-            self.kill()
-            return True
-        return False
-
-# Initialize sprite groups
-all_sprites = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-healing_items = pygame.sprite.Group()
-
-# Create player
-player = Player(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
-all_sprites.add(player)
-
-# Create initial enemies
-for _ in range(5):
-    enemy = Enemy(random.randint(0, WINDOW_WIDTH), random.randint(0, WINDOW_HEIGHT))
-    all_sprites.add(enemy)
-    enemies.add(enemy)
-
-# Game state initialization
-running = True
-game_over = False
-clock = pygame.time.Clock()
-score = 0
-font = pygame.font.Font(None, 36)
-current_state = GameState.PLAYING
-
-# Main game loop
-while running and current_state != GameState.GAME_OVER:
-    # Event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
-            if player.attack():
-                # Check for enemies in range
-                for enemy in enemies:
-                    dx = enemy.rect.x - player.rect.x
-                    dy = enemy.rect.y - player.rect.y
-                    distance = math.sqrt(dx**2 + dy**2)
-                    if distance < 50:  # Attack range
-                        if enemy.take_damage(player.attack_power):
-                            score += 20
-            
-    if not game_over:
-        # Update game state
-        player.move()
-        for enemy in enemies:
-            enemy.move_towards_player(player)
-        
-        # Add after enemy and player updates
-        all_sprites.update()
-            
-        # Spawn healing items
-        if random.random() < 0.02:
-            healing = pygame.sprite.Sprite()
-            healing.image = pygame.Surface([15, 15])
-            healing.image.fill(GREEN)
-            healing.rect = healing.image.get_rect()
-            healing.rect.x = random.randint(0, WINDOW_WIDTH)
-            healing.rect.y = random.randint(0, WINDOW_HEIGHT)
-            healing_items.add(healing)
-            all_sprites.add(healing)
-
-        # Check collisions
-        hits = pygame.sprite.spritecollide(player, enemies, False)
-        if hits:
-            player.health -= 1
-            # Screen shake effect
-            original_pos = screen.get_rect().copy()
-            for _ in range(5):  # Duration of shake
-                offset = [random.randint(-5, 5), random.randint(-5, 5)]
-                screen.blit(screen, offset)
-                pygame.display.flip()
-                pygame.time.delay(50)
-            screen.blit(screen, original_pos)
-            
-            if player.health <= 0:
-                current_state = GameState.GAME_OVER
-
-        # Check for healing item collisions
-        healing_hits = pygame.sprite.spritecollide(player, healing_items, True)
-        if healing_hits:
-            player.health = min(100, player.health + 20)
-            score += 10
-            # Play heal sound if available
-            # pygame.mixer.Sound('heal.wav').play()
-
-        # Draw game state
-        screen.fill(WHITE)
-        all_sprites.draw(screen)
-        
-        # Draw UI
-        pygame.draw.rect(screen, RED, (10, 10, 100, 20))
-        pygame.draw.rect(screen, GREEN, (10, 10, player.health, 20))
-        score_text = font.render(f'Score: {score}', True, BLACK)
-        screen.blit(score_text, (10, 40))
-        
-        # Add to the UI drawing section
-        if not game_over:
-            # ...existing UI code...
-            
-            # Draw current quest status
-            if current_quest_index < len(available_quests):
-                current_quest = available_quests[current_quest_index]
-                quest_text = f"Current Quest: {current_quest.description}"
-                quest_status = font.render(quest_text, True, BLACK)
-                screen.blit(quest_status, (10, 70))
-        
+            # Game Over screen
+            self.screen.fill(WHITE)  # Clear screen first
+            font_large = get_font(74)
+            text = font_large.render(f'Game Over - Score: {world.score}', True, BLACK)
+            text_rect = text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
+            self.screen.blit(text, text_rect)
+            pygame.display.flip()
+
+        work = self.frame_timer.stop()
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter() - START_TIME
+        self.metrics.append((self.frames, work, steps, len(world.enemies), len(world.healing_items),
+                             len(world.all_sprites), world.score, self.player.health))
+        self.frames += 1
+        # Headless runs go as fast as they can, their frame times come from the input
+        self.dt = self.clock.tick(0 if self.headless else 60)
+        return self.running and self.current_state != GameState.GAME_OVER
+
+    def update_quest_label(self):
+        quest = self.quests.current
+        self.quest_label.set_text(f"Current Quest: {quest.description}" if quest is not None else None)
+
+    def run(self, max_frames=None):
+        """Main game loop, returns the frames run"""
+        try:
+            while self.frame():
+                if max_frames is not None and self.frames >= max_frames:
+                    break
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+            clear_fonts()
+            pygame.quit()
+        return self.frames
+
+    def write_metrics(self, path):
+        with open(path, "w") as f:
+            f.write(",".join(METRIC_FIELDS) + "\n")
+            for row in self.metrics:
+                f.write(",".join(f"{value:.3f}" if isinstance(value, float) else str(value)
+                                 for value in row) + "\n")
+
+    def report(self, stream=None):
+        stream = stream or sys.stdout
+        if self.first_frame_time is not None:
+            stream.write(f"Time to first frame: {self.first_frame_time * 1000:.1f} ms\n")
+        self.frame_timer.report(stream)
+        for pool in self.world.pools():
+            stream.write(pool.report() + "\n")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Action mode")
+    parser.add_argument("--headless", action="store_true", help="dummy video driver, no frame cap")
+    parser.add_argument("--script", help="JSON-lines input to replay instead of the keyboard")
+    parser.add_argument("--record", help="write the input played to this JSON-lines file")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    parser.add_argument("--seed", type=int, help="world RNG seed")
+    parser.add_argument("--metrics", help="write per-frame metrics CSV here")
+    args = parser.parse_args()
+
+    if args.script:
+        source = ScriptedInput.load(args.script)
+    elif args.headless:
+        # Nobody at the keyboard, a seeded bot plays instead
+        source = ScriptedInput.wander(args.frames or 3600, random.Random(args.seed))
     else:
-        # Game Over screen
-        screen.fill(WHITE)  # Clear screen first
-        font_large = pygame.font.Font(None, 74)
-        text = font_large.render(f'Game Over - Score: {score}', True, BLACK)
-        text_rect = text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
-        screen.blit(text, text_rect)
-    
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
\ No newline at end of file
+        source = LiveInput()
+    recorder = InputRecorder(args.record) if args.record else None
+    engine = GameEngine(source, args.seed, args.headless, recorder=recorder)
+    start = time.perf_counter()
+    engine.run(args.frames)
+    elapsed = time.perf_counter() - start
+    if args.metrics:
+        engine.write_metrics(args.metrics)
+    if args.headless or os.environ.get("RPG_FRAME_STATS"):
+        print(f"{engine.frames} frames in {elapsed:.2f} s, score {engine.world.score}, "
+              f"health {engine.player.health:.0f}")
+        engine.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+from content import catalog
+
+# Class definitions from the content catalog. Health and mana are (base,
+# per level); ability stats named in SCALED_STATS grow with the level
+# scaling factor, everything else is fixed. Abilities are listed in display
+# order with their unlock level.
+CLASS_DEFINITIONS = catalog().classes
+
+SCALED_STATS = ("damage", "heal", "defense")
+PRECOMPUTED_LEVELS = 50  # Levels built at import, higher ones on first use
+
+CLASS_ALIASES = {alias: key for key, definition in CLASS_DEFINITIONS.items()
+                 for alias in definition.aliases}
+
+ClassLevel = namedtuple("ClassLevel", ["class_key", "level", "health", "mana", "abilities"])
+
+
+def get_scaling_factor(level):
+    """Calculate scaling factor based on level"""
+    return 1 + (level - 1) * 0.15
+
+
+def class_key(class_type):
+    """Canonical class name for a class name or menu number"""
+    key = CLASS_ALIASES.get(class_type.lower())
+    if key is None:
+        raise ValueError(f"Unknown class: {class_type}")
+    return key
+
+
+def _build(key, level):
+    definition = CLASS_DEFINITIONS[key]
+    scaling = get_scaling_factor(level)
+    abilities = {}
+    for name, unlock_level, spec in definition.abilities:
+        if level >= unlock_level:
+            ability = {stat: int(value * scaling) if stat in SCALED_STATS else value
+                       for stat, value in spec.items()}
+            abilities[name] = MappingProxyType(ability)
+    health_base, health_per_level = definition.health
+    mana_base, mana_per_level = definition.mana
+    return ClassLevel(
+        key, level,
+        health_base + (level - 1) * health_per_level,
+        mana_base + (level - 1) * mana_per_level,
+        MappingProxyType(abilities)
+    )
+
+
+# The shared (class, level) -> ClassLevel table
+ABILITY_TABLE = {(key, level): _build(key, level)
+                 for key in CLASS_DEFINITIONS
+                 for level in range(1, PRECOMPUTED_LEVELS + 1)}
+
+# Reverse lookup so a character's ability mapping can be traced back to its row
+_ROW_BY_ID = {id(row.abilities): row for row in ABILITY_TABLE.values()}
+
+
+@lru_cache(maxsize=None)
+def _build_uncached(key, level):
+    row = _build(key, level)
+    _ROW_BY_ID[id(row.abilities)] = row
+    return row
+
+
+def class_level(class_type, level):
+    """Health, mana and the shared ability mapping for a class at a level"""
+    key = CLASS_ALIASES.get(class_type.lower()) or class_key(class_type)
+    row = ABILITY_TABLE.get((key, level))
+    if row is None:
+        row = _build_uncached(key, level)
+    return row
+
+
+def lookup_row(abilities):
+    """The table row an ability mapping came from, or None for edited copies"""
+    return _ROW_BY_ID.get(id(abilities))
@@ -1,10 +1,39 @@
-from flask import Flask, render_template, request, session, redirect, url_for
+import os
+
+from flask import Flask, render_template, request, session, redirect, url_for, g
 from game_logic import Character, Enemy, Gadget  # Import your existing game classes
-import json
+from session_store import PlayerSession, create_store, new_session_id
+import snapshot
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'  # Required for session management
 
+# Player state lives server side, the cookie only carries the session id.
+# Choose the backend with RPG_SESSION_STORE=memory|sqlite|redis
+store_kind = os.environ.get('RPG_SESSION_STORE', 'memory')
+store_options = {}
+if store_kind == 'sqlite':
+    store_options['path'] = os.environ.get('RPG_SESSION_DB', 'sessions.db')
+elif store_kind == 'redis' and os.environ.get('RPG_REDIS_URL'):
+    store_options['url'] = os.environ['RPG_REDIS_URL']
+session_store = create_store(store_kind, **store_options)
+
+def player_session():
+    """Per-request handle to the player, loaded on first access
+
+    Handlers that modify the loaded player in place must call
+    mark_changed() on it, or the change is not saved.
+    """
+    if 'player_session' not in g:
+        g.player_session = PlayerSession(session_store, session.get('sid'), codec=snapshot)
+    return g.player_session
+
+@app.after_request
+def save_player(response):
+    if 'player_session' in g:
+        g.player_session.save()
+    return response
+
 @app.route('/')
 def home():
     return render_template('index.html')
@@ -15,21 +44,23 @@ def new_game():
         name = request.form['name']
         class_type = request.form['class']
         player = Character(name, class_type)
-        session['player'] = player.__dict__
+        session['sid'] = new_session_id()
+        player_session().sid = session['sid']
+        player_session().player = player
         return redirect(url_for('main_game'))
     return render_template('new_game.html')
 
 @app.route('/main_game')
 def main_game():
-    if 'player' not in session:
+    player = player_session().player
+    if player is None:
         return redirect(url_for('home'))
-    player_data = session['player']
-    return render_template('game.html', player=player_data)
+    return render_template('game.html', player=vars(player))
 
 @app.route('/combat')
 def combat():
-    if 'player' not in session:
+    player = player_session().player
+    if player is None:
         return redirect(url_for('home'))
-    player_data = session['player']
     enemy = Enemy("Goblin", 30, 5, 20, 15)  # Example enemy
-    return render_template('combat.html', player=player_data, enemy=enemy.__dict__)
\ No newline at end of file
+    return render_template('combat.html', player=vars(player), enemy=enemy.__dict__)
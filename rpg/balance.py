@@ -0,0 +1,146 @@
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulator import CLASS_NAMES, MAX_TURNS, build_player, simulate, spawn_enemies
+from game_logic import SPAWN_TABLE
+
+MAX_LEVEL = 20
+
+
+def sweep_cells(levels, seeds):
+    """Every (class, level, enemy index, seed index) combination of the sweep"""
+    return list(itertools.product(CLASS_NAMES, levels, range(len(SPAWN_TABLE)), range(seeds)))
+
+
+def run_cell(cell, fights, base_seed, match_level):
+    """Simulate one grid cell and return mergeable counts"""
+    class_type, level, enemy_index, seed_index = cell
+    # The RNG stream depends only on the cell, never on which worker runs it
+    key = (int(class_type), level, enemy_index, seed_index)
+    rng = np.random.default_rng(np.random.SeedSequence(base_seed, spawn_key=key))
+
+    player = build_player(class_type, level)
+    enemy = spawn_enemies(level if match_level else None)[enemy_index]
+    result = simulate(player, enemy, fights, rng)
+    return {
+        "class_type": class_type,
+        "level": level,
+        "enemy_index": enemy_index,
+        "enemy": result.enemy,
+        "enemy_level": result.enemy_level,
+        "fights": result.fights,
+        "wins": result.wins,
+        "turns": int(result.turns.sum()),
+        "kill_turns": np.bincount(result.kill_turns, minlength=MAX_TURNS + 1),
+        "damage_dealt": int(result.damage_dealt.sum()),
+        "damage_taken": int(result.damage_taken.sum()),
+    }
+
+
+def _run_chunk(args):
+    cells, fights, base_seed, match_level = args
+    return [run_cell(cell, fights, base_seed, match_level) for cell in cells]
+
+
+def merge(results):
+    """Merge per-seed cell results into one row per (class, level, enemy)"""
+    merged = {}
+    for r in results:
+        key = (r["class_type"], r["level"], r["enemy_index"])
+        row = merged.get(key)
+        if row is None:
+            merged[key] = dict(r, kill_turns=r["kill_turns"].copy())
+            continue
+        for field in ("fights", "wins", "turns", "damage_dealt", "damage_taken"):
+            row[field] += r[field]
+        row["kill_turns"] += r["kill_turns"]
+    return [merged[key] for key in sorted(merged)]
+
+
+def percentile_from_counts(counts, q):
+    total = counts.sum()
+    if total == 0:
+        return None
+    return int(np.searchsorted(np.cumsum(counts), total * q / 100))
+
+
+# Columns of the sweep report, in the order report_rows fills them
+REPORT_FIELDS = ("class", "level", "enemy", "enemy_level", "fights", "win_rate", "mean_turns",
+                 "turns_p50", "turns_p90", "mean_damage_dealt", "mean_damage_taken")
+
+
+def report_rows(merged):
+    for row in merged:
+        fights = row["fights"]
+        yield {
+            "class": CLASS_NAMES[row["class_type"]],
+            "level": row["level"],
+            "enemy": row["enemy"],
+            "enemy_level": row["enemy_level"],
+            "fights": fights,
+            "win_rate": round(row["wins"] / fights, 4),
+            "mean_turns": round(row["turns"] / fights, 2),
+            "turns_p50": percentile_from_counts(row["kill_turns"], 50),
+            "turns_p90": percentile_from_counts(row["kill_turns"], 90),
+            "mean_damage_dealt": round(row["damage_dealt"] / fights, 1),
+            "mean_damage_taken": round(row["damage_taken"] / fights, 1),
+        }
+
+
+def run_sweep(fights, levels, seeds, base_seed=0, workers=None, match_level=True):
+    """Spread the sweep grid over a process pool and merge the results"""
+    cells = sweep_cells(levels, seeds)
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker keeps every core busy without per-cell IPC overhead
+    chunk_count = min(len(cells), workers * 4)
+    chunks = [cells[i::chunk_count] for i in range(chunk_count)]
+    jobs = [(chunk, fights, base_seed, match_level) for chunk in chunks]
+
+    results = []
+    if workers == 1:
+        for job in jobs:
+            results.extend(_run_chunk(job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_results in executor.map(_run_chunk, jobs):
+                results.extend(chunk_results)
+    return merge(results)
+
+
+def write_report(merged, path=None):
+    stream = open(path, "w", newline="") if path else sys.stdout
+    try:
+        writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(report_rows(merged))
+    finally:
+        if path:
+            stream.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Class balance sweep across classes, levels and enemies")
+    parser.add_argument("--fights", type=int, default=10000, help="fights per cell and seed")
+    parser.add_argument("--min-level", type=int, default=1)
+    parser.add_argument("--max-level", type=int, default=MAX_LEVEL)
+    parser.add_argument("--seeds", type=int, default=4, help="independent seed streams per cell")
+    parser.add_argument("--seed", type=int, default=0, help="base seed of the whole sweep")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--native-enemy-level", action="store_true",
+                        help="keep spawn table enemy levels instead of matching the player level")
+    parser.add_argument("--csv", default=None, help="write the report to this file instead of stdout")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    merged = run_sweep(args.fights, range(args.min_level, args.max_level + 1), args.seeds,
+                       args.seed, args.workers, not args.native_enemy_level)
+    elapsed = time.perf_counter() - start
+    write_report(merged, args.csv)
+    print(f"Swept {len(merged)} cells x {args.seeds} seeds in {elapsed:.2f}s", file=sys.stderr)
@@ -0,0 +1,322 @@
+import contextvars
+import mmap
+import os
+import struct
+from collections import namedtuple
+from enum import IntEnum
+
+from status_effects import StatusEffects
+
+# Append-only binary log of combat state changes
+#
+#   header   magic (8s), rng seed (Q), initial character snapshot length (I),
+#            snapshot bytes, zero padding to a 16-byte boundary
+#   records  16 bytes each: type (B), target (B), name id (H), a, b, c (i)
+#
+# Name ids below LOCAL_NAMES come from the snapshot catalog. Any other name
+# is given a log-local id the first time it appears, defined by NAME records
+# that carry it in 12-byte chunks (target = chunk index).
+MAGIC = b"RPGLOG1\x00"
+HEADER = struct.Struct("<8sQI")
+RECORD = struct.Struct("<BBHiii")
+LOCAL_NAMES = 0x8000
+
+PLAYER = 0
+ENEMY = 1
+
+
+class EventType(IntEnum):
+    NAME = 0
+    COMBAT_START = 1     # enemy name, a=level, b=health, c=damage
+    COMBAT_END = 2       # a=result (0 defeat, 1 victory, 2 fled)
+    DAMAGE = 3           # source name, a=amount
+    HEAL = 4             # source name, a=amount actually restored
+    MANA = 5             # source name, a=change
+    EFFECT_APPLIED = 6   # effect name, a=value, b=duration, c=effect type id | REPLACE flag
+    EFFECT_EXPIRED = 7   # effect name
+    STATUS_TICK = 8      # every effect on target loses one turn
+    ITEM_USED = 9        # item name, a=count change
+    GADGET_CHARGE = 10   # gadget name, a=charges left
+    REWARD = 11          # a=exp, b=gold, c=tech points
+    LEVEL_UP = 12        # a=level, b=max health, c=max mana
+    PURCHASE = 13        # item name, a=kind (BOUGHT_*), b=damage or defense, c=gold spent
+    GADGET_BOUGHT = 14   # gadget name, a=tech points spent
+    EQUIP = 15           # weapon or armor name, a=slot (SLOT_*)
+
+
+COMBAT_DEFEAT = 0
+COMBAT_VICTORY = 1
+COMBAT_FLED = 2
+
+# PURCHASE kinds
+BOUGHT_ITEM = 0
+BOUGHT_WEAPON = 1
+BOUGHT_ARMOR = 2
+
+# EQUIP slots
+SLOT_WEAPON = 0
+SLOT_ARMOR = 1
+
+# EFFECT_APPLIED flag, the low byte holds a status_effects type id
+REPLACE = 0x100  # Replace an existing effect of the same name instead of stacking
+
+Event = namedtuple("Event", ["type", "target", "name", "a", "b", "c"])
+
+
+class EventLogWriter:
+    """Appends combat events for one character to a log file"""
+    def __init__(self, path, player, seed=0, fsync=False):
+        import snapshot
+        self.name_ids = dict(snapshot.NAME_IDS)
+        self.next_local = LOCAL_NAMES
+        self.fsync = fsync
+        self.file = open(path, "wb")
+        data = snapshot.encode_character(player)
+        header = HEADER.pack(MAGIC, seed, len(data)) + data
+        self.file.write(header + b"\x00" * (-len(header) % RECORD.size))
+
+    def _name_id(self, name):
+        if name is None:
+            return 0
+        ref = self.name_ids.get(name)
+        if ref is None:
+            ref = self.name_ids[name] = self.next_local
+            self.next_local += 1
+            data = name.encode("utf-8")
+            for chunk in range(0, max(len(data), 1), 12):
+                a, b, c = struct.unpack("<iii", data[chunk:chunk + 12].ljust(12, b"\x00"))
+                self.file.write(RECORD.pack(EventType.NAME, chunk // 12, ref, a, b, c))
+        return ref
+
+    def emit(self, event_type, target, name=None, a=0, b=0, c=0):
+        self.file.write(RECORD.pack(event_type, target, self._name_id(name), a, b, c))
+
+    def flush(self):
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class EventLog:
+    """Read-only memory-mapped view of a log written by EventLogWriter"""
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.seed, length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a combat log")
+        self.snapshot = bytes(self.map[HEADER.size:HEADER.size + length])
+        header_size = HEADER.size + length
+        self.start = header_size + (-header_size % RECORD.size)
+
+    def __len__(self):
+        return (len(self.map) - self.start) // RECORD.size
+
+    def __iter__(self):
+        """Decoded events in order, NAME records resolved and skipped"""
+        import snapshot
+        catalog = snapshot.NAMES
+        local = {}
+        chunks = {}
+        view = memoryview(self.map)[self.start:self.start + len(self) * RECORD.size]
+        for event_type, target, ref, a, b, c in RECORD.iter_unpack(view):
+            if event_type == EventType.NAME:
+                chunks.setdefault(ref, []).append(struct.pack("<iii", a, b, c))
+                local[ref] = b"".join(chunks[ref]).rstrip(b"\x00").decode("utf-8")
+                continue
+            if ref == 0:
+                name = None
+            elif ref < LOCAL_NAMES:
+                name = catalog[ref - 1]
+            else:
+                name = local[ref]
+            yield Event(EventType(event_type), target, name, a, b, c)
+
+    def records(self):
+        """All raw records as a NumPy structured array, for bulk analysis"""
+        import numpy as np
+        dtype = np.dtype([("type", "u1"), ("target", "u1"), ("name", "<u2"),
+                          ("a", "<i4"), ("b", "<i4"), ("c", "<i4")])
+        return np.frombuffer(self.map, dtype=dtype, count=len(self), offset=self.start)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class Replayer:
+    """Rebuilds Character and Enemy state from a log's snapshot and events"""
+    def __init__(self, log):
+        import snapshot
+        self.log = log
+        self.player = snapshot.decode_character(log.snapshot)
+        self.enemy = None
+
+    def entity(self, target):
+        return self.player if target == PLAYER else self.enemy
+
+    def apply(self, event):
+        kind = event.type
+        if kind == EventType.COMBAT_START:
+            from game_logic import Enemy
+            enemy = Enemy.__new__(Enemy)
+            enemy.name = event.name
+            enemy.level = event.a
+            enemy.health = enemy.max_health = event.b
+            enemy.damage = event.c
+            enemy.exp_reward = enemy.gold_reward = 0
+            enemy.status_effects = StatusEffects()
+            enemy.abilities = {}
+            enemy.is_boss = False
+            self.enemy = enemy
+        elif kind == EventType.DAMAGE:
+            self.entity(event.target).health -= event.a
+        elif kind == EventType.HEAL:
+            self.entity(event.target).health += event.a
+        elif kind == EventType.MANA:
+            self.player.mana += event.a
+        elif kind == EventType.EFFECT_APPLIED:
+            self.entity(event.target).status_effects.add(
+                event.name, event.c & 0xFF, event.a, event.b, replace=bool(event.c & REPLACE))
+        elif kind == EventType.STATUS_TICK:
+            # Expired effects are dropped here, EFFECT_EXPIRED only records which ones
+            self.entity(event.target).status_effects.advance()
+        elif kind == EventType.ITEM_USED:
+            self.player.inventory[event.name] = self.player.inventory.get(event.name, 0) + event.a
+        elif kind == EventType.GADGET_CHARGE:
+            self.player.gadgets[event.name].charges = event.a
+        elif kind == EventType.REWARD:
+            self.player.exp += event.a
+            self.player.gold += event.b
+            self.player.tech_points += event.c
+        elif kind == EventType.LEVEL_UP:
+            self.player.level = event.a
+            self.player.exp = 0
+            self.player.max_health = self.player.health = event.b
+            self.player.max_mana = self.player.mana = event.c
+        elif kind == EventType.PURCHASE:
+            self.player.gold -= event.c
+            if event.a == BOUGHT_WEAPON:
+                self.player.weapons[event.name] = event.b
+            elif event.a == BOUGHT_ARMOR:
+                self.player.armor[event.name] = event.b
+            else:
+                self.player.inventory[event.name] = self.player.inventory.get(event.name, 0) + 1
+        elif kind == EventType.GADGET_BOUGHT:
+            from game_logic import create_gadget
+            self.player.tech_points -= event.a
+            self.player.gadgets[event.name] = create_gadget(event.name)
+        elif kind == EventType.EQUIP:
+            if event.a == SLOT_WEAPON:
+                self.player.current_weapon = event.name
+            else:
+                self.player.current_armor = event.name
+
+    def run(self, stop=None):
+        """Apply events in order, optionally only the first `stop` of them"""
+        for i, event in enumerate(self.log):
+            if stop is not None and i >= stop:
+                break
+            self.apply(event)
+        return self.player, self.enemy
+
+
+# Recorder used by game_logic, per context so concurrent sessions each get
+# their own; None when nothing is recording
+_recorder = contextvars.ContextVar("combat_recorder", default=None)
+
+
+def start_recording(path, player, seed=0, fsync=False):
+    stop_recording()
+    recorder = EventLogWriter(path, player, seed, fsync)
+    _recorder.set(recorder)
+    return recorder
+
+
+def stop_recording():
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.close()
+        _recorder.set(None)
+
+
+def emit(event_type, target, name=None, a=0, b=0, c=0):
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.emit(event_type, target, name, a, b, c)
+
+
+if __name__ == "__main__":
+    # Replay check: shop, equip and fight with a recorded character, then
+    # rebuild it from the log and compare with the live one
+    import argparse
+    import random
+    import tempfile
+
+    import combat_log  # The recorder game_logic emits to lives in the imported module
+    import game_logic
+    import output
+    import snapshot
+    from spawner import Spawner
+
+    parser = argparse.ArgumentParser(description="Combat log replay check")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--fights", type=int, default=20)
+    args = parser.parse_args()
+
+    def answer(flow, reply):
+        """Drive a game flow, reply(prompt) gives each answer"""
+        try:
+            prompt = next(flow)
+            while True:
+                prompt = flow.send(reply(prompt))
+        except StopIteration as stop:
+            return stop.value
+
+    def scripted(answers):
+        answers = iter(answers)
+        return lambda prompt: next(answers)
+
+    output.set_sink(output.NullSink())
+    random.seed(args.seed)
+    player = game_logic.Character("Tester", "1")
+    player.gold, player.tech_points = 500, 150
+    fd, path = tempfile.mkstemp(suffix=".rpglog")
+    os.close(fd)
+    try:
+        combat_log.start_recording(path, player, args.seed)
+        try:
+            answer(game_logic.shop(player), scripted(["iron sword", "leather armor", "health potion", "exit"]))
+            answer(game_logic.gadget_shop(player), scripted(["health generator", "exit"]))
+            answer(game_logic.show_inventory_menu(player), scripted(["2", "2", "3", "2", "4"]))
+            spawner = Spawner(game_logic.SPAWN_TABLE)
+            fights = 0
+            for fights in range(1, args.fights + 1):
+                used = []
+
+                def fight(prompt):
+                    if prompt.startswith("Choose gadget"):
+                        return "Health Generator"
+                    if not used and player.gadgets["Health Generator"].charges:
+                        used.append(True)
+                        return "4"
+                    return "1"
+                if answer(game_logic.combat(player, spawner.spawn(player.level)), fight) is False:
+                    break
+        finally:
+            combat_log.stop_recording()
+
+        log = combat_log.EventLog(path)
+        replayed, _ = combat_log.Replayer(log).run()
+        same = snapshot.encode_character(replayed) == snapshot.encode_character(player)
+        print(f"{fights} fights, {len(log)} records, level {player.level}, gold {player.gold}: "
+              f"replay {'matches' if same else 'DIFFERS'}")
+        log.close()
+    finally:
+        os.remove(path)
+    if not same:
+        raise SystemExit(1)
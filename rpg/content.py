@@ -0,0 +1,201 @@
+import copyreg
+import io
+import json
+import os
+import pickle
+import sys
+from collections import namedtuple
+from types import MappingProxyType
+
+# Game content: class and enemy stats, abilities, items, gadgets and the
+# tables of modifiers, read from data/content.json so balance changes need
+# no code. The built records are cached next to the file in __pycache__,
+# keyed by the source file's mtime and size, so startup after the first run
+# is one unpickle instead of parsing, validating and freezing the JSON.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CONTENT_PATH = os.path.join(DATA_DIR, "content.json")
+CACHE_VERSION = 2
+
+# Record types for sections of uniform entries, keyed by their first field.
+# Fields with defaults are optional in the data file. Other sections are
+# read-only mappings as written.
+CharacterStats = namedtuple("CharacterStats", ["id", "hp", "attack", "defense"])
+ClassDefinition = namedtuple("ClassDefinition", ["id", "aliases", "health", "mana", "abilities"])
+EnemyEntry = namedtuple("EnemyEntry", ["id", "health", "damage", "exp_reward", "gold_reward", "level",
+                                       "weight", "min_level"])
+ShopItem = namedtuple("ShopItem", ["id", "cost", "min_level", "effect", "damage", "defense", "mana_bonus"],
+                      defaults=(None, None, None, None))
+GadgetEntry = namedtuple("GadgetEntry", ["id", "rarity", "effect", "cost", "min_level"], defaults=(1,))
+PotionEntry = namedtuple("PotionEntry", ["id", "name", "effects", "durability", "default_durability"])
+
+RECORDS = {
+    "characters": CharacterStats,
+    "classes": ClassDefinition,
+    "enemies": EnemyEntry,
+    "shop_items": ShopItem,
+    "gadgets": GadgetEntry,
+    "potions": PotionEntry,
+}
+
+
+class ContentError(ValueError):
+    """Raised for content files with missing, unknown or malformed entries"""
+    pass
+
+
+def freeze(value):
+    """Read-only copy of parsed JSON: mappings become proxies, lists tuples, strings interned"""
+    if isinstance(value, dict):
+        return MappingProxyType({freeze(key): freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def thaw(value):
+    """Mutable copy of frozen content, for objects that change or deep-copy what they are given"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def compile_content(data, source=CONTENT_PATH):
+    """Check parsed content against the record types and build the read-only sections"""
+    if not isinstance(data, dict):
+        raise ContentError(f"{source}: expected an object of sections")
+    sections = {}
+    for section, entries in data.items():
+        if not isinstance(entries, dict):
+            raise ContentError(f"{source}: section {section} is not an object")
+        record = RECORDS.get(section)
+        if record is None:
+            sections[section] = freeze(entries)
+            continue
+        fields = record._fields[1:]
+        required = fields[:len(fields) - len(record._field_defaults)]
+        rows = []
+        for entry_id, entry in entries.items():
+            missing = [name for name in required if name not in entry]
+            unknown = [name for name in entry if name not in fields]
+            if missing or unknown:
+                raise ContentError(f"{source}: {section}/{entry_id}: missing {missing}, unknown {unknown}")
+            row = [entry_id] + [entry.get(name, record._field_defaults.get(name)) for name in fields]
+            rows.append(record._make(freeze(row)))
+        sections[section] = MappingProxyType({row.id: row for row in rows})
+    return sections
+
+
+def _cache_path(path):
+    return os.path.join(os.path.dirname(path), "__pycache__", os.path.basename(path) + ".pickle")
+
+
+def _proxy(mapping):
+    return MappingProxyType(mapping)
+
+
+# Read-only mappings do not pickle by default; only the cache writer may
+# pickle them, as a rebuild from a plain dict
+_CACHE_DISPATCH = copyreg.dispatch_table.copy()
+_CACHE_DISPATCH[MappingProxyType] = lambda proxy: (_proxy, (dict(proxy),))
+
+
+def _read_cache(path, stamp):
+    try:
+        with open(_cache_path(path), "rb") as f:
+            cached_stamp, sections = pickle.load(f)
+    except (OSError, EOFError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+        return None
+    return sections if cached_stamp == stamp else None
+
+
+def _write_cache(path, stamp, sections):
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _CACHE_DISPATCH
+    pickler.dump((stamp, sections))
+    cache = _cache_path(path)
+    tmp = cache + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # Read-only install, parse on every start instead
+
+
+class Catalog:
+    """Immutable game content: each section maps an ID to its record
+
+    Sections are attributes, so catalog.gadgets["Smoke Bomb"] is a dict
+    lookup returning a shared GadgetEntry. Records and everything inside
+    them are read-only; use thaw() for a copy an object may change.
+    """
+    def __init__(self, sections):
+        self.sections = MappingProxyType(sections)
+        self.__dict__.update(sections)
+
+    def get(self, section, entry_id):
+        return self.sections[section][entry_id]
+
+
+def load(path=CONTENT_PATH, use_cache=True):
+    """Catalog for a content file, from the compiled cache when it is still current"""
+    info = os.stat(path)
+    stamp = (CACHE_VERSION, info.st_mtime_ns, info.st_size)
+    sections = _read_cache(path, stamp) if use_cache else None
+    if sections is None:
+        with open(path, encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ContentError(f"{path}: {e}") from e
+        sections = compile_content(data, path)
+        if use_cache:
+            _write_cache(path, stamp, sections)
+    return Catalog(sections)
+
+
+_catalog = None
+
+
+def catalog():
+    """The shared catalog of the default content file, loaded on first use"""
+    global _catalog
+    if _catalog is None:
+        _catalog = load()
+    return _catalog
+
+
+def base_stats(name):
+    """(hp, attack, defense) of a character class in the shared catalog"""
+    stats = catalog().characters[name]
+    return stats.hp, stats.attack, stats.defense
+
+
+if __name__ == "__main__":
+    # Startup cost of the catalog: parsing, validating and freezing the
+    # JSON against loading the compiled cache
+    import argparse
+    import time
+
+    import content  # Records must pickle under their importable module name
+
+    parser = argparse.ArgumentParser(description="Content catalog load benchmark")
+    parser.add_argument("--path", default=CONTENT_PATH)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    content.load(args.path)  # Make sure the cache is current
+    for label, use_cache in (("parse JSON", False), ("compiled cache", True)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            loaded = content.load(args.path, use_cache)
+        elapsed = time.perf_counter() - start
+        print(f"{label:15} {elapsed / args.repeat * 1000:7.3f} ms per load")
+    for section, entries in loaded.sections.items():
+        print(f"  {section:18} {len(entries)} entries")
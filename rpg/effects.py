@@ -0,0 +1,110 @@
+import random
+
+import pygame
+
+
+class Effect:
+    """Something that plays out over `duration` milliseconds of game time"""
+    def __init__(self, duration):
+        self.duration = duration
+        self.elapsed = 0
+
+    @property
+    def remaining(self):
+        return max(0.0, 1 - self.elapsed / self.duration)
+
+    def update(self, dt):
+        """Advance by dt milliseconds, returns False once finished"""
+        self.elapsed += dt
+        return self.elapsed < self.duration
+
+    def draw(self, surface):
+        pass
+
+
+class ScreenShake(Effect):
+    """Random camera offset that fades out over its duration"""
+    def __init__(self, duration, magnitude):
+        super().__init__(duration)
+        self.magnitude = magnitude
+
+    def offset(self):
+        reach = int(self.magnitude * self.remaining + 0.5)
+        return (random.randint(-reach, reach), random.randint(-reach, reach))
+
+
+class Flash(Effect):
+    """Full-screen color overlay that fades out"""
+    _overlays = {}  # (size, color) -> overlay surface, shared by every flash
+
+    def __init__(self, duration, color, alpha=96):
+        super().__init__(duration)
+        self.color = color
+        self.alpha = alpha
+
+    def draw(self, surface):
+        key = (surface.get_size(), self.color)
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = self._overlays[key] = pygame.Surface(surface.get_size())
+            overlay.fill(self.color)
+        overlay.set_alpha(int(self.alpha * self.remaining))
+        surface.blit(overlay, (0, 0))
+
+
+class DamageNumber(Effect):
+    """Text rendered once that floats upwards and fades"""
+    def __init__(self, duration, text_surface, x, y, rise=0.05):
+        super().__init__(duration)
+        self.image = text_surface
+        self.x = x
+        self.y = y
+        self.rise = rise  # Pixels per millisecond
+
+    def draw(self, surface):
+        self.image.set_alpha(int(255 * self.remaining))
+        surface.blit(self.image, (self.x, self.y - self.elapsed * self.rise))
+
+
+class EffectsTimeline:
+    """Frame-driven visual effects, advanced by the frame delta, never blocking
+
+    Screen shake only produces a camera offset for the renderer; there is at
+    most one shake, and shaking again while one runs extends it instead of
+    stacking.
+    """
+    def __init__(self):
+        self.effects = []
+        self.shaking = None
+
+    def add(self, effect):
+        self.effects.append(effect)
+        return effect
+
+    def shake(self, duration=250, magnitude=5):
+        current = self.shaking
+        if current is not None and current.elapsed < current.duration:
+            current.duration = max(current.duration, current.elapsed + duration)
+            current.magnitude = max(current.magnitude, magnitude)
+            return current
+        self.shaking = ScreenShake(duration, magnitude)
+        return self.shaking
+
+    def flash(self, color, duration=150):
+        return self.add(Flash(duration, color))
+
+    def damage_number(self, font, amount, x, y, color=(255, 0, 0), duration=600):
+        return self.add(DamageNumber(duration, font.render(str(amount), True, color), x, y))
+
+    def update(self, dt):
+        """Advance every effect by dt milliseconds and drop finished ones"""
+        self.effects = [effect for effect in self.effects if effect.update(dt)]
+        if self.shaking is not None and not self.shaking.update(dt):
+            self.shaking = None
+
+    def camera_offset(self):
+        return self.shaking.offset() if self.shaking is not None else (0, 0)
+
+    def draw(self, surface):
+        for effect in self.effects:
+            effect.draw(surface)
@@ -0,0 +1,188 @@
+import numpy as np
+
+CHASE = 0
+CIRCLE = 1
+AMBUSH = 2
+BEHAVIORS = {"chase": CHASE, "circle": CIRCLE, "ambush": AMBUSH}
+
+CIRCLE_SPEED = 1.2   # Radians per second around the player
+AMBUSH_BOOST = 2     # Speed multiplier while an ambusher charges
+
+
+class EnemyBatch:
+    """Structure-of-arrays enemy movement for large enemy counts
+
+    Positions, speeds, circle angles, behavior codes and attack ranges live
+    in contiguous NumPy arrays indexed by slot, and one update() moves every
+    chase, circle and ambush enemy at once. Positions are kept as floats, so
+    slow enemies no longer lose their fractional steps to integer rects;
+    sync() copies them, or a blend with the previous step's, to the
+    sprites' rects for drawing.
+    """
+    def __init__(self, width, height, capacity=256):
+        self.width = width
+        self.height = height
+        self.size = 0             # Slots in use, live or free
+        self.free = []
+        self.sprites = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        def grow(name, dtype, fill=0):
+            array = np.full(capacity, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:len(old)] = old
+            setattr(self, name, array)
+        grow("x", np.float64)
+        grow("y", np.float64)
+        grow("prev_x", np.float64)
+        grow("prev_y", np.float64)
+        grow("w", np.float64)
+        grow("h", np.float64)
+        grow("speed", np.float64)
+        grow("angle", np.float64)
+        grow("radius", np.float64)
+        grow("attack_range", np.float64)
+        grow("behavior", np.int8)
+        grow("alive", bool, False)
+        self.capacity = capacity
+
+    def add(self, sprite):
+        """Take over movement of an Enemy sprite and return its slot"""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+            self.sprites.append(None)
+        rect = sprite.rect
+        self.x[slot] = self.prev_x[slot] = sprite.x
+        self.y[slot] = self.prev_y[slot] = sprite.y
+        self.w[slot] = rect.width
+        self.h[slot] = rect.height
+        self.speed[slot] = sprite.speed
+        self.angle[slot] = sprite.circle_angle
+        self.radius[slot] = sprite.circle_radius
+        self.attack_range[slot] = sprite.attack_range
+        self.behavior[slot] = BEHAVIORS[sprite.behavior_type]
+        self.alive[slot] = True
+        self.sprites[slot] = sprite
+        return slot
+
+    def remove(self, slot):
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self.sprites[slot] = None
+            self.free.append(slot)
+
+    def __len__(self):
+        return self.size - len(self.free)
+
+    def update(self, px, py, dt):
+        """Advance every live enemy dt seconds towards a player at (px, py)"""
+        n = self.size
+        if n == 0:
+            return
+        alive = self.alive[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        behavior = self.behavior[:n]
+        dx = px - x
+        dy = py - y
+        distance = np.hypot(dx, dy)
+
+        # Chasers always close in, ambushers only inside their attack range
+        step = np.where(behavior == AMBUSH, self.speed[:n] * AMBUSH_BOOST, self.speed[:n]) * dt
+        moving = alive & (distance > 0) & (
+            (behavior == CHASE) | ((behavior == AMBUSH) & (distance < self.attack_range[:n])))
+        factor = np.divide(step, distance, out=np.zeros(n), where=moving)
+        x += dx * factor
+        y += dy * factor
+
+        circling = np.flatnonzero(alive & (behavior == CIRCLE))
+        if circling.size:
+            angle = self.angle[circling] + CIRCLE_SPEED * dt
+            self.angle[circling] = angle
+            radius = self.radius[circling]
+            x[circling] = px + np.cos(angle) * radius
+            y[circling] = py + np.sin(angle) * radius
+
+        np.clip(x, 0, self.width - self.w[:n], out=x)
+        np.clip(y, 0, self.height - self.h[:n], out=y)
+
+    def sync(self, alpha=1.0):
+        """Copy positions to the sprites, marking moved sprites dirty
+
+        The rects get `alpha` of the way from the previous step's position
+        to the current one; the sprites' float x and y always get the
+        current position.
+        """
+        n = self.size
+        x = self.x[:n]
+        y = self.y[:n]
+        if alpha != 1.0:
+            prev_x = self.prev_x[:n]
+            prev_y = self.prev_y[:n]
+            xs = (prev_x + (x - prev_x) * alpha).astype(np.int64).tolist()
+            ys = (prev_y + (y - prev_y) * alpha).astype(np.int64).tolist()
+        else:
+            xs = x.astype(np.int64).tolist()
+            ys = y.astype(np.int64).tolist()
+        for sprite, fx, fy, x, y in zip(self.sprites, x.tolist(), y.tolist(), xs, ys):
+            if sprite is None:
+                continue
+            sprite.x = fx
+            sprite.y = fy
+            if sprite.rect.x != x or sprite.rect.y != y:
+                sprite.rect.x = x
+                sprite.rect.y = y
+                sprite.dirty = 1
+
+
+if __name__ == "__main__":
+    # Frame-time benchmark for the batched update at growing enemy counts
+    import argparse
+    import random
+    import time
+
+    class _Rect:
+        __slots__ = ("x", "y", "width", "height")
+
+        def __init__(self, x, y):
+            self.x, self.y, self.width, self.height = x, y, 20, 20
+
+    class _Enemy:
+        def __init__(self, x, y):
+            self.rect = _Rect(x, y)
+            self.x, self.y = x, y
+            self.speed = random.uniform(90, 180)
+            self.behavior_type = random.choice(list(BEHAVIORS))
+            self.attack_range = 100
+            self.circle_radius = 150
+            self.circle_angle = random.uniform(0, 2 * np.pi)
+
+    parser = argparse.ArgumentParser(description="Batched enemy update benchmark")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+
+    for count in args.counts:
+        batch = EnemyBatch(1000, 800)
+        for _ in range(count):
+            batch.add(_Enemy(random.randint(0, 1000), random.randint(0, 800)))
+        update_time = sync_time = 0.0
+        for frame in range(args.frames):
+            px, py = 500 + 100 * np.cos(frame / 30), 400 + 100 * np.sin(frame / 30)
+            start = time.perf_counter()
+            batch.update(px, py, 1 / 60)
+            update_time += time.perf_counter() - start
+            start = time.perf_counter()
+            batch.sync()
+            sync_time += time.perf_counter() - start
+        print(f"{count:>6} enemies: update {update_time / args.frames * 1000:6.2f} ms, "
+              f"sync {sync_time / args.frames * 1000:6.2f} ms per frame (budget 16.7 ms)")
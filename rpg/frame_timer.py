@@ -0,0 +1,54 @@
+import sys
+import time
+
+FRAME_BUDGET = 1000 / 60  # Milliseconds per frame at 60 FPS
+
+
+class FrameTimer:
+    """Histogram of per-frame work time, excluding the clock.tick() wait"""
+    def __init__(self, budget=FRAME_BUDGET, bucket=1.0, buckets=50):
+        self.budget = budget
+        self.bucket = bucket
+        self.counts = [0] * (buckets + 1)   # The last bucket collects everything slower
+        self.frames = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.over_budget = 0
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """End the current frame and return its work time in milliseconds"""
+        elapsed = (time.perf_counter() - self._start) * 1000
+        self.record(elapsed)
+        return elapsed
+
+    def record(self, elapsed):
+        self.counts[min(int(elapsed / self.bucket), len(self.counts) - 1)] += 1
+        self.frames += 1
+        self.total += elapsed
+        self.worst = max(self.worst, elapsed)
+        if elapsed > self.budget:
+            self.over_budget += 1
+
+    def histogram(self):
+        """(low, high, count) per non-empty bucket, high None for the overflow bucket"""
+        last = len(self.counts) - 1
+        return [(i * self.bucket, None if i == last else (i + 1) * self.bucket, count)
+                for i, count in enumerate(self.counts) if count]
+
+    def report(self, stream=None):
+        stream = stream or sys.stdout
+        if not self.frames:
+            stream.write("No frames recorded\n")
+            return
+        stream.write(f"{self.frames} frames, mean {self.total / self.frames:.2f} ms, "
+                     f"worst {self.worst:.2f} ms, {self.over_budget} over the "
+                     f"{self.budget:.1f} ms budget\n")
+        peak = max(self.counts)
+        for low, high, count in self.histogram():
+            label = f"{low:5.1f}-{high:5.1f} ms" if high is not None else f"{low:5.1f}+     ms"
+            bar = "#" * max(1, int(40 * count / peak))
+            stream.write(f"  {label} {count:7d} {bar}\n")
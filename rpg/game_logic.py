@@ -1,5 +1,15 @@
+import argparse
 import random
-import time
+
+import combat_log
+import output
+from abilities import class_level, get_scaling_factor, lookup_row
+from combat_log import emit, EventType, PLAYER, ENEMY, REPLACE
+from content import catalog
+from shops import GadgetShop, ItemShop, BOUGHT, LOCKED, NOT_ENOUGH
+from status_effects import StatusEffects, DAMAGE_OVER_TIME, HEAL_OVER_TIME, DEFENSE
+
+CONTENT = catalog()
 
 class Character:
     def __init__(self, name, class_type):
@@ -16,7 +26,7 @@ class Character:
         self.weapons = {"Basic Sword": 8}
         self.current_weapon = "Basic Sword"
         self.abilities = {}
-        self.status_effects = []
+        self.status_effects = StatusEffects()
         self.armor = {"Basic Leather": 5}
         self.current_armor = "Basic Leather"
         self.tech_points = 0
@@ -27,97 +37,35 @@ class Character:
         
     def get_scaling_factor(self):
         """Calculate scaling factor based on level"""
-        return 1 + (self.level - 1) * 0.15
+        return get_scaling_factor(self.level)
         
     def update_abilities(self):
         """Update abilities based on level and class"""
-        scaling = self.get_scaling_factor()
-        
-        if self.class_type.lower() in ["warrior", "1"]:
-            self.health = 140 + (self.level - 1) * 25    # Increased health scaling
-            self.max_health = self.health
-            self.mana = 40 + (self.level - 1) * 8        # Reduced mana scaling
-            self.max_mana = self.mana
-            base_abilities = {
-                "Rage": {"damage": int(25 * scaling), "mana_cost": 15, "description": "Strong attack with bonus damage"},
-                "Shield Block": {"defense": int(15 * scaling), "duration": 2, "mana_cost": 10, "description": "Temporary defense boost"}
-            }
-            if self.level >= 3:
-                base_abilities["Whirlwind"] = {"damage": int(18 * scaling), "hits": 3, "mana_cost": 25, "description": "Hit multiple times"}
-            if self.level >= 5:
-                base_abilities["Berserk"] = {"damage": int(40 * scaling), "mana_cost": 30, "description": "Powerful rage attack"}
-                
-        elif self.class_type.lower() in ["mage", "2"]:
-            self.health = 80 + (self.level - 1) * 12     # Reduced health scaling
-            self.max_health = self.health
-            self.mana = 100 + (self.level - 1) * 20      # Increased mana scaling
-            self.max_mana = self.mana
-            base_abilities = {
-                "Fireball": {"damage": int(20 * scaling), "duration": 3, "mana_cost": 15, "description": "Fire damage over time"},
-                "Frost Bolt": {"damage": int(25 * scaling), "mana_cost": 20, "description": "Direct magic damage"}
-            }
-            if self.level >= 3:
-                base_abilities["Lightning Strike"] = {"damage": int(35 * scaling), "mana_cost": 25, "description": "Powerful lightning attack"}
-            if self.level >= 5:
-                base_abilities["Meteor"] = {"damage": int(50 * scaling), "mana_cost": 40, "description": "Massive area damage"}
-
-        elif self.class_type.lower() in ["paladin", "3"]:
-            self.health = 120 + (self.level - 1) * 20    # Balanced health scaling
-            self.max_health = self.health
-            self.mana = 60 + (self.level - 1) * 12       # Balanced mana scaling
-            self.max_mana = self.mana
-            base_abilities = {
-                "Holy Strike": {"damage": int(20 * scaling), "heal": int(10 * scaling), "mana_cost": 15, "description": "Holy damage with healing"},
-                "Divine Shield": {"defense": int(20 * scaling), "duration": 3, "mana_cost": 20, "description": "Strong defensive barrier"}
-            }
-            if self.level >= 3:
-                base_abilities["Consecration"] = {"damage": int(15 * scaling), "heal": int(15 * scaling), "mana_cost": 25, "description": "Area damage and healing"}
-            if self.level >= 5:
-                base_abilities["Divine Storm"] = {"damage": int(35 * scaling), "heal": int(20 * scaling), "mana_cost": 35, "description": "Powerful holy attack with healing"}
-
-        elif self.class_type.lower() in ["necromancer", "4"]:
-            self.health = 90 + (self.level - 1) * 15     # Low health scaling
-            self.max_health = self.health
-            self.mana = 90 + (self.level - 1) * 18       # High mana scaling
-            self.max_mana = self.mana
-            base_abilities = {
-                "Death Bolt": {"damage": int(22 * scaling), "mana_cost": 15, "description": "Dark magic damage"},
-                "Life Drain": {"damage": int(18 * scaling), "heal": int(15 * scaling), "mana_cost": 20, "description": "Drain life from enemy"}
-            }
-            if self.level >= 3:
-                base_abilities["Curse"] = {"damage": int(12 * scaling), "duration": 4, "mana_cost": 25, "description": "Strong damage over time"}
-            if self.level >= 5:
-                base_abilities["Death Nova"] = {"damage": int(45 * scaling), "mana_cost": 40, "description": "Massive dark damage"}
-
-        elif self.class_type.lower() in ["assassin", "5"]:
-            self.health = 95 + (self.level - 1) * 14     # Medium-low health scaling
-            self.max_health = self.health
-            self.mana = 50 + (self.level - 1) * 10       # Medium mana scaling
-            self.max_mana = self.mana
-            base_abilities = {
-                "Backstab": {"damage": int(30 * scaling), "mana_cost": 15, "description": "High damage from stealth"},
-                "Poison Strike": {"damage": int(15 * scaling), "duration": 3, "mana_cost": 20, "description": "Poisoned weapon attack"}
-            }
-            if self.level >= 3:
-                base_abilities["Shadow Step"] = {"damage": int(25 * scaling), "mana_cost": 25, "description": "Teleport behind enemy and strike"}
-            if self.level >= 5:
-                base_abilities["Death Mark"] = {"damage": int(45 * scaling), "duration": 2, "mana_cost": 35, "description": "Mark target for death"}
-
-        elif self.class_type.lower() in ["druid", "6"]:
-            self.health = 110 + (self.level - 1) * 18    # Medium-high health scaling
-            self.max_health = self.health
-            self.mana = 70 + (self.level - 1) * 15       # Medium-high mana scaling
-            self.max_mana = self.mana
-            base_abilities = {
-                "Nature's Wrath": {"damage": int(20 * scaling), "mana_cost": 15, "description": "Nature damage"},
-                "Regrowth": {"heal": int(25 * scaling), "duration": 3, "mana_cost": 20, "description": "Strong healing over time"}
-            }
-            if self.level >= 3:
-                base_abilities["Entangling Roots"] = {"damage": int(18 * scaling), "duration": 2, "mana_cost": 25, "description": "Root and damage over time"}
-            if self.level >= 5:
-                base_abilities["Hurricane"] = {"damage": int(35 * scaling), "hits": 3, "mana_cost": 35, "description": "Multiple nature damage hits"}
-
-        self.abilities = base_abilities
+        # Stats and abilities come from the shared precomputed table in
+        # abilities.py, every character at this class and level holds the
+        # same read-only ability mapping
+        row = class_level(self.class_type, self.level)
+        self.health = row.health
+        self.max_health = row.health
+        self.mana = row.mana
+        self.max_mana = row.mana
+        self.abilities = row.abilities
+
+    def __getstate__(self):
+        # Shared ability tables are pickled as their (class, level) key
+        state = self.__dict__.copy()
+        row = lookup_row(self.abilities)
+        if row is not None:
+            state["abilities"] = ("table", row.class_key, row.level)
+        else:
+            state["abilities"] = {name: dict(details) for name, details in self.abilities.items()}
+        return state
+
+    def __setstate__(self, state):
+        abilities = state["abilities"]
+        if isinstance(abilities, tuple):
+            state["abilities"] = class_level(abilities[1], abilities[2]).abilities
+        self.__dict__.update(state)
 
 # Add Gadget class
 class Gadget:
@@ -143,6 +91,15 @@ class Gadget:
             return True
         return False
 
+# Gadget definitions: name -> (rarity, effect, cost)
+GADGET_CATALOG = {gadget.id: (gadget.rarity, gadget.effect, gadget.cost)
+                  for gadget in CONTENT.gadgets.values()}
+
+def create_gadget(name):
+    """Create a fresh Gadget from the catalog"""
+    rarity, effect, cost = GADGET_CATALOG[name]
+    return Gadget(name, rarity, dict(effect), cost)
+
 # Update Enemy class for better balance
 class Enemy:
     def __init__(self, name, health, damage, exp_reward, gold_reward, level=1):
@@ -155,7 +112,7 @@ class Enemy:
         self.damage = int(damage * level_multiplier)
         self.exp_reward = int(exp_reward * level_multiplier)
         self.gold_reward = int(gold_reward * level_multiplier)
-        self.status_effects = []
+        self.status_effects = StatusEffects()
         self.abilities = {}
         self.is_boss = False
         
@@ -168,19 +125,28 @@ class Enemy:
         self.health = max(0, self.health - amount)
         return amount
 
+# Enemy spawn table: (name, health, damage, exp_reward, gold_reward, level), spawn chance, min player level
+SPAWN_TABLE = [((enemy.id, enemy.health, enemy.damage, enemy.exp_reward, enemy.gold_reward, enemy.level),
+                enemy.weight, enemy.min_level)
+               for enemy in CONTENT.enemies.values()]
+
 def print_slow(text):
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(0.03)
-    print()
+    """Write a line through the configured output sink (see output.py)"""
+    output.write(text)
 
 def combat(player, enemy):
     print_slow(f"\nA {enemy.name} appears!")
+    emit(EventType.COMBAT_START, ENEMY, enemy.name, enemy.level, enemy.health, enemy.damage)
     
+    new_turn = True
     while enemy.health > 0 and player.health > 0:
-        # Process status effects at start of turn
-        process_status_effects(player)
-        process_status_effects(enemy)
+        # Process status effects at start of turn, not again after a cancelled action
+        if new_turn:
+            new_turn = False
+            process_status_effects(player)
+            process_status_effects(enemy)
+            if enemy.health <= 0 or player.health <= 0:
+                break
         
         # Display battle status
         print_slow(f"\n{'-'*40}")
@@ -192,7 +158,7 @@ def combat(player, enemy):
         if player.status_effects:
             print_slow("\nYour status effects:")
             for effect in player.status_effects:
-                print_slow(f"- {effect['name']} ({effect['duration']} turns)")
+                print_slow(f"- {effect.name} ({effect.duration} turns)")
         
         # Combat options
         print_slow("\nWhat would you like to do?")
@@ -202,17 +168,18 @@ def combat(player, enemy):
         print_slow("4. Use Gadget")
         print_slow("5. Run")
         
-        choice = input("> ")
+        choice = (yield "> ")
         
         # Process turn
         if choice == "1":
             damage = process_attack(player, enemy)
             enemy.health -= damage
+            emit(EventType.DAMAGE, ENEMY, None, damage)
             print_slow(f"You deal {damage} damage to the {enemy.name}!")
             
         elif choice == "2":
             show_abilities(player)
-            ability = input("Choose ability (or 'back'): ")
+            ability = (yield "Choose ability (or 'back'): ")
             if ability in player.abilities and player.mana >= player.abilities[ability]["mana_cost"]:
                 process_ability(player, enemy, ability)
             else:
@@ -226,15 +193,21 @@ def combat(player, enemy):
             if player.inventory.get("Mana Potion", 0) > 0:
                 print_slow("2. Mana Potion")
             
-            item_choice = input("Choose item to use (or 'back'): ")
+            item_choice = (yield "Choose item to use (or 'back'): ")
             
             if item_choice == "1" and player.inventory.get("Health Potion", 0) > 0:
-                player.health = min(player.max_health, player.health + 30)
+                healed = min(player.max_health, player.health + 30) - player.health
+                player.health += healed
                 player.inventory["Health Potion"] -= 1
+                emit(EventType.ITEM_USED, PLAYER, "Health Potion", -1)
+                emit(EventType.HEAL, PLAYER, "Health Potion", healed)
                 print_slow("You drink a health potion and recover 30 HP!")
             elif item_choice == "2" and player.inventory.get("Mana Potion", 0) > 0:
-                player.mana = min(player.max_mana, player.mana + 25)
+                restored = min(player.max_mana, player.mana + 25) - player.mana
+                player.mana += restored
                 player.inventory["Mana Potion"] -= 1
+                emit(EventType.ITEM_USED, PLAYER, "Mana Potion", -1)
+                emit(EventType.MANA, PLAYER, "Mana Potion", restored)
                 print_slow("You drink a mana potion and recover 25 MP!")
             elif item_choice.lower() == "back":
                 continue
@@ -249,10 +222,11 @@ def combat(player, enemy):
                     if gadget.charges > 0:
                         print_slow(f"{name} ({gadget.charges} charges)")
                 
-                gadget_choice = input("Choose gadget (or 'back'): ").title()
+                gadget_choice = (yield "Choose gadget (or 'back'): ").title()
                 if gadget_choice in player.gadgets:
                     gadget = player.gadgets[gadget_choice]
                     if gadget.use(player, enemy):
+                        emit(EventType.GADGET_CHARGE, PLAYER, gadget_choice, gadget.charges)
                         process_gadget_effect(player, enemy, gadget.effect)
                     else:
                         print_slow("No charges remaining!")
@@ -264,6 +238,7 @@ def combat(player, enemy):
         elif choice == "5":
             if random.random() < 0.5:
                 print_slow("You successfully fled from combat!")
+                emit(EventType.COMBAT_END, ENEMY, None, combat_log.COMBAT_FLED)
                 return "fled"  # Changed return value to indicate fled status
             else:
                 print_slow("You failed to run away!")
@@ -272,10 +247,13 @@ def combat(player, enemy):
         if enemy.health > 0:
             damage_taken = process_enemy_attack(player, enemy)
             player.health -= damage_taken
+            emit(EventType.DAMAGE, PLAYER, enemy.name, damage_taken)
             print_slow(f"The {enemy.name} attacks you for {damage_taken} damage! (Reduced by armor)")
+        new_turn = True
             
     if player.health <= 0:
         print_slow("You have been defeated...")
+        emit(EventType.COMBAT_END, ENEMY, None, combat_log.COMBAT_DEFEAT)
         return False
     
     print_slow(f"You defeated the {enemy.name}!")
@@ -286,6 +264,8 @@ def combat(player, enemy):
     # Add post-battle healing based on level
     heal_amount = int(player.max_health * (0.15 + (player.level * 0.01)))  # 15% + 1% per level
     mana_restore = int(player.max_mana * (0.1 + (player.level * 0.01)))   # 10% + 1% per level
+    emit(EventType.HEAL, PLAYER, None, min(player.max_health, player.health + heal_amount) - player.health)
+    emit(EventType.MANA, PLAYER, None, min(player.max_mana, player.mana + mana_restore) - player.mana)
     player.health = min(player.max_health, player.health + heal_amount)
     player.mana = min(player.max_mana, player.mana + mana_restore)
     print_slow(f"Victory healing: Recovered {heal_amount} HP and {mana_restore} MP!")
@@ -293,6 +273,7 @@ def combat(player, enemy):
     # In combat victory section
     tech_points_reward = int(10 * (1 + (enemy.level * 0.5)))
     player.tech_points += tech_points_reward
+    emit(EventType.REWARD, PLAYER, enemy.name, enemy.exp_reward, enemy.gold_reward, tech_points_reward)
     print_slow(f"Gained {tech_points_reward} Tech Points!")
     
     # In combat function, modify level up section
@@ -304,20 +285,24 @@ def combat(player, enemy):
         player.health = player.max_health
         player.max_mana += rewards["mana"]
         player.mana = player.max_mana
+        emit(EventType.LEVEL_UP, PLAYER, None, player.level, player.max_health, player.max_mana)
         print_slow(f"Level up! You are now level {player.level}!")
         print_slow(f"Max HP increased by {rewards['health']}!")
         print_slow(f"Max MP increased by {rewards['mana']}!")
     
+    emit(EventType.COMBAT_END, ENEMY, None, combat_log.COMBAT_VICTORY)
     return True
 
 # Add gadget effect processing
 def process_gadget_effect(player, enemy, effect):
     if "damage" in effect:
         enemy.health -= effect["damage"]
+        emit(EventType.DAMAGE, ENEMY, None, effect["damage"])
         print_slow(f"Gadget deals {effect['damage']} damage!")
         
     if "heal" in effect:
         heal = effect["heal"]
+        emit(EventType.HEAL, PLAYER, None, min(player.max_health, player.health + heal) - player.health)
         player.health = min(player.max_health, player.health + heal)
         print_slow(f"Gadget heals for {heal} HP!")
         
@@ -327,16 +312,16 @@ def process_gadget_effect(player, enemy, effect):
             return "fled"
             
     if "defense" in effect:
-        player.status_effects.append({
-            "name": "Shield",
-            "defense": effect["defense"],
-            "duration": effect["duration"]
-        })
+        # Gadget shields stack with each other and with ability buffs
+        player.status_effects.add("Shield", DEFENSE, effect["defense"], effect["duration"], replace=False)
+        emit(EventType.EFFECT_APPLIED, PLAYER, "Shield", effect["defense"], effect["duration"], DEFENSE)
         print_slow(f"Shield activated for {effect['duration']} turns!")
         
     if "revive" in effect:
         if player.health <= 0:
-            player.health = int(player.max_health * effect["health_percent"])
+            revived = int(player.max_health * effect["health_percent"])
+            emit(EventType.HEAL, PLAYER, None, revived - player.health)
+            player.health = revived
             print_slow("Phoenix Protocol activates! You're revived!")
 
 # Update experience and level scaling
@@ -353,115 +338,57 @@ def calculate_level_rewards(level):
         "defense_bonus": level
     }
 
-# Update shop function's item handling
+# Shops are built once from the catalog, their listings cached per player level and owned gadgets
+ITEM_SHOP = ItemShop()
+GADGET_SHOP = GadgetShop(create_gadget)
+
 def shop(player):
-    items = {
-        # Basic items (always available)
-        "Health Potion": {"cost": 15, "effect": "Restore 40 HP", "min_level": 1},
-        "Mana Potion": {"cost": 20, "effect": "Restore 35 MP", "min_level": 1},
-        
-        # Tier 1 Equipment (level 1-2)
-        "Iron Sword": {"cost": 50, "damage": 12, "min_level": 1},
-        "Wooden Staff": {"cost": 45, "damage": 10, "mana_bonus": 15, "min_level": 1},
-        "Leather Armor": {"cost": 60, "defense": 8, "min_level": 1},
-        
-        # Tier 2 Equipment (level 3-4)
-        "Steel Sword": {"cost": 120, "damage": 20, "min_level": 3},
-        "Magic Staff": {"cost": 140, "damage": 18, "mana_bonus": 25, "min_level": 3},
-        "Chain Mail": {"cost": 150, "defense": 15, "min_level": 3},
-        
-        # Tier 3 Equipment (level 5+)
-        "Flame Sword": {"cost": 250, "damage": 35, "min_level": 5},
-        "Frost Staff": {"cost": 260, "damage": 30, "mana_bonus": 40, "min_level": 5},
-        "Plate Armor": {"cost": 280, "defense": 25, "min_level": 5}
-    }
-    
     while True:
         print_slow("\nWelcome to the shop!")
         print_slow(f"Your gold: {player.gold}")
         print_slow("\nAvailable items:")
-        for item, details in items.items():
-            desc = details.get('effect', 'Equipment')
-            if 'damage' in details:
-                desc = f"Damage: {details['damage']}"
-            if 'defense' in details:
-                desc = f"Defense: {details['defense']}"
-            if 'mana_bonus' in details:
-                desc += f", Mana Bonus: {details['mana_bonus']}"
-            print_slow(f"{item}: {details['cost']} gold - {desc}")
+        print_slow(ITEM_SHOP.render(player.level))
         print_slow("\nEnter item name to buy (or 'exit' to leave):")
         
-        choice = input("> ").title()
-        if choice.lower() == "exit":
+        choice = yield "> "
+        if choice.strip().lower() == "exit":
             break
         
-        if choice in items:
-            if player.gold >= items[choice]["cost"]:
-                player.gold -= items[choice]["cost"]
-                if "damage" in items[choice]:
-                    player.weapons[choice] = items[choice]["damage"]
-                elif "defense" in items[choice]:
-                    player.armor[choice] = items[choice]["defense"]
-                else:
-                    player.inventory[choice] = player.inventory.get(choice, 0) + 1
-                print_slow(f"Bought {choice}!")
-            else:
-                print_slow("Not enough gold!")
+        item_id = ITEM_SHOP.find(choice)
+        result = ITEM_SHOP.buy(player, item_id)
+        if result == BOUGHT:
+            print_slow(f"Bought {item_id}!")
+        elif result == NOT_ENOUGH:
+            print_slow("Not enough gold!")
+        elif result == LOCKED:
+            print_slow(f"{item_id} requires level {ITEM_SHOP.listings[item_id].min_level}!")
         else:
             print_slow("Invalid item!")
 
 # Add Gadget Shop function
 def gadget_shop(player):
-    gadgets = {
-        # Common gadgets
-        "Smoke Bomb": Gadget("Smoke Bomb", "common", 
-            {"effect": "flee", "chance": 0.8}, 50),
-        "Health Generator": Gadget("Health Generator", "common",
-            {"heal": 50}, 50),
-        
-        # Rare gadgets
-        "Lightning Rod": Gadget("Lightning Rod", "rare",
-            {"damage": 80, "stun": 1}, 100),
-        "Shield Generator": Gadget("Shield Generator", "rare",
-            {"defense": 30, "duration": 3}, 100),
-            
-        # Epic gadgets
-        "Time Distorter": Gadget("Time Distorter", "epic",
-            {"extra_turns": 1}, 200),
-        "Damage Amplifier": Gadget("Damage Amplifier", "epic",
-            {"damage_boost": 1.5, "duration": 2}, 200),
-            
-        # Legendary gadgets
-        "Ultimate Nullifier": Gadget("Ultimate Nullifier", "legendary",
-            {"damage": 200}, 500),
-        "Phoenix Protocol": Gadget("Phoenix Protocol", "legendary",
-            {"revive": True, "health_percent": 0.5}, 500)
-    }
-    
     while True:
         print_slow("\n=== Gadget Shop ===")
         print_slow(f"Tech Points: {player.tech_points}")
         print_slow("\nAvailable Gadgets:")
-        
-        for name, gadget in gadgets.items():
-            if name not in player.gadgets:
-                print_slow(f"{name} ({gadget.rarity.title()}) - {gadget.cost} TP")
-                print_slow(f"  Effect: {gadget.effect}")
-                print_slow(f"  Charges: {gadget.get_charges()}")
+        listing = GADGET_SHOP.render(player.level, player.gadgets)
+        if listing:
+            print_slow(listing)
         
         print_slow("\nEnter gadget name to buy (or 'exit' to leave):")
-        choice = input("> ").title()
+        choice = yield "> "
         
-        if choice.lower() == "exit":
+        if choice.strip().lower() == "exit":
             break
             
-        if choice in gadgets and choice not in player.gadgets:
-            if player.tech_points >= gadgets[choice].cost:
-                player.tech_points -= gadgets[choice].cost
-                player.gadgets[choice] = gadgets[choice]
-                print_slow(f"Bought {choice}!")
-            else:
-                print_slow("Not enough Tech Points!")
+        item_id = GADGET_SHOP.find(choice)
+        result = GADGET_SHOP.buy(player, item_id)
+        if result == BOUGHT:
+            print_slow(f"Bought {item_id}!")
+        elif result == NOT_ENOUGH:
+            print_slow("Not enough Tech Points!")
+        elif result == LOCKED:
+            print_slow(f"{item_id} requires level {GADGET_SHOP.listings[item_id].min_level}!")
         else:
             print_slow("Invalid gadget or already owned!")
 
@@ -483,6 +410,7 @@ def process_enemy_attack(player, enemy):
     base_damage = enemy.damage
     armor_value = player.armor[player.current_armor]
     defense_reduction = int(armor_value * (0.4 + (player.level * 0.02)))  # Scales with level
+    defense_reduction += player.status_effects.total(DEFENSE)  # Shields and defensive abilities
     final_damage = max(1, base_damage - defense_reduction)
     return final_damage
 
@@ -490,6 +418,7 @@ def process_ability(player, enemy, ability_name):
     """Process the use of a special ability"""
     ability = player.abilities[ability_name]
     player.mana -= ability["mana_cost"]
+    emit(EventType.MANA, PLAYER, ability_name, -ability["mana_cost"])
     total_damage = 0
     
     if "damage" in ability:
@@ -498,12 +427,14 @@ def process_ability(player, enemy, ability_name):
             for hit in range(ability["hits"]):
                 hit_damage = damage + random.randint(-2, 2)  # Add variation per hit
                 enemy.health -= hit_damage
+                emit(EventType.DAMAGE, ENEMY, ability_name, hit_damage)
                 total_damage += hit_damage
                 print_slow(f"Hit {hit + 1}: {hit_damage} damage!")
             print_slow(f"Total damage: {total_damage}")
         else:
             damage = damage + random.randint(-5, 5)  # Add variation for single hit
             enemy.health -= damage
+            emit(EventType.DAMAGE, ENEMY, ability_name, damage)
             print_slow(f"You use {ability_name} and deal {damage} damage!")
     
     if "heal" in ability:
@@ -511,48 +442,50 @@ def process_ability(player, enemy, ability_name):
         original_health = player.health
         player.health = min(player.max_health, player.health + heal)
         actual_heal = player.health - original_health
+        emit(EventType.HEAL, PLAYER, ability_name, actual_heal)
         print_slow(f"You heal for {actual_heal} HP!")
     
     if "defense" in ability:
-        defense_boost = {
-            "name": ability_name,
-            "defense": ability["defense"],
-            "duration": ability["duration"]
-        }
-        # Remove any existing defense boost
-        player.status_effects = [effect for effect in player.status_effects 
-                               if effect["name"] != ability_name]
-        player.status_effects.append(defense_boost)
+        # Replaces any existing boost from the same ability
+        player.status_effects.add(ability_name, DEFENSE, ability["defense"], ability["duration"])
+        emit(EventType.EFFECT_APPLIED, PLAYER, ability_name, ability["defense"], ability["duration"], DEFENSE | REPLACE)
         print_slow(f"Gained {ability['defense']} defense for {ability['duration']} turns!")
     
     if "duration" in ability and "damage" in ability:  # For damage over time effects
         effect_name = ability_name.lower()
-        # Remove existing effect of same type
-        enemy.status_effects = [effect for effect in enemy.status_effects 
-                              if effect["name"] != effect_name]
-        enemy.status_effects.append({
-            "name": effect_name,
-            "damage": int(ability["damage"] / 2),  # DoT deals half damage per tick
-            "duration": ability["duration"]
-        })
+        # Replaces an existing effect of the same type, DoT deals half damage per tick
+        enemy.status_effects.add(effect_name, DAMAGE_OVER_TIME, int(ability["damage"] / 2), ability["duration"])
+        emit(EventType.EFFECT_APPLIED, ENEMY, effect_name, int(ability["damage"] / 2), ability["duration"], DAMAGE_OVER_TIME | REPLACE)
         print_slow(f"Applied {effect_name} effect for {ability['duration']} turns!")
 
+def tick_damage(entity, effect, target):
+    entity.health -= effect.value
+    emit(EventType.DAMAGE, target, effect.name, effect.value)
+    print_slow(f"{entity.name} takes {effect.value} {effect.name.lower()} damage!")
+
+def tick_heal(entity, effect, target):
+    emit(EventType.HEAL, target, effect.name, min(entity.max_health, entity.health + effect.value) - entity.health)
+    entity.health = min(entity.max_health, entity.health + effect.value)
+    print_slow(f"{entity.name} regenerates {effect.value} health!")
+
+# Per-turn handlers by effect type id
+TICK_HANDLERS = {
+    DAMAGE_OVER_TIME: tick_damage,
+    HEAL_OVER_TIME: tick_heal,
+}
+
 def process_status_effects(entity):
     """Process status effects at the start of turn"""
-    for effect in entity.status_effects[:]:  # Create a copy to modify during iteration
-        if effect["name"] == "Poison":
-            damage = effect["damage"]
-            entity.health -= damage
-            print_slow(f"{entity.name} takes {damage} poison damage!")
-        elif effect["name"] == "Regeneration":
-            heal = effect["heal"]
-            entity.health = min(entity.max_health, entity.health + heal)
-            print_slow(f"{entity.name} regenerates {heal} health!")
-            
-        effect["duration"] -= 1
-        if effect["duration"] <= 0:
-            entity.status_effects.remove(effect)
-            print_slow(f"{effect['name']} effect has worn off!")
+    effects = entity.status_effects
+    if not effects:
+        return
+    target = PLAYER if isinstance(entity, Character) else ENEMY
+    emit(EventType.STATUS_TICK, target)
+    for effect in effects.ticking():
+        TICK_HANDLERS[effect.type_id](entity, effect, target)
+    for effect in effects.advance():
+        emit(EventType.EFFECT_EXPIRED, target, effect.name)
+        print_slow(f"{effect.name} effect has worn off!")
 
 # Update show_inventory_menu function
 def show_inventory_menu(player):
@@ -564,7 +497,7 @@ def show_inventory_menu(player):
         print_slow("3. Change Armor")
         print_slow("4. Back")
         
-        choice = input("> ")
+        choice = (yield "> ")
         
         if choice == "1":
             print_slow("\nInventory:")
@@ -589,11 +522,12 @@ def show_inventory_menu(player):
                     print_slow("   *Currently Equipped*")
             
             try:
-                weapon_choice = int(input("\nChoose weapon number (0 to cancel): "))
+                weapon_choice = int((yield "\nChoose weapon number (0 to cancel): "))
                 if 0 < weapon_choice <= len(weapons):
                     new_weapon = weapons[weapon_choice - 1]
                     if new_weapon != player.current_weapon:
                         player.current_weapon = new_weapon
+                        emit(EventType.EQUIP, PLAYER, new_weapon, combat_log.SLOT_WEAPON)
                         print_slow(f"Equipped {new_weapon}!")
                     else:
                         print_slow("That weapon is already equipped!")
@@ -612,11 +546,12 @@ def show_inventory_menu(player):
                     print_slow("   *Currently Equipped*")
             
             try:
-                armor_choice = int(input("\nChoose armor number (0 to cancel): "))
+                armor_choice = int((yield "\nChoose armor number (0 to cancel): "))
                 if 0 < armor_choice <= len(armors):
                     new_armor = armors[armor_choice - 1]
                     if new_armor != player.current_armor:
                         player.current_armor = new_armor
+                        emit(EventType.EQUIP, PLAYER, new_armor, combat_log.SLOT_ARMOR)
                         print_slow(f"Equipped {new_armor}!")
                     else:
                         print_slow("That armor is already equipped!")
@@ -628,7 +563,20 @@ def show_inventory_menu(player):
         elif choice == "4":
             break
 
-def main():
+def run(flow):
+    """Drive a game flow, answering each prompt it yields with output.ask()"""
+    try:
+        prompt = next(flow)
+        while True:
+            prompt = flow.send(output.ask(prompt))
+    except StopIteration as stop:
+        return stop.value
+
+def main(record=None, seed=0):
+    """Whole game as a flow: yields prompts, receives the player's answers"""
+    from spawner import Spawner
+    spawner = Spawner(SPAWN_TABLE)
+    
     print_slow("Welcome to the Text RPG!")
     print_slow("\nChoose your class:")
     print_slow("1. Warrior - High HP and defense, strong melee attacks")
@@ -638,16 +586,24 @@ def main():
     print_slow("5. Assassin - High damage and critical strikes")
     print_slow("6. Druid - Nature magic and versatile abilities")
     
-    name = input("\nEnter your character's name: ")
+    name = (yield "\nEnter your character's name: ")
     while True:
-        class_choice = input("Choose your class (1-6): ")
+        class_choice = (yield "Choose your class (1-6): ")
         if class_choice in ["1", "2", "3", "4", "5", "6"]:
             break
         print_slow("Invalid choice!")
     
     player = Character(name, class_choice)
     print_slow(f"\nWelcome, {player.name} the {player.class_type}!")
-    
+    if record:
+        combat_log.start_recording(record, player, seed)
+    try:
+        yield from play(player, spawner)
+    finally:
+        combat_log.stop_recording()
+
+def play(player, spawner):
+    """Main menu loop for a created character"""
     while True:
         # Status display
         print_slow(f"\n{'='*50}")
@@ -671,33 +627,13 @@ def main():
         print_slow("7. Visit Gadget Shop")
         print_slow("7. Quit")
         
-        choice = input("> ")
+        choice = (yield "> ")
         
         if choice == "1":
-            # Enemy selection based on player level
-            enemies = []
-            spawn_table = [
-                (Enemy("Rat", 15, 2, 10, 5, 1), 40, 1),
-                (Enemy("Goblin", 25, 4, 20, 15, 1), 30, 1),
-                (Enemy("Wolf", 35, 6, 30, 25, 2), 15, 2),
-                (Enemy("Bandit", 45, 8, 40, 35, 3), 10, 3),
-                (Enemy("Troll", 80, 10, 50, 45, 4), 5, 4),
-                # Boss enemies (rare spawn)
-                (Enemy("Dragon", 200, 20, 100, 100, 5), 1, 5)
-            ]
-            
-            roll = random.uniform(0, 100)
-            cumulative = 0
-            for enemy, chance, min_level in spawn_table:
-                if player.level >= min_level:
-                    cumulative += chance
-                    if roll <= cumulative:
-                        enemies = [enemy]
-                        break
-            
-            if enemies:
-                enemy = random.choice(enemies)
-                result = combat(player, enemy)
+            # Enemy selection based on player level, only the chosen enemy is created
+            enemy = spawner.spawn(player.level)
+            if enemy:
+                result = yield from combat(player, enemy)
                 if result == "fled":
                     continue
                 elif not result:
@@ -708,15 +644,18 @@ def main():
                 print_slow("No suitable enemies found!")
                 
         elif choice == "2":
-            shop(player)
+            yield from shop(player)
             
         elif choice == "3":
-            show_inventory_menu(player)
+            yield from show_inventory_menu(player)
             
         elif choice == "4":
             if player.gold >= 20:
                 heal_amount = player.max_health // 2
                 mana_amount = player.max_mana // 2
+                emit(EventType.HEAL, PLAYER, None, min(player.max_health, player.health + heal_amount) - player.health)
+                emit(EventType.MANA, PLAYER, None, min(player.max_mana, player.mana + mana_amount) - player.mana)
+                emit(EventType.REWARD, PLAYER, None, 0, -20)
                 player.health = min(player.max_health, player.health + heal_amount)
                 player.mana = min(player.max_mana, player.mana + mana_amount)
                 player.gold -= 20
@@ -728,19 +667,32 @@ def main():
             show_abilities(player)
         
         elif choice == "6":
-            gadget_shop(player)
+            yield from gadget_shop(player)
             
         elif choice == "7":
-            confirm = input("Are you sure you want to quit? (y/n): ").lower()
+            confirm = (yield "Are you sure you want to quit? (y/n): ").lower()
             if confirm == 'y':
                 print_slow("Thanks for playing!")
                 break
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Text RPG")
+    parser.add_argument("--output", choices=sorted(output.SINKS), default=None,
+                        help="output mode (default: $RPG_OUTPUT or typewriter)")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="write a combat event log for replay")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed (stored in the event log)")
+    args = parser.parse_args()
+    output.configure(args.output)
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    random.seed(seed)
     try:
-        main()
+        run(main(args.record, seed))
     except KeyboardInterrupt:
         print_slow("\nGame terminated by user.")
     except Exception as e:
         print_slow(f"\nAn error occurred: {e}")
-        print_slow("Game terminated.")
\ No newline at end of file
+        print_slow("Game terminated.")
+    finally:
+        output.get_sink().close()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import json
+from collections import namedtuple
+
+import pygame
+
+from world import Controls
+
+# One frame of input: the controls for the next simulation steps, the frame
+# time in milliseconds (None to use the real clock) and whether to quit
+FrameInput = namedtuple("FrameInput", "controls dt quit")
+
+
+class LiveInput:
+    """Keyboard and mouse, read from pygame once per frame"""
+    def poll(self):
+        quit = attack = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
+                attack = True
+        return FrameInput(Controls.from_keys(pygame.key.get_pressed(), attack), None, quit)
+
+
+class ScriptedInput:
+    """Input replayed from a list of frames; quits when the script runs out
+
+    Each frame is a dict with "c", the six Controls flags as 0/1, and
+    optionally "dt", the frame time in milliseconds; frames without one use
+    `frame_dt`. Recorded sessions are JSON lines in this format.
+    """
+    def __init__(self, frames, frame_dt=1000 / 60):
+        self.frames = frames
+        self.frame_dt = frame_dt
+        self.position = 0
+
+    @classmethod
+    def load(cls, path, frame_dt=1000 / 60):
+        with open(path) as f:
+            return cls([json.loads(line) for line in f if line.strip()], frame_dt)
+
+    @classmethod
+    def wander(cls, frames, rng, frame_dt=1000 / 60):
+        """Bot script: a new random heading every half second, clicking every quarter"""
+        script = []
+        for i in range(frames):
+            if i % 30 == 0:
+                heading = [int(rng.random() < 0.5) for _ in range(4)] + [int(rng.random() < 0.3)]
+            script.append({"c": heading + [int(i % 15 == 0)]})
+        return cls(script, frame_dt)
+
+    def poll(self):
+        quit = any(event.type == pygame.QUIT for event in pygame.event.get())
+        if quit or self.position >= len(self.frames):
+            return FrameInput(Controls(*[False] * 6), 0, True)
+        frame = self.frames[self.position]
+        self.position += 1
+        return FrameInput(Controls(*map(bool, frame["c"])), frame.get("dt", self.frame_dt), False)
+
+
+class InputRecorder:
+    """Writes the controls and frame time the engine used, one JSON line per frame"""
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def record(self, controls, dt):
+        record = {"c": [int(flag) for flag in controls], "dt": dt}
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,236 @@
+import os
+import pickle
+import struct
+import zlib
+
+# Journal layout, version 1
+#
+#   <path>.ckpt   header, then one frame holding the full state
+#   <path>.log    header, then one frame per save holding what changed
+#
+#   header        magic (4s), version (B), generation (Q)
+#   frame         payload length (I), CRC32 of the payload (I), pickled payload
+#
+# A checkpoint starts a new generation: the checkpoint is written to a temp
+# file and renamed over the old one, then the log restarts empty with the
+# same generation. A log from an older generation is already folded into the
+# checkpoint and is ignored, so a crash between the two steps loses nothing.
+# A torn or corrupt frame ends the log; load() truncates it away.
+MAGIC = b"RPGJ"
+VERSION = 1
+HEADER = struct.Struct("<4sBQ")
+FRAME = struct.Struct("<II")
+
+# fsync policies
+FSYNC_ALWAYS = "always"          # Every save is on disk before save() returns
+FSYNC_CHECKPOINT = "checkpoint"  # Saves reach the OS at once, the disk at each checkpoint
+FSYNC_NEVER = "never"            # Leave it all to the OS
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_CHECKPOINT, FSYNC_NEVER)
+
+CHECKPOINT_EVERY = 100  # Saves between compacting checkpoints
+
+
+class JournalError(ValueError):
+    """Raised for unreadable or unsupported journal files"""
+    pass
+
+
+def flatten(state, prefix=(), out=None):
+    """Nested dicts as {path tuple: leaf value}; lists and other values are leaves"""
+    if out is None:
+        out = {}
+    for key, value in state.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            flatten(value, path, out)
+        else:
+            out[path] = value
+    return out
+
+
+def unflatten(flat):
+    state = {}
+    for path, value in flat.items():
+        node = state
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return state
+
+
+def _fsync_dir(path):
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _frame(payload):
+    data = pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+    return FRAME.pack(len(data), zlib.crc32(data)) + data
+
+
+def _read_header(data, path):
+    if len(data) < HEADER.size:
+        raise JournalError(f"{path}: truncated header")
+    magic, version, generation = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise JournalError(f"{path}: not a journal file")
+    if version != VERSION:
+        raise JournalError(f"{path}: unsupported version {version}")
+    return generation
+
+
+def _read_frames(data, offset):
+    """Yield (payload, end offset) for each intact frame from offset on"""
+    while offset + FRAME.size <= len(data):
+        length, crc = FRAME.unpack_from(data, offset)
+        start = offset + FRAME.size
+        chunk = data[start:start + length]
+        if len(chunk) < length or zlib.crc32(chunk) != crc:
+            return
+        offset = start + length
+        yield pickle.loads(chunk), offset
+
+
+class Journal:
+    """Save file for a state dict: compact checkpoints plus an append-only log of changes
+
+    save() flattens the state and appends only the paths that changed since
+    the last save, so an autosave after a quiet turn costs a few bytes.
+    Every `checkpoint_every` saves the full state is written as a new
+    checkpoint and the log starts over, which keeps loading to one pickle
+    read plus a bounded replay however long the game has run.
+    """
+    def __init__(self, path, fsync=FSYNC_CHECKPOINT, checkpoint_every=CHECKPOINT_EVERY):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.checkpoint_path = path + ".ckpt"
+        self.log_path = path + ".log"
+        self.fsync = fsync
+        self.checkpoint_every = checkpoint_every
+        self.generation = 0
+        self.saves = 0     # Frames in the current log
+        self.bytes_written = 0
+        self._last = None  # Flattened state as of the last save or load
+        self._log = None
+
+    def exists(self):
+        return os.path.exists(self.checkpoint_path) or os.path.exists(self.log_path)
+
+    def load(self):
+        """The latest saved state, or None if nothing was saved yet"""
+        flat = None
+        self.generation = 0
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "rb") as f:
+                data = f.read()
+            self.generation = _read_header(data, self.checkpoint_path)
+            for payload, _ in _read_frames(data, HEADER.size):
+                flat = payload
+                break
+            else:
+                raise JournalError(f"{self.checkpoint_path}: corrupt checkpoint")
+
+        self.saves = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as f:
+                data = f.read()
+            if len(data) >= HEADER.size and _read_header(data, self.log_path) == self.generation:
+                end = HEADER.size
+                for (changed, removed), end in _read_frames(data, HEADER.size):
+                    if flat is None:
+                        flat = {}
+                    for path in removed:
+                        flat.pop(path, None)
+                    flat.update(changed)
+                    self.saves += 1
+                if end < len(data):
+                    # Torn write from a crash, drop it so new frames follow intact ones
+                    with open(self.log_path, "r+b") as f:
+                        f.truncate(end)
+
+        self._last = flat
+        return unflatten(flat) if flat is not None else None
+
+    def _open_log(self):
+        if self._log is not None:
+            return self._log
+        fresh = True
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as f:
+                header = f.read(HEADER.size)
+            fresh = len(header) < HEADER.size or _read_header(header, self.log_path) != self.generation
+        if fresh:
+            self._restart_log()
+        else:
+            self._log = open(self.log_path, "ab")
+        return self._log
+
+    def _restart_log(self):
+        if self._log is not None:
+            self._log.close()
+        tmp = self.log_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.generation))
+            if self.fsync != FSYNC_NEVER:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.log_path)
+        self._log = open(self.log_path, "ab")
+        self.saves = 0
+
+    def save(self, state):
+        """Append what changed since the last save, returns the bytes written"""
+        flat = flatten(state)
+        if self._last is None:
+            return self.checkpoint(state, flat)
+        last = self._last
+        changed = {path: value for path, value in flat.items()
+                   if path not in last or last[path] != value}
+        removed = [path for path in last if path not in flat]
+        if not changed and not removed:
+            return 0
+        if self.saves + 1 >= self.checkpoint_every:
+            return self.checkpoint(state, flat)
+
+        log = self._open_log()
+        frame = _frame((changed, removed))
+        log.write(frame)
+        log.flush()
+        if self.fsync == FSYNC_ALWAYS:
+            os.fsync(log.fileno())
+        self.saves += 1
+        self.bytes_written += len(frame)
+        self._last = flat
+        return len(frame)
+
+    def checkpoint(self, state, flat=None):
+        """Write the whole state as a new generation and empty the log"""
+        flat = flat if flat is not None else flatten(state)
+        self.generation += 1
+        data = HEADER.pack(MAGIC, VERSION, self.generation) + _frame(flat)
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            if self.fsync != FSYNC_NEVER:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_path)
+        if self.fsync != FSYNC_NEVER:
+            _fsync_dir(self.checkpoint_path)
+        self._restart_log()
+        self.bytes_written += len(data)
+        self._last = flat
+        return len(data)
+
+    def close(self):
+        if self._log is not None:
+            if self.fsync != FSYNC_NEVER:
+                self._log.flush()
+                os.fsync(self._log.fileno())
+            self._log.close()
+            self._log = None
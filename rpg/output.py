@@ -0,0 +1,193 @@
+import contextvars
+import os
+import queue
+import sys
+import threading
+import time
+
+CHAR_DELAY = 0.03  # Seconds per character in typewriter mode
+
+
+class OutputSink:
+    """Base output backend, writes lines and reads player input"""
+    def write_line(self, text):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def ask(self, prompt=""):
+        """Show a prompt once all pending output is visible and read a reply"""
+        self.flush()
+        return input(prompt)
+
+    def close(self):
+        self.flush()
+
+
+class TerminalSink(OutputSink):
+    """Instant output, buffered and flushed only before input is read"""
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def write_line(self, text):
+        self.stream.write(text + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+
+class TypewriterSink(OutputSink):
+    """Renders text one character at a time on a background thread, instantly once closed"""
+    def __init__(self, delay=CHAR_DELAY, stream=None):
+        self.delay = delay
+        self.stream = stream or sys.stdout
+        self.closed = False
+        self.pending = queue.Queue()
+        self.skip = threading.Event()
+        self.thread = threading.Thread(target=self._render, daemon=True)
+        self.thread.start()
+
+    def write_line(self, text):
+        if self.closed:
+            # The render thread is gone, write directly so nothing is lost
+            self.stream.write(text + "\n")
+            self.stream.flush()
+        else:
+            self.pending.put(text + "\n")
+
+    def _render(self):
+        while True:
+            text = self.pending.get()
+            if text is None:
+                self.pending.task_done()
+                return
+            for char in text:
+                self.stream.write(char)
+                self.stream.flush()
+                if not self.skip.is_set():
+                    time.sleep(self.delay)
+            self.pending.task_done()
+
+    def flush(self):
+        self.pending.join()
+
+    def close(self):
+        """Finish rendering without delay and stop the thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.skip.set()
+        self.pending.put(None)
+        self.thread.join()
+        # Lines queued by a write that raced with close
+        while not self.pending.empty():
+            text = self.pending.get()
+            if text is not None:
+                self.stream.write(text)
+            self.pending.task_done()
+        self.stream.flush()
+
+
+class NullSink(OutputSink):
+    """Discards all output, for batch runs"""
+    def write_line(self, text):
+        pass
+
+
+class CaptureSink(OutputSink):
+    """Records output lines and answers prompts from a script, for tests"""
+    def __init__(self, inputs=None):
+        self.lines = []
+        self.prompts = []
+        self.inputs = iter(inputs or [])
+
+    def write_line(self, text):
+        self.lines.append(text)
+
+    def ask(self, prompt=""):
+        self.prompts.append(prompt)
+        try:
+            return next(self.inputs)
+        except StopIteration:
+            raise EOFError("No scripted input left")
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+
+class BufferSink(OutputSink):
+    """Collects lines until taken, for sessions that send output in batches"""
+    def __init__(self):
+        self.lines = []
+
+    def write_line(self, text):
+        self.lines.append(text)
+
+    def take(self):
+        """Buffered output as one string, emptying the buffer"""
+        text = "".join(line + "\n" for line in self.lines)
+        self.lines = []
+        return text
+
+    def ask(self, prompt=""):
+        raise RuntimeError("BufferSink does not read input, the game flow yields its prompts")
+
+
+SINKS = {
+    "instant": TerminalSink,
+    "typewriter": TypewriterSink,
+    "null": NullSink,
+    "capture": CaptureSink
+}
+
+_sink = None
+# Per-context override of the process-wide sink, so sessions running in their
+# own contextvars.Context each write to their own sink
+_context_sink = contextvars.ContextVar("output_sink", default=None)
+
+
+def create_sink(mode):
+    """Create a sink by mode name"""
+    if mode not in SINKS:
+        raise ValueError(f"Unknown output mode: {mode} (choose from {', '.join(SINKS)})")
+    return SINKS[mode]()
+
+
+def configure(mode=None):
+    """Select the output backend, defaulting to the RPG_OUTPUT environment variable"""
+    mode = mode or os.environ.get("RPG_OUTPUT", "typewriter")
+    return set_sink(create_sink(mode))
+
+
+def set_sink(sink):
+    """Install a sink and return it, closing the previous one"""
+    global _sink
+    if _sink is not None and _sink is not sink:
+        _sink.close()
+    _sink = sink
+    return sink
+
+
+def set_context_sink(sink):
+    """Send output from the current context only to `sink`"""
+    _context_sink.set(sink)
+    return sink
+
+
+def get_sink():
+    sink = _context_sink.get()
+    if sink is not None:
+        return sink
+    if _sink is None:
+        configure()
+    return _sink
+
+
+def write(text):
+    get_sink().write_line(text)
+
+
+def ask(prompt=""):
+    return get_sink().ask(prompt)
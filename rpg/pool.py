@@ -0,0 +1,66 @@
+import pygame
+
+_surfaces = {}  # (size, color) -> surface shared by every sprite of that look
+
+
+def shared_surface(size, color):
+    """Filled surface shared by all sprites with this size and color, never draw on it"""
+    key = (tuple(size), color)
+    surface = _surfaces.get(key)
+    if surface is None:
+        surface = _surfaces[key] = pygame.Surface(size)
+        surface.fill(color)
+    return surface
+
+
+class SpritePool:
+    """Free list of dead sprites of one type, recycled instead of re-created
+
+    acquire() passes its arguments to the sprite's reset() when a pooled
+    sprite is available and to the constructor otherwise; release() takes
+    the sprite out of every group and puts it back on the free list.
+    """
+    def __init__(self, factory, name=None):
+        self.factory = factory
+        self.name = name or factory.__name__
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.live = 0
+        self.peak = 0
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.hits += 1
+        else:
+            sprite = self.factory(*args)
+            self.misses += 1
+        sprite.pooled = False
+        self.live += 1
+        if self.live > self.peak:
+            self.peak = self.live
+        return sprite
+
+    def release(self, sprite):
+        if getattr(sprite, "pooled", True):
+            return
+        sprite.kill()
+        sprite.pooled = True
+        self.live -= 1
+        self.free.append(sprite)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {"name": self.name, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hit_rate, "live": self.live, "peak": self.peak,
+                "free": len(self.free)}
+
+    def report(self):
+        return (f"{self.name}: {self.hits + self.misses} acquired, {self.hit_rate:.0%} from the pool, "
+                f"{self.live} live (peak {self.peak}), {len(self.free)} free")
@@ -0,0 +1,143 @@
+import heapq
+from enum import Enum, auto
+
+# Progress counters a quest can target
+SCORE = "score"
+KILLS = "kills"
+PICKUPS = "pickups"
+
+
+class QuestStatus(Enum):
+    INACTIVE = auto()
+    ACTIVE = auto()
+    COMPLETED = auto()
+
+
+class Quest:
+    def __init__(self, description, target_score, stat=SCORE):
+        self.description = description
+        self.target_score = target_score
+        self.stat = stat
+        self.status = QuestStatus.INACTIVE
+
+    def check_completion(self, score):
+        if self.status == QuestStatus.ACTIVE and score >= self.target_score:
+            self.status = QuestStatus.COMPLETED
+            return True
+        return False
+
+
+def make_quests():
+    """The action mode's quest line, fresh for every game"""
+    return [
+        Quest("Reach 50 points", 50),
+        Quest("Reach 100 points", 100),
+        Quest("Reach 200 points", 200)
+    ]
+
+
+class QuestTracker:
+    """Quest progress driven by score, kill and pickup events
+
+    Active quests wait in one min-heap per counter keyed by their threshold,
+    so an event only looks at the heap top and pops the quests it crossed;
+    the cost of an event does not grow with the number of active quests.
+    """
+    def __init__(self):
+        self.counters = {SCORE: 0, KILLS: 0, PICKUPS: 0}
+        self._waiting = {stat: [] for stat in self.counters}
+        self._seq = 0   # Tie-break so equal thresholds never compare quests
+
+    def activate(self, quest):
+        """Start tracking a quest, returns True if it is already complete"""
+        quest.status = QuestStatus.ACTIVE
+        if quest.check_completion(self.counters[quest.stat]):
+            return True
+        self._seq += 1
+        heapq.heappush(self._waiting[quest.stat], (quest.target_score, self._seq, quest))
+        return False
+
+    def record(self, stat, amount=1):
+        """Add to a counter and return the quests that completed, in threshold order"""
+        value = self.counters[stat] = self.counters[stat] + amount
+        heap = self._waiting[stat]
+        completed = []
+        while heap and heap[0][0] <= value:
+            quest = heapq.heappop(heap)[2]
+            if quest.check_completion(value):
+                completed.append(quest)
+        return completed
+
+    def active(self):
+        return [entry[2] for heap in self._waiting.values() for entry in heap
+                if entry[2].status == QuestStatus.ACTIVE]
+
+
+class QuestLine:
+    """Quests unlocked one after another, as in the action mode's HUD"""
+    def __init__(self, quests, tracker=None):
+        self.quests = quests
+        self.tracker = tracker or QuestTracker()
+        self.index = 0
+        self._start_current()
+
+    @property
+    def current(self):
+        return self.quests[self.index] if self.index < len(self.quests) else None
+
+    def _start_current(self):
+        # A quest can be met the moment it unlocks, skip straight past it
+        while self.current is not None and self.tracker.activate(self.current):
+            self.index += 1
+
+    def record(self, stat, amount=1):
+        """Feed an event, returns True when the current quest changed"""
+        current = self.current
+        self.tracker.record(stat, amount)
+        if current is None or current.status != QuestStatus.COMPLETED:
+            return False
+        self.index += 1
+        self._start_current()
+        return True
+
+
+if __name__ == "__main__":
+    # Event cost with hundreds of active quests: the threshold heaps against
+    # polling every quest's check_completion on each event
+    import argparse
+    import random
+    import time
+
+    parser = argparse.ArgumentParser(description="Quest tracker benchmark")
+    parser.add_argument("--quests", type=int, default=500)
+    parser.add_argument("--events", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    specs = [(rng.choice([SCORE, KILLS, PICKUPS]), rng.randint(1, args.events)) for _ in range(args.quests)]
+    events = [rng.choice([(SCORE, 10), (SCORE, 20), (KILLS, 1), (PICKUPS, 1)]) for _ in range(args.events)]
+
+    polled = [Quest(f"q{i}", target, stat) for i, (stat, target) in enumerate(specs)]
+    for quest in polled:
+        quest.status = QuestStatus.ACTIVE
+    counters = {SCORE: 0, KILLS: 0, PICKUPS: 0}
+    start = time.perf_counter()
+    polled_done = 0
+    for stat, amount in events:
+        counters[stat] += amount
+        for quest in polled:
+            if quest.stat == stat and quest.check_completion(counters[stat]):
+                polled_done += 1
+    polling = time.perf_counter() - start
+
+    tracker = QuestTracker()
+    for i, (stat, target) in enumerate(specs):
+        tracker.activate(Quest(f"q{i}", target, stat))
+    start = time.perf_counter()
+    tracked_done = sum(len(tracker.record(stat, amount)) for stat, amount in events)
+    tracked = time.perf_counter() - start
+
+    assert polled_done == tracked_done
+    print(f"{args.quests} quests, {args.events} events, {tracked_done} completed")
+    print(f"  polling every quest  {polling / args.events * 1e6:8.2f} us per event")
+    print(f"  threshold heaps      {tracked / args.events * 1e6:8.2f} us per event")
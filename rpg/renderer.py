@@ -0,0 +1,233 @@
+from collections import OrderedDict
+
+import pygame
+
+WORLD_LAYER = 0
+HUD_LAYER = 1
+# Above this many dirty sprites merging their rects costs more than redrawing
+# the whole screen (LayeredDirty's rect merge is quadratic)
+DIRTY_LIMIT = 64
+
+
+_fonts = {}  # (name, size) -> Font, built once per process
+
+
+def get_font(size, name=None):
+    """Shared Font for a file name (None for the default font) and size"""
+    font = _fonts.get((name, size))
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[(name, size)] = pygame.font.Font(name, size)
+    return font
+
+
+def clear_fonts():
+    """Drop the cached fonts, they die with pygame.font.quit()"""
+    _fonts.clear()
+
+
+class TextCache:
+    """Rendered text surfaces keyed by font, text and color"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (id(font), text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, True, color)
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+class HudText(pygame.sprite.DirtySprite):
+    """HUD label that only re-renders and redraws when its text changes"""
+    def __init__(self, font, pos, color, cache):
+        super().__init__()
+        self.font = font
+        self.pos = pos
+        self.color = color
+        self.cache = cache
+        self.text = None
+        self.image = pygame.Surface((0, 0))
+        self.rect = self.image.get_rect(topleft=pos)
+        self.visible = 0
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        if text is None:
+            self.visible = 0
+        else:
+            self.image = self.cache.render(self.font, text, self.color)
+            self.rect = self.image.get_rect(topleft=self.pos)
+            self.visible = 1
+        self.dirty = 1
+
+
+class HealthBar(pygame.sprite.DirtySprite):
+    """Health bar redrawn only when the value changes"""
+    def __init__(self, pos, size, back_color, fill_color):
+        super().__init__()
+        self.image = pygame.Surface(size)
+        self.rect = self.image.get_rect(topleft=pos)
+        self.back_color = back_color
+        self.fill_color = fill_color
+        self.value = None
+
+    def set_value(self, value):
+        if value == self.value:
+            return
+        self.value = value
+        self.image.fill(self.back_color)
+        width = max(0, min(self.rect.width, int(value)))
+        if width:
+            self.image.fill(self.fill_color, (0, 0, width, self.rect.height))
+        self.dirty = 1
+
+
+class Renderer:
+    """Dirty-rect renderer over a LayeredDirty group of world and HUD sprites
+
+    Sprites are redrawn only when marked dirty (moved or changed), and only
+    the screen regions they cover are pushed to the display. While a camera
+    offset or a full-screen effect is active, or when too many sprites
+    changed at once, it falls back to a full redraw and repaints everything
+    once it switches back.
+    """
+    def __init__(self, screen, background_color, dirty_limit=DIRTY_LIMIT, group=None):
+        self.screen = screen
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(background_color)
+        self.group = group if group is not None else pygame.sprite.LayeredDirty()
+        self.group.set_clip(screen.get_rect())
+        self.text_cache = TextCache()
+        self.dirty_limit = dirty_limit
+        self.full_frames = 0
+        self.dirty_frames = 0
+        self.pixels_pushed = 0   # Display area updated, the cost dirty rects save
+        self._needs_repaint = True
+
+    def add(self, *sprites, layer=WORLD_LAYER):
+        self.group.add(*sprites, layer=layer)
+
+    def render(self, offset=(0, 0), effects=None):
+        """Draw the frame and update the display, returns the rects pushed"""
+        screen = self.screen
+        full = offset != (0, 0) or (effects is not None and bool(effects.effects))
+        if not full:
+            dirty = 0
+            for sprite in self.group:
+                if sprite.dirty:
+                    dirty += 1
+                    if dirty > self.dirty_limit:
+                        full = True
+                        break
+        if full:
+            screen.blit(self.background, (0, 0))
+            for sprite in self.group.get_sprites_from_layer(WORLD_LAYER):
+                if sprite.visible:
+                    screen.blit(sprite.image, sprite.rect.move(offset))
+                if sprite.dirty == 1:
+                    sprite.dirty = 0
+            if effects is not None:
+                effects.draw(screen)
+            for sprite in self.group.get_sprites_from_layer(HUD_LAYER):
+                if sprite.visible:
+                    screen.blit(sprite.image, sprite.rect)
+                if sprite.dirty == 1:
+                    sprite.dirty = 0
+            pygame.display.flip()
+            self._needs_repaint = True
+            self.full_frames += 1
+            self.pixels_pushed += screen.get_width() * screen.get_height()
+            return [screen.get_rect()]
+        if self._needs_repaint:
+            self.group.repaint_rect(screen.get_rect())
+            self._needs_repaint = False
+        rects = self.group.draw(screen, self.background)
+        pygame.display.update(rects)
+        self.dirty_frames += 1
+        self.pixels_pushed += sum(rect.width * rect.height for rect in rects)
+        return rects
+
+
+if __name__ == "__main__":
+    # Headless FPS benchmark: full redraw every frame against the dirty-rect renderer
+    import argparse
+    import os
+    import random
+    import time
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    parser = argparse.ArgumentParser(description="Renderer benchmark")
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--moving", type=float, default=0.1, help="fraction of entities moving each frame")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((1000, 800))
+    font = pygame.font.Font(None, 36)
+
+    def make_sprites(count):
+        random.seed(count)
+        image = pygame.Surface((20, 20))
+        image.fill((255, 0, 0))
+        sprites = []
+        for _ in range(count):
+            sprite = pygame.sprite.DirtySprite()
+            sprite.image = image
+            sprite.rect = image.get_rect(topleft=(random.randint(0, 980), random.randint(0, 780)))
+            sprites.append(sprite)
+        return sprites
+
+    def step(sprites, frame):
+        for sprite in sprites[:int(len(sprites) * args.moving)]:
+            sprite.rect.x = (sprite.rect.x + 1) % 980
+            sprite.dirty = 1
+
+    def full_redraw(count):
+        sprites = make_sprites(count)
+        group = pygame.sprite.Group(sprites)
+        for frame in range(args.frames):
+            step(sprites, frame)
+            screen.fill((255, 255, 255))
+            group.draw(screen)
+            screen.blit(font.render(f"Score: {frame // 50}", True, (0, 0, 0)), (10, 40))
+            pygame.display.flip()
+
+    def dirty_rects(count):
+        global renderer
+        sprites = make_sprites(count)
+        renderer = Renderer(screen, (255, 255, 255))
+        renderer.add(*sprites)
+        score = HudText(font, (10, 40), (0, 0, 0), renderer.text_cache)
+        renderer.add(score, layer=HUD_LAYER)
+        for frame in range(args.frames):
+            step(sprites, frame)
+            score.set_text(f"Score: {frame // 50}")
+            renderer.render()
+
+    print(f"{int(args.moving * 100)}% of entities moving per frame "
+          f"(under the dummy driver display updates are free, see screen updated)")
+    for count in args.counts:
+        results = []
+        for draw in (full_redraw, dirty_rects):
+            start = time.perf_counter()
+            draw(count)
+            results.append(args.frames / (time.perf_counter() - start))
+        updated = renderer.pixels_pushed / (args.frames * screen.get_width() * screen.get_height())
+        print(f"{count:>6} entities: full redraw {results[0]:7.1f} FPS, dirty rects {results[1]:7.1f} FPS, "
+              f"{updated * 100:5.1f}% of the screen updated per frame")
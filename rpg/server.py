@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import contextvars
+import logging
+
+import output
+from game_logic import main
+
+IDLE_TIMEOUT = 15 * 60   # Seconds without input before a session is dropped
+MAX_SESSIONS = 10000
+MAX_LINE = 1024          # Longest accepted input line in bytes
+BACKLOG = 1024           # Pending connections, so reconnect storms are not dropped
+
+log = logging.getLogger("rpg.server")
+
+
+class GameSession:
+    """One player's game: a paused game flow, its buffered output and context
+
+    The flow only runs inside this session's contextvars.Context, so output
+    and combat recording stay per session while every session shares one
+    thread. Between prompts an idle session is just its suspended generator
+    frames and game state.
+    """
+    __slots__ = ("flow", "sink", "context", "prompt", "done")
+
+    def __init__(self, flow_factory=main):
+        self.sink = output.BufferSink()
+        self.context = contextvars.Context()
+        self.context.run(output.set_context_sink, self.sink)
+        self.flow = self.context.run(flow_factory)
+        self.prompt = None
+        self.done = False
+
+    def step(self, answer=None):
+        """Advance to the next prompt and return the text to send the player"""
+        try:
+            if self.prompt is None:
+                self.prompt = self.context.run(next, self.flow)
+            else:
+                self.prompt = self.context.run(self.flow.send, answer)
+        except StopIteration:
+            self.done = True
+            self.prompt = ""
+        except Exception as e:
+            log.exception("Game flow failed")
+            self.done = True
+            self.prompt = ""
+            self.sink.write_line(f"\nAn error occurred: {e}")
+            self.sink.write_line("Game terminated.")
+        return self.sink.take() + self.prompt
+
+    def close(self):
+        self.context.run(self.flow.close)
+
+
+class GameServer:
+    """Line-based TCP server running many GameSessions on one event loop"""
+    def __init__(self, host="127.0.0.1", port=4000, idle_timeout=IDLE_TIMEOUT,
+                 max_sessions=MAX_SESSIONS, flow_factory=main):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.flow_factory = flow_factory
+        self.sessions = set()
+
+    async def handle(self, reader, writer):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"Server full, try again later.\n")
+            await self._close(writer)
+            return
+        session = GameSession(self.flow_factory)
+        self.sessions.add(session)
+        try:
+            text = session.step()
+            while True:
+                writer.write(text.encode("utf-8"))
+                await writer.drain()
+                if session.done:
+                    break
+                line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                if not line:
+                    break
+                text = session.step(line.decode("utf-8", "replace").strip())
+        except asyncio.TimeoutError:
+            writer.write(b"\nSession timed out.\n")
+        except (ConnectionError, ValueError):
+            pass  # Client went away or sent an over-long line
+        finally:
+            self.sessions.discard(session)
+            session.close()
+            await self._close(writer)
+
+    @staticmethod
+    async def _close(writer):
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def start(self):
+        return await asyncio.start_server(self.handle, self.host, self.port,
+                                          limit=MAX_LINE, backlog=BACKLOG)
+
+    async def serve_forever(self):
+        server = await self.start()
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        log.info("Serving on %s", addresses)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-session TCP server for the text RPG")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="seconds")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(GameServer(args.host, args.port, args.idle_timeout, args.max_sessions).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,188 @@
+import pickle
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 7 * 24 * 3600  # Seconds a session survives without being written
+
+
+class MemoryStore:
+    """In-process session store with least-recently-used eviction"""
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, sid):
+        with self.lock:
+            data = self.entries.get(sid)
+            if data is not None:
+                self.entries.move_to_end(sid)
+            return data
+
+    def set(self, sid, data):
+        with self.lock:
+            self.entries[sid] = data
+            self.entries.move_to_end(sid)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, sid):
+        with self.lock:
+            self.entries.pop(sid, None)
+
+
+class SQLiteStore:
+    """Session store backed by a SQLite file, shared between worker processes"""
+    def __init__(self, path="sessions.db", ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, data BLOB, expires REAL)"
+        )
+
+    def get(self, sid):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM sessions WHERE sid = ? AND expires > ?", (sid, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, sid, data):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)",
+                (sid, data, time.time() + self.ttl)
+            )
+
+    def delete(self, sid):
+        with self.lock:
+            self.conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def purge_expired(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM sessions WHERE expires <= ?", (time.time(),))
+
+
+class LocalRedis:
+    """Minimal in-process stand-in for a Redis client (get/set/delete with expiry)"""
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires <= time.time():
+                del self.data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self.lock:
+            self.data[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self.lock:
+            return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class RedisStore:
+    """Session store on any client with the redis-py get/set/delete interface"""
+    def __init__(self, client=None, prefix="rpg:session:", ttl=DEFAULT_TTL):
+        self.client = client if client is not None else LocalRedis()
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, sid):
+        return self.client.get(self.prefix + sid)
+
+    def set(self, sid, data):
+        self.client.set(self.prefix + sid, data, ex=self.ttl)
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+
+def create_store(kind="memory", **options):
+    """Create a session store by name: memory, sqlite or redis"""
+    if kind == "memory":
+        return MemoryStore(**options)
+    if kind == "sqlite":
+        return SQLiteStore(**options)
+    if kind == "redis":
+        url = options.pop("url", None)
+        if url:
+            import redis
+            options["client"] = redis.Redis.from_url(url)
+        return RedisStore(**options)
+    raise ValueError(f"Unknown session store: {kind}")
+
+
+def new_session_id():
+    return secrets.token_urlsafe(24)
+
+
+class PickleCodec:
+    """Fallback serializer for arbitrary player objects"""
+    @staticmethod
+    def dumps(player):
+        return pickle.dumps(player, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(data):
+        return pickle.loads(data)
+
+
+class PlayerSession:
+    """Lazily loaded player state for one request
+
+    The player is only fetched and deserialized when first accessed, and
+    save() only serializes and writes it back when the request changed it:
+    assigning `player` marks the session changed, and handlers that modify
+    the loaded player in place call mark_changed(). Read-only requests never
+    pay for an encode.
+    """
+    _unloaded = object()
+
+    def __init__(self, store, sid, codec=PickleCodec):
+        self.store = store
+        self.sid = sid
+        self.codec = codec
+        self.changed = False
+        self._player = self._unloaded
+
+    @property
+    def player(self):
+        if self._player is self._unloaded:
+            data = self.store.get(self.sid) if self.sid else None
+            self._player = self.codec.loads(data) if data is not None else None
+        return self._player
+
+    @player.setter
+    def player(self, player):
+        self._player = player
+        self.changed = True
+
+    def mark_changed(self):
+        """Record that the loaded player was modified in place"""
+        self.changed = True
+
+    def save(self):
+        """Write the player back if this request changed it, None deletes the session"""
+        if not self.changed or not self.sid or self._player is self._unloaded:
+            return False
+        self.changed = False
+        if self._player is None:
+            self.store.delete(self.sid)
+        else:
+            self.store.set(self.sid, self.codec.dumps(self._player))
+        return True
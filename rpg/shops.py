@@ -0,0 +1,163 @@
+from collections import namedtuple
+
+from combat_log import emit, EventType, PLAYER, BOUGHT_ARMOR, BOUGHT_ITEM, BOUGHT_WEAPON
+from content import catalog
+
+# Purchase outcomes
+BOUGHT = "bought"
+NOT_ENOUGH = "not_enough"
+LOCKED = "locked"      # Player level below the item's min_level
+OWNED = "owned"
+UNKNOWN = "unknown"
+
+# One entry on a shop's shelf, with its listing text rendered up front
+Listing = namedtuple("Listing", ["id", "cost", "min_level", "text"])
+
+
+def describe_item(item):
+    """Listing description of a ShopItem, as the shop has always shown it"""
+    desc = item.effect or "Equipment"
+    if item.damage is not None:
+        desc = f"Damage: {item.damage}"
+    if item.defense is not None:
+        desc = f"Defense: {item.defense}"
+    if item.mana_bonus is not None:
+        desc += f", Mana Bonus: {item.mana_bonus}"
+    return desc
+
+
+class Shop:
+    """Shelf of catalog entries with listings rendered once per view
+
+    Every entry's text is formatted when the shop is built, and the
+    listing for each (player level, owned items) view is joined once and
+    cached, so opening the menu again is a dict lookup however many items
+    the catalog has. Levels at or above the highest min_level share a
+    view, which bounds the cache by the shelf's level tiers times the
+    owned combinations actually seen.
+    """
+    def __init__(self, listings):
+        self.listings = {listing.id: listing for listing in listings}
+        self._ids = {item_id.lower(): item_id for item_id in self.listings}
+        self._stocked = frozenset(self.listings)
+        self._top_level = max((listing.min_level for listing in listings), default=1)
+        self._views = {}
+
+    def find(self, name):
+        """Item ID for a name typed in any case, None if nothing matches"""
+        return self._ids.get(name.strip().lower())
+
+    def view(self, level, owned=()):
+        """(listings, rendered text) for what a player can buy, in shelf order"""
+        key = (min(level, self._top_level), frozenset(owned) & self._stocked)
+        view = self._views.get(key)
+        if view is None:
+            shown = tuple(listing for listing in self.listings.values()
+                          if listing.min_level <= key[0] and listing.id not in key[1])
+            view = self._views[key] = (shown, "\n".join(listing.text for listing in shown))
+        return view
+
+    def available(self, level, owned=()):
+        return self.view(level, owned)[0]
+
+    def render(self, level, owned=()):
+        return self.view(level, owned)[1]
+
+    def check(self, item_id, level, funds, owned=()):
+        """BOUGHT if the purchase can go ahead, otherwise the reason it cannot"""
+        listing = self.listings.get(item_id)
+        if listing is None:
+            return UNKNOWN
+        if item_id in owned:
+            return OWNED
+        if level < listing.min_level:
+            return LOCKED
+        if funds < listing.cost:
+            return NOT_ENOUGH
+        return BOUGHT
+
+
+class ItemShop(Shop):
+    """Potions and equipment for gold, from the catalog's shop items"""
+    def __init__(self, items=None):
+        self.items = catalog().shop_items if items is None else items
+        super().__init__([Listing(item.id, item.cost, item.min_level,
+                                  f"{item.id}: {item.cost} gold - {describe_item(item)}")
+                          for item in self.items.values()])
+
+    def buy(self, player, item_id):
+        result = self.check(item_id, player.level, player.gold)
+        if result == BOUGHT:
+            item = self.items[item_id]
+            player.gold -= item.cost
+            if item.damage is not None:
+                player.weapons[item_id] = item.damage
+                emit(EventType.PURCHASE, PLAYER, item_id, BOUGHT_WEAPON, item.damage, item.cost)
+            elif item.defense is not None:
+                player.armor[item_id] = item.defense
+                emit(EventType.PURCHASE, PLAYER, item_id, BOUGHT_ARMOR, item.defense, item.cost)
+            else:
+                player.inventory[item_id] = player.inventory.get(item_id, 0) + 1
+                emit(EventType.PURCHASE, PLAYER, item_id, BOUGHT_ITEM, 0, item.cost)
+        return result
+
+
+class GadgetShop(Shop):
+    """Gadgets for tech points, one of each; create(name) builds a Gadget from the catalog"""
+    def __init__(self, create, gadgets=None):
+        self.create = create
+        gadgets = catalog().gadgets if gadgets is None else gadgets
+        listings = []
+        for entry in gadgets.values():
+            sample = create(entry.id)
+            text = (f"{entry.id} ({sample.rarity.title()}) - {sample.cost} TP\n"
+                    f"  Effect: {sample.effect}\n"
+                    f"  Charges: {sample.get_charges()}")
+            listings.append(Listing(entry.id, sample.cost, entry.min_level, text))
+        super().__init__(listings)
+
+    def buy(self, player, item_id):
+        result = self.check(item_id, player.level, player.tech_points, player.gadgets)
+        if result == BOUGHT:
+            gadget = self.create(item_id)
+            player.tech_points -= gadget.cost
+            player.gadgets[item_id] = gadget
+            emit(EventType.GADGET_BOUGHT, PLAYER, item_id, gadget.cost)
+        return result
+
+
+if __name__ == "__main__":
+    # Menu cost as the shelf grows: formatting every item on each visit, as
+    # the shop used to, against the cached per-view listing
+    import argparse
+    import time
+
+    from content import ShopItem
+
+    parser = argparse.ArgumentParser(description="Shop listing benchmark")
+    parser.add_argument("--items", type=int, nargs="+", default=[11, 100, 1000])
+    parser.add_argument("--visits", type=int, default=2000)
+    args = parser.parse_args()
+
+    for count in args.items:
+        items = {}
+        for i in range(count):
+            item = ShopItem(f"Item {i}", 10 + i, 1 + i % 5, damage=i if i % 3 == 0 else None,
+                            defense=i if i % 3 == 1 else None, effect=f"Restore {i} HP" if i % 3 == 2 else None)
+            items[item.id] = item
+
+        start = time.perf_counter()
+        for visit in range(args.visits):
+            level = 1 + visit % 7
+            text = "\n".join(f"{item.id}: {item.cost} gold - {describe_item(item)}"
+                             for item in items.values() if item.min_level <= level)
+        rebuilt = time.perf_counter() - start
+
+        shop = ItemShop(items)
+        start = time.perf_counter()
+        for visit in range(args.visits):
+            text = shop.render(1 + visit % 7)
+        cached = time.perf_counter() - start
+
+        print(f"{count:5} items: rebuilt {rebuilt / args.visits * 1e6:9.2f} us per visit, "
+              f"cached {cached / args.visits * 1e6:6.2f} us per visit")
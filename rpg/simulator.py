@@ -0,0 +1,277 @@
+import argparse
+import time
+
+import numpy as np
+
+from game_logic import Character, Enemy, SPAWN_TABLE
+
+CLASS_NAMES = {
+    "1": "Warrior",
+    "2": "Mage",
+    "3": "Paladin",
+    "4": "Necromancer",
+    "5": "Assassin",
+    "6": "Druid"
+}
+
+MAX_TURNS = 200            # Safety cap, a fight this long counts as a draw
+LOW_HEALTH = 0.35          # Below this fraction of max HP the player tries to heal
+HEALTH_POTION_HEAL = 30    # Matches the potion handling in combat()
+
+
+class AbilityTable:
+    """Flat NumPy view of a character's ability dict"""
+    def __init__(self, abilities):
+        self.names = list(abilities)
+        k = len(self.names)
+        self.damage = np.zeros(k, dtype=np.int64)
+        self.hits = np.ones(k, dtype=np.int64)
+        self.heal = np.zeros(k, dtype=np.int64)
+        self.mana_cost = np.zeros(k, dtype=np.int64)
+        self.has_damage = np.zeros(k, dtype=bool)
+        self.multi_hit = np.zeros(k, dtype=bool)
+        self.dot_damage = np.zeros(k, dtype=np.int64)
+        self.dot_duration = np.zeros(k, dtype=np.int64)
+
+        for i, name in enumerate(self.names):
+            ability = abilities[name]
+            self.mana_cost[i] = ability["mana_cost"]
+            if "damage" in ability:
+                self.has_damage[i] = True
+                self.damage[i] = ability["damage"]
+            if "hits" in ability:
+                self.multi_hit[i] = True
+                self.hits[i] = ability["hits"]
+            self.heal[i] = ability.get("heal", 0)
+            if "damage" in ability and "duration" in ability:
+                self.dot_damage[i] = int(ability["damage"] / 2)
+                self.dot_duration[i] = ability["duration"]
+
+        # Expected damage per use, used by the headless player policy
+        self.expected_damage = np.where(self.has_damage, self.damage * self.hits, 0)
+        self.max_hits = int(self.hits[self.multi_hit].max()) if self.multi_hit.any() else 0
+        self.has_dot = bool(self.dot_duration.any())
+
+
+def build_player(class_type, level=1):
+    """Create a Character at the given level with abilities from update_abilities"""
+    player = Character("Sim", class_type)
+    player.level = level
+    player.update_abilities()
+    return player
+
+
+def spawn_enemies(level=None):
+    """Create one Enemy per spawn table entry, optionally forced to a level"""
+    enemies = []
+    for stats, chance, min_level in SPAWN_TABLE:
+        name, health, damage, exp_reward, gold_reward, enemy_level = stats
+        enemies.append(Enemy(name, health, damage, exp_reward, gold_reward,
+                             enemy_level if level is None else level))
+    return enemies
+
+
+def simulate(player, enemy, fights, rng=None):
+    """Run `fights` independent battles of player vs enemy in parallel
+
+    Replays the rules of process_attack, process_ability, process_enemy_attack
+    and the damage over time ticks of process_status_effects, with every
+    battle stored as one slot of a set of NumPy arrays. The player follows a
+    fixed policy: heal when low on health, otherwise use the affordable move
+    with the highest expected damage.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    table = AbilityTable(player.abilities)
+    n = fights
+
+    max_health = player.max_health
+    player_hp = np.full(n, player.health, dtype=np.int64)
+    player_mana = np.full(n, player.mana, dtype=np.int64)
+    potions = np.full(n, player.inventory.get("Health Potion", 0), dtype=np.int64)
+    enemy_hp = np.full(n, enemy.health, dtype=np.int64)
+
+    turns = np.zeros(n, dtype=np.int64)
+    damage_dealt = np.zeros(n, dtype=np.int64)
+    damage_taken = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+
+    attack_base = player.weapons[player.current_weapon] + player.level * 2
+    armor_value = player.armor[player.current_armor]
+    defense_reduction = int(armor_value * (0.4 + (player.level * 0.02)))
+    enemy_damage = max(1, enemy.damage - defense_reduction)
+
+    heal_abilities = table.heal > 0
+    idx_all = np.arange(n)
+
+    # Damage over time on the enemy, one column per ability since reapplying
+    # an ability replaces its own effect. Defensive abilities are never picked
+    # by the policy, so the player carries no effects.
+    dot_left = np.zeros((n, len(table.names)), dtype=np.int64)
+
+    for _ in range(MAX_TURNS):
+        idx = idx_all[active]
+        if idx.size == 0:
+            break
+        if table.has_dot:
+            # Start of turn ticks, a kill here ends the fight before anyone acts
+            left = dot_left[idx]
+            ticking = left > 0
+            tick = (ticking * table.dot_damage[None, :]).sum(axis=1)
+            dot_left[idx] = left - ticking
+            enemy_hp[idx] -= tick
+            damage_dealt[idx] += tick
+            active[idx] = enemy_hp[idx] > 0
+            idx = idx_all[active]
+            if idx.size == 0:
+                break
+        m = idx.size
+        hp = player_hp[idx]
+        mana = player_mana[idx]
+
+        affordable = mana[:, None] >= table.mana_cost[None, :]
+        low = hp < max_health * LOW_HEALTH
+
+        # Best healing ability when low on health
+        heal_score = np.where(affordable & heal_abilities[None, :], table.heal[None, :], -1)
+        best_heal = heal_score.argmax(axis=1) if table.names else np.zeros(m, dtype=np.int64)
+        can_heal = low & (heal_score.max(axis=1, initial=-1) > 0)
+        use_potion = low & ~can_heal & (potions[idx] > 0)
+
+        # Otherwise the strongest affordable damaging move
+        damage_score = np.where(affordable & table.has_damage[None, :],
+                                table.expected_damage[None, :], -1)
+        best_damage = damage_score.argmax(axis=1) if table.names else np.zeros(m, dtype=np.int64)
+        use_damage = ~can_heal & ~use_potion & (damage_score.max(axis=1, initial=-1) > attack_base)
+        use_attack = ~can_heal & ~use_potion & ~use_damage
+
+        ability = np.where(can_heal, best_heal, best_damage)
+        use_ability = can_heal | use_damage
+
+        dealt = np.zeros(m, dtype=np.int64)
+
+        # Basic attack
+        variation = rng.integers(-3, 4, size=m)
+        dealt = np.where(use_attack, np.maximum(1, attack_base + variation), dealt)
+
+        # Abilities
+        if table.names:
+            k = ability
+            cost = np.where(use_ability, table.mana_cost[k], 0)
+            player_mana[idx] = mana - cost
+            single = use_ability & table.has_damage[k] & ~table.multi_hit[k]
+            dealt = np.where(single, table.damage[k] + rng.integers(-5, 6, size=m), dealt)
+            if table.max_hits:
+                multi = use_ability & table.has_damage[k] & table.multi_hit[k]
+                hit_rolls = rng.integers(-2, 3, size=(m, table.max_hits))
+                hit_mask = np.arange(table.max_hits)[None, :] < table.hits[k][:, None]
+                multi_total = (table.damage[k][:, None] + hit_rolls) * hit_mask
+                dealt = np.where(multi, multi_total.sum(axis=1), dealt)
+            healed = np.where(use_ability, table.heal[k], 0)
+            if table.has_dot:
+                applies = use_ability & (table.dot_duration[k] > 0)
+                dot_left[idx[applies], k[applies]] = table.dot_duration[k[applies]]
+            hp = np.minimum(max_health, hp + healed)
+
+        # Health potions
+        hp = np.where(use_potion, np.minimum(max_health, hp + HEALTH_POTION_HEAL), hp)
+        potions[idx] -= use_potion
+
+        e_hp = enemy_hp[idx] - dealt
+        damage_dealt[idx] += dealt
+
+        # Enemy attacks if it survived the player's action
+        hit = e_hp > 0
+        hp = hp - np.where(hit, enemy_damage, 0)
+        damage_taken[idx] += np.where(hit, enemy_damage, 0)
+
+        player_hp[idx] = hp
+        enemy_hp[idx] = e_hp
+        turns[idx] += 1
+        active[idx] = (e_hp > 0) & (hp > 0)
+
+    wins = (enemy_hp <= 0) & (player_hp > 0)
+    return SimulationResult(player, enemy, wins, turns, damage_dealt, damage_taken)
+
+
+class SimulationResult:
+    """Summary statistics for a batch of simulated fights"""
+    def __init__(self, player, enemy, wins, turns, damage_dealt, damage_taken):
+        self.class_name = CLASS_NAMES.get(player.class_type, player.class_type)
+        self.level = player.level
+        self.enemy = enemy.name
+        self.enemy_level = enemy.level
+        self.fights = wins.size
+        self.wins = int(wins.sum())
+        self.turns = turns
+        self.kill_turns = turns[wins]
+        self.damage_dealt = damage_dealt
+        self.damage_taken = damage_taken
+
+    @property
+    def win_rate(self):
+        return self.wins / self.fights if self.fights else 0.0
+
+    def turns_to_kill(self, percentiles=(50, 90, 99)):
+        """Percentiles of turns needed for the fights the player won"""
+        if self.kill_turns.size == 0:
+            return {p: None for p in percentiles}
+        values = np.percentile(self.kill_turns, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values)}
+
+    def damage_histogram(self, bins=20, taken=False):
+        """Histogram (counts, bin_edges) of damage dealt or taken per fight"""
+        data = self.damage_taken if taken else self.damage_dealt
+        return np.histogram(data, bins=bins)
+
+    def summary(self):
+        return {
+            "class": self.class_name,
+            "level": self.level,
+            "enemy": self.enemy,
+            "enemy_level": self.enemy_level,
+            "fights": self.fights,
+            "win_rate": self.win_rate,
+            "mean_turns": float(self.turns.mean()) if self.fights else 0.0,
+            "turns_to_kill": self.turns_to_kill(),
+            "mean_damage_dealt": float(self.damage_dealt.mean()) if self.fights else 0.0,
+            "mean_damage_taken": float(self.damage_taken.mean()) if self.fights else 0.0,
+        }
+
+
+def run_matrix(fights, level=1, enemy_level=None, seed=None):
+    """Simulate every class against every spawn table entry"""
+    rng = np.random.default_rng(seed)
+    results = []
+    for class_type in CLASS_NAMES:
+        player = build_player(class_type, level)
+        for enemy in spawn_enemies(enemy_level):
+            results.append(simulate(player, enemy, fights, rng))
+    return results
+
+
+def print_report(results):
+    print(f"{'Class':<12} {'Enemy':<8} {'Win %':>7} {'Turns p50':>10} {'Turns p90':>10} {'Dealt':>8} {'Taken':>8}")
+    for result in results:
+        s = result.summary()
+        ttk = s["turns_to_kill"]
+        p50 = f"{ttk[50]:.0f}" if ttk[50] is not None else "-"
+        p90 = f"{ttk[90]:.0f}" if ttk[90] is not None else "-"
+        print(f"{s['class']:<12} {s['enemy']:<8} {s['win_rate'] * 100:>6.1f}% {p50:>10} {p90:>10} "
+              f"{s['mean_damage_dealt']:>8.1f} {s['mean_damage_taken']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Monte Carlo combat simulator")
+    parser.add_argument("--fights", type=int, default=100000, help="fights per class/enemy pair")
+    parser.add_argument("--level", type=int, default=1, help="player level")
+    parser.add_argument("--enemy-level", type=int, default=None, help="force every enemy to this level")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_matrix(args.fights, args.level, args.enemy_level, args.seed)
+    elapsed = time.perf_counter() - start
+    print_report(results)
+    total = args.fights * len(results)
+    print(f"\nSimulated {total} fights in {elapsed:.2f}s")
@@ -0,0 +1,636 @@
+import json
+import struct
+from collections import namedtuple
+
+from abilities import CLASS_ALIASES, class_level, lookup_row
+from game_logic import Character, Enemy, Gadget, GADGET_CATALOG
+from status_effects import EFFECT_TYPES, FIELD_TYPES, StatusEffects
+
+# Snapshot layout, version 1
+#
+#   header      version (B), kind (B)
+#   name ref    H catalog id, or 0 followed by an inline string (H length + UTF-8)
+#
+# Character:  shape (layout + collection sizes), then either
+#             packed: name str, class, stats, equipment, collection
+#                     ids/values and status effects, all as catalog ids
+#                     in one struct
+#             fields: name str, class ref, stats, weapon ref, armor ref,
+#                     inventory, weapons, armor, gadgets, status effects,
+#                     inline abilities
+# Enemy:      name ref, stats, status effects
+# Gadget:     name ref, charges (B), inline definition when not in the catalog
+#
+# Abilities are not stored: they are fully determined by class and the level
+# update_abilities last ran at, so only that level is written. Characters
+# with hand-edited abilities fall back to an inline JSON copy.
+VERSION = 1
+
+KIND_CHARACTER = 1
+KIND_ENEMY = 2
+KIND_GADGET = 3
+KIND_DELTA = 4
+
+# Static name catalog. Append only: ids are part of the format.
+NAMES = (
+    # Classes
+    "1", "2", "3", "4", "5", "6",
+    "Warrior", "Mage", "Paladin", "Necromancer", "Assassin", "Druid",
+    # Abilities
+    "Rage", "Shield Block", "Whirlwind", "Berserk",
+    "Fireball", "Frost Bolt", "Lightning Strike", "Meteor",
+    "Holy Strike", "Divine Shield", "Consecration", "Divine Storm",
+    "Death Bolt", "Life Drain", "Curse", "Death Nova",
+    "Backstab", "Poison Strike", "Shadow Step", "Death Mark",
+    "Nature's Wrath", "Regrowth", "Entangling Roots", "Hurricane",
+    # Damage over time effects are named after the lowercased ability
+    "fireball", "curse", "poison strike", "death mark", "entangling roots",
+    "Shield", "Poison", "Regeneration",
+    # Items and equipment
+    "Health Potion", "Mana Potion",
+    "Basic Sword", "Iron Sword", "Wooden Staff", "Steel Sword", "Magic Staff",
+    "Flame Sword", "Frost Staff",
+    "Basic Leather", "Leather Armor", "Chain Mail", "Plate Armor",
+    # Gadgets
+    "Smoke Bomb", "Health Generator", "Lightning Rod", "Shield Generator",
+    "Time Distorter", "Damage Amplifier", "Ultimate Nullifier", "Phoenix Protocol",
+    "common", "rare", "epic", "legendary",
+    # Spawn table
+    "Rat", "Goblin", "Wolf", "Bandit", "Troll", "Dragon",
+)
+NAME_IDS = {name: i + 1 for i, name in enumerate(NAMES)}
+
+MAX_ABILITY_LEVEL = 100
+
+HEADER = struct.Struct("<BB")
+REF = struct.Struct("<H")
+COUNT = struct.Struct("<B")
+PAIR = struct.Struct("<i")
+# level, ability level, exp, gold, health, max health, mana, max mana, tech points
+CHARACTER_STATS = struct.Struct("<HHiiiiiii")
+# level, health, max health, damage, exp reward, gold reward, is boss
+ENEMY_STATS = struct.Struct("<Hiiiiib")
+# Status effect numbers, written behind a presence mask
+EFFECT_FIELDS = ("damage", "heal", "defense", "duration")
+DELTA_MASK = struct.Struct("<H")
+PACKED = 0x80  # Count byte flag: collection packed as one struct of catalog ids
+# Character layout byte and collection sizes (inventory, weapons, armor, gadgets)
+SHAPE = struct.Struct("<BBBBB")
+LAYOUT_FIELDS = 0
+LAYOUT_PACKED = 1
+
+
+class SnapshotError(ValueError):
+    """Raised for malformed or unsupported snapshots"""
+    pass
+
+
+# Low level writers and readers
+
+def _write_str(parts, text):
+    data = text.encode("utf-8")
+    parts.append(REF.pack(len(data)))
+    parts.append(data)
+
+
+def _read_str(buf, offset):
+    (length,) = REF.unpack_from(buf, offset)
+    offset += 2
+    return bytes(buf[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def _write_ref(parts, name):
+    ref = NAME_IDS.get(name)
+    if ref is None:
+        parts.append(b"\x00\x00")
+        _write_str(parts, name)
+    else:
+        parts.append(REF.pack(ref))
+
+
+def _read_ref(buf, offset):
+    (ref,) = REF.unpack_from(buf, offset)
+    offset += 2
+    if ref == 0:
+        return _read_str(buf, offset)
+    return NAMES[ref - 1], offset
+
+
+_pair_structs = {}
+
+
+def _pairs_struct(count):
+    packer = _pair_structs.get(count)
+    if packer is None:
+        packer = _pair_structs[count] = struct.Struct("<B" + "Hi" * count)
+    return packer
+
+
+def _write_counts(parts, pairs):
+    # Fast path: every name is in the catalog, so the whole collection is a
+    # single struct and the high bit of the count byte says so
+    flat = []
+    for name, value in pairs:
+        ref = NAME_IDS.get(name)
+        if ref is None:
+            break
+        flat.append(ref)
+        flat.append(value)
+    else:
+        parts.append(_pairs_struct(len(pairs)).pack(len(pairs) | PACKED, *flat))
+        return
+    parts.append(COUNT.pack(len(pairs)))
+    for name, value in pairs:
+        _write_ref(parts, name)
+        parts.append(PAIR.pack(value))
+
+
+def _read_counts(buf, offset):
+    count = buf[offset]
+    if count & PACKED:
+        packer = _pairs_struct(count & ~PACKED)
+        flat = packer.unpack_from(buf, offset)
+        names = [NAMES[ref - 1] for ref in flat[1::2]]
+        return tuple(zip(names, flat[2::2])), offset + packer.size
+    offset += 1
+    pairs = []
+    for _ in range(count):
+        name, offset = _read_ref(buf, offset)
+        (value,) = PAIR.unpack_from(buf, offset)
+        offset += 4
+        pairs.append((name, value))
+    return tuple(pairs), offset
+
+
+def _write_effects(parts, effects):
+    parts.append(COUNT.pack(len(effects)))
+    for effect in effects:
+        _write_ref(parts, effect[0])
+        mask = 0
+        values = []
+        for bit, value in enumerate(effect[1:]):
+            if value is not None:
+                mask |= 1 << bit
+                values.append(value)
+        parts.append(COUNT.pack(mask))
+        parts.append(struct.pack(f"<{len(values)}i", *values))
+
+
+def _read_effects(buf, offset):
+    count = buf[offset]
+    offset += 1
+    effects = []
+    for _ in range(count):
+        name, offset = _read_ref(buf, offset)
+        mask = buf[offset]
+        offset += 1
+        effect = [name]
+        for bit in range(len(EFFECT_FIELDS)):
+            if mask & (1 << bit):
+                (value,) = PAIR.unpack_from(buf, offset)
+                offset += 4
+                effect.append(value)
+            else:
+                effect.append(None)
+        effects.append(tuple(effect))
+    return tuple(effects), offset
+
+
+def _write_json(parts, value):
+    _write_str(parts, "" if value is None else json.dumps(value, separators=(",", ":")))
+
+
+def _read_json(buf, offset):
+    text, offset = _read_str(buf, offset)
+    return (json.loads(text) if text else None), offset
+
+
+def _write_stats(parts, stats):
+    parts.append(CHARACTER_STATS.pack(*stats))
+
+
+def _read_stats(buf, offset):
+    return CHARACTER_STATS.unpack_from(buf, offset), offset + CHARACTER_STATS.size
+
+
+# Abilities are a pure function of (class, level), see abilities.py
+
+_CLASS_KEYS = {}  # Class name -> canonical class key, for matching shared ability rows
+
+
+def _ability_level(player):
+    """Level update_abilities last ran at, or 0 if the abilities were edited"""
+    class_type = player.class_type
+    key = _CLASS_KEYS.get(class_type)
+    if key is None:
+        key = _CLASS_KEYS[class_type] = CLASS_ALIASES.get(class_type.lower())
+    row = lookup_row(player.abilities)
+    if row is not None and key == row.class_key:
+        return row.level
+    for level in range(1, MAX_ABILITY_LEVEL + 1):
+        if player.abilities == class_level(class_type, level).abilities:
+            return level
+    return 0
+
+
+# Status effects are encoded from EffectEntry or live StatusEffect objects,
+# which share these attributes. Records keep them as flat tuples of
+# EFFECT_FIELDS values.
+
+EffectEntry = namedtuple("EffectEntry", ["name", "type_id", "value", "duration"])
+
+
+def _effect_tuples(effects):
+    return tuple((e.name,) + tuple(e.value if FIELD_TYPES[field] == e.type_id else None
+                                   for field in EFFECT_FIELDS[:-1])
+                 + (e.duration,) for e in effects)
+
+
+def _entries_from_tuples(effects):
+    entries = []
+    for effect in effects:
+        for field, value in zip(EFFECT_FIELDS, effect[1:-1]):
+            if value is not None:
+                entries.append(EffectEntry(effect[0], FIELD_TYPES[field], value, effect[-1]))
+                break
+    return entries
+
+
+def _status_effects(effects):
+    result = StatusEffects()
+    for effect in effects:
+        result.add(effect.name, effect.type_id, effect.value, effect.duration, replace=False)
+    return result
+
+
+def _gadget_from_charges(name, charges):
+    gadget = Gadget.__new__(Gadget)
+    rarity, effect, cost = GADGET_CATALOG[name]
+    gadget.__dict__ = {"name": name, "rarity": rarity, "effect": dict(effect), "cost": cost, "charges": charges}
+    return gadget
+
+
+def _build_character(name, class_type, stats, weapon, armor, inventory, weapons, armors, gadgets,
+                     effects, abilities=None):
+    """Character from decoded record parts, effects as (name, type id, value, duration)"""
+    (level, ability_level, exp, gold, health, max_health, mana, max_mana, tech_points) = stats
+    status_effects = StatusEffects()
+    for effect_name, type_id, value, duration in effects:
+        status_effects.add(effect_name, type_id, value, duration, replace=False)
+    player = Character.__new__(Character)
+    player.__dict__ = {
+        "name": name, "class_type": class_type,
+        "health": health, "max_health": max_health, "mana": mana, "max_mana": max_mana,
+        "level": level, "exp": exp, "gold": gold,
+        "inventory": dict(inventory),
+        "weapons": dict(weapons),
+        "current_weapon": weapon,
+        "abilities": class_level(class_type, ability_level).abilities if ability_level else abilities,
+        "status_effects": status_effects,
+        "armor": dict(armors),
+        "current_armor": armor,
+        "tech_points": tech_points,
+        "gadgets": {gname: _gadget_from_charges(gname, charges) for gname, charges in gadgets},
+    }
+    return player
+
+
+# Records: flat tuples in encoding order, also what deltas compare
+
+def character_record(player):
+    ability_level = _ability_level(player)
+    return (
+        player.name,
+        player.class_type,
+        (player.level, ability_level, player.exp, player.gold, player.health,
+         player.max_health, player.mana, player.max_mana, player.tech_points),
+        player.current_weapon,
+        player.current_armor,
+        tuple(player.inventory.items()),
+        tuple(player.weapons.items()),
+        tuple(player.armor.items()),
+        tuple((name, gadget.charges) for name, gadget in player.gadgets.items()),
+        _effect_tuples(player.status_effects),
+        None if ability_level else {name: dict(details) for name, details in player.abilities.items()},
+    )
+
+
+def character_from_record(record):
+    (name, class_type, stats, weapon, armor, inventory, weapons, armors,
+     gadgets, effects, abilities) = record
+    return _build_character(name, class_type, stats, weapon, armor, inventory, weapons, armors, gadgets,
+                            _entries_from_tuples(effects or ()), abilities)
+
+
+# Per-field codecs for character records, in record order
+_CHARACTER_FIELDS = (
+    (_write_str, _read_str),
+    (_write_ref, _read_ref),
+    (_write_stats, _read_stats),
+    (_write_ref, _read_ref),
+    (_write_ref, _read_ref),
+    (_write_counts, _read_counts),
+    (_write_counts, _read_counts),
+    (_write_counts, _read_counts),
+    (_write_counts, _read_counts),
+    (_write_effects, _read_effects),
+    (_write_json, _read_json),
+)
+_STATS_FIELD = 2
+
+
+def _check_header(buf, kind):
+    version, found = HEADER.unpack_from(buf, 0)
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+    if found != kind:
+        raise SnapshotError(f"Expected snapshot kind {kind}, got {found}")
+
+
+# Packed layout: the whole snapshot is one struct, precompiled per shape
+# (name length, collection sizes, effect count), so encoding is a single
+# pack call over a flat list and decoding a single unpack. Effect values
+# sit behind the same presence mask the fields layout writes.
+_EFFECT_DURATION_BIT = 1 << (len(EFFECT_FIELDS) - 1)
+# Status effect type id -> presence mask of its value and duration, and back
+_EFFECT_MASKS = {type_id: 1 << EFFECT_FIELDS.index(effect_type.field) | _EFFECT_DURATION_BIT
+                 for type_id, effect_type in EFFECT_TYPES.items() if effect_type.field in EFFECT_FIELDS}
+_MASK_TYPES = {mask: type_id for type_id, mask in _EFFECT_MASKS.items()}
+# Header, shape and name length, then offsets into an unpacked snapshot
+_PACKED_PREFIX = struct.Struct("<BBBBBBBH")
+_PACKED_HEAD = bytes((VERSION, KIND_CHARACTER, LAYOUT_PACKED))
+_REF_NAMES = {i + 1: name for i, name in enumerate(NAMES)}  # 0, an inline name, has no entry
+_PACKED_NAME = 8
+_PACKED_CLASS = 9
+_PACKED_STATS = 10
+_PACKED_PAIRS = _PACKED_STATS + len(CHARACTER_STATS.format) - 1 + 2
+
+_packed_structs = {}
+
+
+def _packed_struct(name_length, pair_count, effect_count):
+    key = (name_length, pair_count, effect_count)
+    packer = _packed_structs.get(key)
+    if packer is None:
+        packer = _packed_structs[key] = struct.Struct(
+            f"{_PACKED_PREFIX.format}{name_length}sH{CHARACTER_STATS.format[1:]}HH"
+            + "Hi" * pair_count + "B" + "HBii" * effect_count)
+    return packer
+
+
+def _encode_packed(name, class_type, stats, weapon, armor, inventory, weapons, armors, gadgets, effects):
+    """Packed snapshot; KeyError if a name is not in the catalog or an effect type has no field"""
+    ids = NAME_IDS
+    masks = _EFFECT_MASKS
+    data = name.encode("utf-8")
+    ni, nw, na, ng, ne = len(inventory), len(weapons), len(armors), len(gadgets), len(effects)
+    flat = [VERSION, KIND_CHARACTER, LAYOUT_PACKED, ni, nw, na, ng, len(data), data, ids[class_type], *stats,
+            ids[weapon], ids[armor]]
+    for item, value in inventory:
+        flat += (ids[item], value)
+    for item, value in weapons:
+        flat += (ids[item], value)
+    for item, value in armors:
+        flat += (ids[item], value)
+    for item, value in gadgets:
+        flat += (ids[item], value)
+    flat.append(ne)
+    for effect in effects:
+        flat += (ids[effect.name], masks[effect.type_id], effect.value, effect.duration)
+    return _packed_struct(len(data), ni + nw + na + ng, ne).pack(*flat)
+
+
+def _decode_packed(data):
+    """Parts of a packed snapshot in record order, effects as (name, type id, value, duration)"""
+    try:
+        (_, _, _, ni, nw, na, ng, name_length) = _PACKED_PREFIX.unpack_from(data, 0)
+        pairs = ni + nw + na + ng
+        effect_count = data[_PACKED_PREFIX.size + name_length + CHARACTER_STATS.size + 6 + 6 * pairs]
+        values = _packed_struct(name_length, pairs, effect_count).unpack(data)
+        start = _PACKED_PAIRS + 2 * pairs + 1
+        names = _REF_NAMES
+        class_type = names[values[_PACKED_CLASS]]
+        weapon = names[values[_PACKED_PAIRS - 2]]
+        armor = names[values[_PACKED_PAIRS - 1]]
+        items = [names[ref] for ref in values[_PACKED_PAIRS:start - 1:2]]
+        effect_names = [names[ref] for ref in values[start::4]]
+        effect_types = [_MASK_TYPES[mask] for mask in values[start + 1::4]]
+        name = values[_PACKED_NAME].decode("utf-8")
+    except (IndexError, KeyError, UnicodeDecodeError, struct.error) as e:
+        raise SnapshotError(f"Malformed packed snapshot: {e!r}") from e
+    counts = values[_PACKED_PAIRS + 1:start - 1:2]
+    a, b, c = ni, ni + nw, ni + nw + na
+    return (
+        name, class_type, values[_PACKED_STATS:_PACKED_PAIRS - 2], weapon, armor,
+        zip(items[:a], counts[:a]), zip(items[a:b], counts[a:b]), zip(items[b:c], counts[b:c]),
+        zip(items[c:], counts[c:]),
+        zip(effect_names, effect_types, values[start + 2::4], values[start + 3::4]),
+    )
+
+
+def _encode_record(record):
+    (name, class_type, stats, weapon, armor, inventory, weapons, armors,
+     gadgets, effects, abilities) = record
+    # Packed when every name is a catalog id and the abilities follow from the level
+    if abilities is None:
+        try:
+            return _encode_packed(name, class_type, stats, weapon, armor, inventory, weapons, armors, gadgets,
+                                  _entries_from_tuples(effects))
+        except KeyError:
+            pass
+    parts = [HEADER.pack(VERSION, KIND_CHARACTER), SHAPE.pack(LAYOUT_FIELDS, 0, 0, 0, 0)]
+    for (write, _), value in zip(_CHARACTER_FIELDS, record):
+        write(parts, value)
+    return b"".join(parts)
+
+
+def _decode_record(data):
+    if data[:3] == _PACKED_HEAD:
+        (name, class_type, stats, weapon, armor, inventory, weapons, armors,
+         gadgets, effects) = _decode_packed(data)
+        return (name, class_type, stats, weapon, armor, tuple(inventory), tuple(weapons), tuple(armors),
+                tuple(gadgets), _effect_tuples(map(EffectEntry._make, effects)), None)
+    buf = memoryview(data)
+    _check_header(buf, KIND_CHARACTER)
+    offset = HEADER.size + SHAPE.size
+    record = []
+    for _, read in _CHARACTER_FIELDS:
+        value, offset = read(buf, offset)
+        record.append(value)
+    return tuple(record)
+
+
+def encode_character(player):
+    """Pack a Character into a compact binary snapshot"""
+    ability_level = _ability_level(player)
+    if ability_level:
+        try:
+            return _encode_packed(
+                player.name, player.class_type,
+                (player.level, ability_level, player.exp, player.gold, player.health,
+                 player.max_health, player.mana, player.max_mana, player.tech_points),
+                player.current_weapon, player.current_armor,
+                player.inventory.items(), player.weapons.items(), player.armor.items(),
+                [(name, gadget.charges) for name, gadget in player.gadgets.items()],
+                player.status_effects)
+        except KeyError:
+            pass
+    return _encode_record(character_record(player))
+
+
+def decode_character(data):
+    """Rebuild a Character from encode_character output"""
+    if data[:3] == _PACKED_HEAD:
+        return _build_character(*_decode_packed(data))
+    return character_from_record(_decode_record(data))
+
+
+# Enemies
+
+def encode_enemy(enemy):
+    parts = [HEADER.pack(VERSION, KIND_ENEMY)]
+    _write_ref(parts, enemy.name)
+    parts.append(ENEMY_STATS.pack(enemy.level, enemy.health, enemy.max_health, enemy.damage,
+                                  enemy.exp_reward, enemy.gold_reward, enemy.is_boss))
+    _write_effects(parts, _effect_tuples(enemy.status_effects))
+    return b"".join(parts)
+
+
+def decode_enemy(data):
+    buf = memoryview(data)
+    _check_header(buf, KIND_ENEMY)
+    name, offset = _read_ref(buf, HEADER.size)
+    stats = ENEMY_STATS.unpack_from(buf, offset)
+    effects, offset = _read_effects(buf, offset + ENEMY_STATS.size)
+    enemy = Enemy.__new__(Enemy)
+    enemy.name = name
+    (enemy.level, enemy.health, enemy.max_health, enemy.damage,
+     enemy.exp_reward, enemy.gold_reward, is_boss) = stats
+    enemy.is_boss = bool(is_boss)
+    enemy.status_effects = _status_effects(_entries_from_tuples(effects))
+    enemy.abilities = {}
+    return enemy
+
+
+# Gadgets
+
+def encode_gadget(gadget):
+    parts = [HEADER.pack(VERSION, KIND_GADGET)]
+    _write_ref(parts, gadget.name)
+    parts.append(COUNT.pack(gadget.charges))
+    if gadget.name not in GADGET_CATALOG:
+        _write_ref(parts, gadget.rarity)
+        parts.append(PAIR.pack(gadget.cost))
+        _write_json(parts, gadget.effect)
+    return b"".join(parts)
+
+
+def decode_gadget(data):
+    buf = memoryview(data)
+    _check_header(buf, KIND_GADGET)
+    name, offset = _read_ref(buf, HEADER.size)
+    charges = buf[offset]
+    offset += 1
+    if name in GADGET_CATALOG:
+        return _gadget_from_charges(name, charges)
+    gadget = Gadget.__new__(Gadget)
+    gadget.name = name
+    gadget.rarity, offset = _read_ref(buf, offset)
+    (gadget.cost,) = PAIR.unpack_from(buf, offset)
+    gadget.effect, offset = _read_json(buf, offset + 4)
+    gadget.charges = charges
+    return gadget
+
+
+# Deltas between two character snapshots
+
+def encode_delta(old, new):
+    """Encode the changes from snapshot `old` to snapshot `new`
+
+    Only fields that differ are written. Changed stats are written one int
+    at a time behind their own bit mask, so a typical combat turn (health
+    and mana) costs a handful of bytes.
+    """
+    mask = 0
+    parts = []
+    for i, ((write, _), before, after) in enumerate(zip(_CHARACTER_FIELDS, _decode_record(old),
+                                                         _decode_record(new))):
+        if before == after:
+            continue
+        mask |= 1 << i
+        if i == _STATS_FIELD:
+            stats_mask = 0
+            values = []
+            for bit, (a, b) in enumerate(zip(before, after)):
+                if a != b:
+                    stats_mask |= 1 << bit
+                    values.append(b)
+            parts.append(DELTA_MASK.pack(stats_mask))
+            parts.append(struct.pack(f"<{len(values)}i", *values))
+        else:
+            write(parts, after)
+    return HEADER.pack(VERSION, KIND_DELTA) + DELTA_MASK.pack(mask) + b"".join(parts)
+
+
+def apply_delta(old, delta):
+    """Apply an encode_delta result to `old` and return the new snapshot"""
+    record = list(_decode_record(old))
+    buf = memoryview(delta)
+    _check_header(buf, KIND_DELTA)
+    (mask,) = DELTA_MASK.unpack_from(buf, HEADER.size)
+    offset = HEADER.size + DELTA_MASK.size
+    for i, (_, read) in enumerate(_CHARACTER_FIELDS):
+        if not mask & (1 << i):
+            continue
+        if i == _STATS_FIELD:
+            (stats_mask,) = DELTA_MASK.unpack_from(buf, offset)
+            offset += DELTA_MASK.size
+            stats = list(record[i])
+            for bit in range(len(stats)):
+                if stats_mask & (1 << bit):
+                    (stats[bit],) = PAIR.unpack_from(buf, offset)
+                    offset += 4
+            record[i] = tuple(stats)
+        else:
+            record[i], offset = read(buf, offset)
+    return _encode_record(record)
+
+
+# Codec interface used by session_store.PlayerSession
+dumps = encode_character
+loads = decode_character
+
+
+if __name__ == "__main__":
+    # Character snapshot throughput, for a typical mid-game character
+    import argparse
+    import sys
+    import time
+
+    from game_logic import create_gadget
+    from status_effects import DEFENSE
+
+    parser = argparse.ArgumentParser(description="Snapshot codec throughput")
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    player = Character("Hero", "3")
+    player.weapons["Iron Sword"] = 12
+    player.gadgets["Smoke Bomb"] = create_gadget("Smoke Bomb")
+    player.gadgets["Health Generator"] = create_gadget("Health Generator")
+    player.status_effects.add("Divine Shield", DEFENSE, 20, 3)
+    data = encode_character(player)
+    for label, other in (("round trip", encode_character(decode_character(data))),
+                         ("record codec", _encode_record(character_record(player)))):
+        if other != data:
+            sys.exit(f"Snapshot mismatch on {label}:\n  {data.hex()}\n  {other.hex()}")
+
+    start = time.perf_counter()
+    for _ in range(args.count):
+        encode_character(player)
+    encoded = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.count):
+        decode_character(data)
+    decoded = time.perf_counter() - start
+    print(f"{len(data)} bytes: {args.count / encoded:,.0f} encodes/s, {args.count / decoded:,.0f} decodes/s")
@@ -0,0 +1,164 @@
+import pygame
+
+CELL_SIZE = 64  # A few sprite widths, so queries touch only a handful of cells
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """Sprite group with a uniform spatial hash for broad-phase queries
+
+    Each sprite is bucketed by the grid cell holding its rect's top-left
+    corner, and queries widen their window by the largest sprite size seen,
+    so one bucket per sprite is enough to find everything overlapping.
+    Sprites that move are re-bucketed by relocate() or refresh(), which only
+    touch the grid when the cell actually changes. kill() and remove() take
+    sprites out of the grid like any other group.
+    """
+    def __init__(self, *sprites, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}   # (cx, cy) -> set of sprites
+        self.keys = {}    # sprite -> its (cx, cy)
+        self.max_width = 0
+        self.max_height = 0
+        super().__init__(*sprites)
+
+    def _key(self, rect):
+        return (rect.x // self.cell_size, rect.y // self.cell_size)
+
+    def _insert(self, sprite, key):
+        bucket = self.cells.get(key)
+        if bucket is None:
+            bucket = self.cells[key] = set()
+        bucket.add(sprite)
+        self.keys[sprite] = key
+
+    def _discard(self, sprite, key):
+        bucket = self.cells[key]
+        bucket.discard(sprite)
+        if not bucket:
+            del self.cells[key]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        rect = sprite.rect
+        self.max_width = max(self.max_width, rect.width)
+        self.max_height = max(self.max_height, rect.height)
+        self._insert(sprite, self._key(rect))
+
+    def remove_internal(self, sprite):
+        key = self.keys.pop(sprite, None)
+        if key is not None:
+            self._discard(sprite, key)
+        super().remove_internal(sprite)
+
+    def relocate(self, sprite):
+        """Re-bucket a sprite after its rect moved"""
+        key = self._key(sprite.rect)
+        old = self.keys[sprite]
+        if key != old:
+            self._discard(sprite, old)
+            self._insert(sprite, key)
+
+    def refresh(self):
+        """Re-bucket every sprite whose cell changed this frame"""
+        size = self.cell_size
+        moved = []
+        for sprite, old in self.keys.items():
+            rect = sprite.rect
+            key = (rect.x // size, rect.y // size)
+            if key != old:
+                moved.append((sprite, old, key))
+        for sprite, old, key in moved:
+            self._discard(sprite, old)
+            self._insert(sprite, key)
+
+    def _candidates(self, left, top, right, bottom):
+        """Sprites with their top-left corner inside the given area"""
+        size = self.cell_size
+        x0, y0 = int(left // size), int(top // size)
+        x1, y1 = int(right // size), int(bottom // size)
+        cells = self.cells
+        found = set()
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            # Query window larger than the occupied grid, scan the buckets
+            for (cx, cy), bucket in cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    found |= bucket
+            return found
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found |= bucket
+        return found
+
+    def query_rect(self, rect):
+        """Sprites whose rect overlaps `rect`, like spritecollide"""
+        candidates = self._candidates(rect.left - self.max_width, rect.top - self.max_height,
+                                      rect.right, rect.bottom)
+        return [sprite for sprite in candidates if rect.colliderect(sprite.rect)]
+
+    def query_radius(self, x, y, radius):
+        """Sprites whose top-left corner is closer than `radius` to (x, y)"""
+        candidates = self._candidates(x - radius, y - radius, x + radius, y + radius)
+        limit = radius * radius
+        return [sprite for sprite in candidates
+                if (sprite.rect.x - x) ** 2 + (sprite.rect.y - y) ** 2 < limit]
+
+
+if __name__ == "__main__":
+    # Broad-phase benchmark: one frame of queries against naive linear scans
+    import argparse
+    import math
+    import random
+    import time
+
+    parser = argparse.ArgumentParser(description="Spatial hash benchmark")
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    width, height = 1000, 800
+    random.seed(1)
+    naive = pygame.sprite.Group()
+    grid = SpatialGroup()
+    for _ in range(args.entities):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(random.randint(0, width), random.randint(0, height), 20, 20)
+        naive.add(sprite)
+        grid.add(sprite)
+    probe = pygame.sprite.Sprite()
+    probe.rect = pygame.Rect(width // 2, height // 2, 30, 30)
+
+    def naive_frame():
+        pygame.sprite.spritecollide(probe, naive, False)
+        return [s for s in naive
+                if math.sqrt((s.rect.x - probe.rect.x) ** 2 + (s.rect.y - probe.rect.y) ** 2) < 100]
+
+    def grid_frame():
+        grid.query_rect(probe.rect)
+        return grid.query_radius(probe.rect.x, probe.rect.y, 100)
+
+    def move_all():
+        for sprite in naive:
+            sprite.rect.x += random.randint(-3, 3)
+            sprite.rect.y += random.randint(-3, 3)
+
+    naive_time = grid_time = refresh_time = 0.0
+    for _ in range(args.frames):
+        move_all()
+        start = time.perf_counter()
+        grid.refresh()
+        refresh_time += time.perf_counter() - start
+        start = time.perf_counter()
+        expected = naive_frame()
+        naive_time += time.perf_counter() - start
+        start = time.perf_counter()
+        hits = grid_frame()
+        grid_time += time.perf_counter() - start
+        assert set(hits) == set(expected)
+
+    per_frame = 1000 / args.frames
+    print(f"{args.entities} entities, per frame:")
+    print(f"  linear scan queries   {naive_time * per_frame:7.3f} ms")
+    print(f"  spatial hash queries  {grid_time * per_frame:7.3f} ms")
+    print(f"  spatial hash refresh  {refresh_time * per_frame:7.3f} ms (every sprite moved)")
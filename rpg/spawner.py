@@ -0,0 +1,127 @@
+import bisect
+import random
+from collections import namedtuple
+
+from game_logic import Enemy, SPAWN_TABLE
+
+
+class EnemyTemplate(namedtuple("EnemyTemplate", ["name", "health", "damage", "exp_reward", "gold_reward", "level"])):
+    """Prototype for an Enemy, only turned into an object once it is picked"""
+    __slots__ = ()
+
+    def create(self, level=None):
+        return Enemy(self.name, self.health, self.damage, self.exp_reward, self.gold_reward,
+                     self.level if level is None else level)
+
+
+SpawnEntry = namedtuple("SpawnEntry", ["template", "weight", "min_level"])
+
+
+class AliasTable:
+    """Walker/Vose alias table for O(1) sampling from fixed weights"""
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("Alias table needs at least one positive weight")
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+        self.n = n
+
+    def sample(self, rng=random):
+        i = int(rng.random() * self.n)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class Spawner:
+    """Level-aware enemy spawner over a declarative spawn table
+
+    Entries unlock at their min_level, so the eligible set only changes at
+    those thresholds. Each bracket between thresholds gets one cached alias
+    table, and sampling is two random numbers and a lookup.
+    """
+    def __init__(self, table=SPAWN_TABLE, rng=random):
+        self.entries = [SpawnEntry(EnemyTemplate(*stats), chance, min_level)
+                        for stats, chance, min_level in table]
+        self.thresholds = sorted({entry.min_level for entry in self.entries})
+        self.rng = rng
+        self._brackets = {}
+
+    def bracket(self, level):
+        """Lowest level of the bracket `level` falls in, or None below every entry"""
+        i = bisect.bisect_right(self.thresholds, level)
+        return self.thresholds[i - 1] if i else None
+
+    def _distribution(self, level):
+        bracket = self.bracket(level)
+        if bracket is None:
+            return None
+        cached = self._brackets.get(bracket)
+        if cached is None:
+            eligible = [entry for entry in self.entries if entry.min_level <= bracket]
+            cached = (eligible, AliasTable([entry.weight for entry in eligible]))
+            self._brackets[bracket] = cached
+        return cached
+
+    def pick(self, level):
+        """Template of the enemy to spawn for a player level, or None"""
+        distribution = self._distribution(level)
+        if distribution is None:
+            return None
+        eligible, alias = distribution
+        return eligible[alias.sample(self.rng)].template
+
+    def spawn(self, level):
+        """Create only the chosen enemy for a player level, or None"""
+        template = self.pick(level)
+        return template.create() if template else None
+
+    def probabilities(self, level):
+        """Spawn probability per enemy name at a level, as sampled by this spawner"""
+        distribution = self._distribution(level)
+        if distribution is None:
+            return {}
+        eligible, _ = distribution
+        total = sum(entry.weight for entry in eligible)
+        return {entry.template.name: entry.weight / total for entry in eligible}
+
+    def legacy_distribution(self, level):
+        """Probabilities of the old cumulative scan in main(), None meaning no spawn
+
+        The old code rolled 0-100 against the raw chances of the eligible
+        entries only, so rolls past their sum found no enemy and anything
+        beyond 100 could never be reached.
+        """
+        result = {}
+        cumulative = 0
+        for entry in self.entries:
+            if level >= entry.min_level:
+                low = min(cumulative, 100)
+                cumulative += entry.weight
+                result[entry.template.name] = (min(cumulative, 100) - low) / 100
+        result[None] = max(0.0, 1 - sum(result.values()))
+        return result
+
+
+if __name__ == "__main__":
+    spawner = Spawner()
+    for level in range(1, 7):
+        print(f"Level {level}:")
+        legacy = spawner.legacy_distribution(level)
+        current = spawner.probabilities(level)
+        for name in [entry.template.name for entry in spawner.entries] + [None]:
+            if name in legacy or name in current:
+                label = name or "(nothing)"
+                print(f"  {label:<10} old {legacy.get(name, 0) * 100:5.1f}%   new {current.get(name, 0) * 100:5.1f}%")
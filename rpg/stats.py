@@ -0,0 +1,99 @@
+class StatModifier:
+    """One buff or debuff: value = (base + bonus) * multiplier, for `turns` turns or until removed"""
+    __slots__ = ("stat", "source", "multiplier", "bonus", "turns")
+
+    def __init__(self, stat, source, multiplier=1.0, bonus=0, turns=None):
+        self.stat = stat
+        self.source = source
+        self.multiplier = multiplier
+        self.bonus = bonus
+        self.turns = turns  # None lasts until removed
+
+    def to_dict(self):
+        return {"stat": self.stat, "source": self.source, "multiplier": self.multiplier,
+                "bonus": self.bonus, "turns": self.turns}
+
+
+class Stats:
+    """Base stats plus a stack of modifiers, with derived values cached per stat
+
+    Derived values are always recomputed from the base values and the
+    current stack, never multiplied in place, so buffs can be removed or
+    expire and repeated buffs cannot drift. A stat's cached value is dropped
+    whenever its base or modifiers change and rebuilt on the next read, so
+    reading stays a dict lookup. One source holds at most one modifier per
+    stat: applying it again replaces the old one instead of stacking.
+    """
+    def __init__(self, **base):
+        self.base = dict(base)
+        self.modifiers = []
+        self._values = {}
+
+    def __getitem__(self, stat):
+        value = self._values.get(stat)
+        if value is None:
+            value = self._values[stat] = self._compute(stat)
+        return value
+
+    def _compute(self, stat):
+        bonus = 0
+        multiplier = 1.0
+        for modifier in self.modifiers:
+            if modifier.stat == stat:
+                bonus += modifier.bonus
+                multiplier *= modifier.multiplier
+        value = self.base[stat] + bonus
+        return value * multiplier if multiplier != 1.0 else value
+
+    def set_base(self, stat, value):
+        self.base[stat] = value
+        self._values.pop(stat, None)
+
+    def add(self, stat, source, multiplier=1.0, bonus=0, turns=None):
+        self.remove(source, stat)
+        modifier = StatModifier(stat, source, multiplier, bonus, turns)
+        self.modifiers.append(modifier)
+        self._values.pop(stat, None)
+        return modifier
+
+    def remove(self, source, stat=None):
+        """Drop a source's modifiers, for one stat or all of them; returns how many"""
+        kept = [m for m in self.modifiers
+                if m.source != source or (stat is not None and m.stat != stat)]
+        removed = len(self.modifiers) - len(kept)
+        if removed:
+            for modifier in self.modifiers:
+                if modifier.source == source:
+                    self._values.pop(modifier.stat, None)
+            self.modifiers = kept
+        return removed
+
+    def has(self, source):
+        return any(m.source == source for m in self.modifiers)
+
+    def tick(self):
+        """Count down timed modifiers by one turn and return the ones that expired"""
+        expired = []
+        for modifier in self.modifiers:
+            if modifier.turns is not None:
+                modifier.turns -= 1
+                if modifier.turns <= 0:
+                    expired.append(modifier)
+        if expired:
+            self.modifiers = [m for m in self.modifiers if m.turns is None or m.turns > 0]
+            for modifier in expired:
+                self._values.pop(modifier.stat, None)
+        return expired
+
+    def clear(self):
+        self.modifiers = []
+        self._values.clear()
+
+    def to_dict(self):
+        return {"base": dict(self.base), "modifiers": [m.to_dict() for m in self.modifiers]}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(**data["base"])
+        stats.modifiers = [StatModifier(**m) for m in data["modifiers"]]
+        return stats
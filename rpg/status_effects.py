@@ -0,0 +1,158 @@
+import heapq
+from collections import namedtuple
+
+# Effect type ids. They match the field codes used by the combat log.
+DAMAGE_OVER_TIME = 1
+HEAL_OVER_TIME = 2
+DEFENSE = 3
+
+EffectType = namedtuple("EffectType", ["type_id", "field", "ticks"])
+
+# Registered effect types: type id -> EffectType
+EFFECT_TYPES = {}
+# Effect dict field -> type id, for effects described the old way
+FIELD_TYPES = {}
+
+
+def register_effect_type(type_id, field, ticks=False):
+    """Register an effect type whose value is stored under `field`"""
+    effect_type = EffectType(type_id, field, ticks)
+    EFFECT_TYPES[type_id] = effect_type
+    FIELD_TYPES[field] = type_id
+    return effect_type
+
+
+register_effect_type(DAMAGE_OVER_TIME, "damage", ticks=True)
+register_effect_type(HEAL_OVER_TIME, "heal", ticks=True)
+register_effect_type(DEFENSE, "defense")
+
+
+class StatusEffect:
+    """One active effect, expiring once its owner's turn reaches `expires`"""
+    __slots__ = ("name", "type_id", "value", "expires", "owner", "live")
+
+    def __init__(self, name, type_id, value, expires, owner):
+        self.name = name
+        self.type_id = type_id
+        self.value = value
+        self.expires = expires
+        self.owner = owner
+        self.live = True
+
+    @property
+    def field(self):
+        return EFFECT_TYPES[self.type_id].field
+
+    @property
+    def duration(self):
+        """Turns left before the effect wears off"""
+        return self.expires - self.owner.turn
+
+    def __repr__(self):
+        return f"StatusEffect({self.name!r}, {self.field}={self.value}, duration={self.duration})"
+
+
+class StatusEffects:
+    """Status effects on one Character or Enemy
+
+    Effects are kept in insertion order, stacked per name so replacing one
+    or falling back to an older effect of the same name is amortized O(1),
+    and queued in a min-heap on the turn they expire so a tick only touches
+    what actually runs out. Running totals per type make lookups such as
+    total defense O(1).
+    """
+    __slots__ = ("turn", "_active", "_by_name", "_heap", "_seq", "_totals")
+
+    def __init__(self):
+        self.turn = 0
+        self._active = {}      # StatusEffect -> None, an insertion-ordered set
+        self._by_name = {}     # Name -> effects in the order added, removed ones dropped lazily
+        self._heap = []        # (expires, seq, effect)
+        self._seq = 0
+        self._totals = dict.fromkeys(EFFECT_TYPES, 0)
+
+    def __len__(self):
+        return len(self._active)
+
+    def __bool__(self):
+        return bool(self._active)
+
+    def __iter__(self):
+        return iter(list(self._active))
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def get(self, name):
+        stack = self._by_name.get(name)
+        return stack[-1] if stack else None
+
+    def total(self, type_id):
+        """Sum of the values of every active effect of a type"""
+        return self._totals.get(type_id, 0)
+
+    def add(self, name, type_id, value, duration, replace=True):
+        """Apply an effect; `replace` drops an active effect with the same name first"""
+        if replace:
+            existing = self._by_name.get(name)
+            if existing is not None:
+                self.remove(existing[-1])
+        effect = StatusEffect(name, type_id, value, self.turn + duration, self)
+        self._active[effect] = None
+        self._by_name.setdefault(name, []).append(effect)
+        self._totals[type_id] = self._totals.get(type_id, 0) + value
+        self._seq += 1
+        heapq.heappush(self._heap, (effect.expires, self._seq, effect))
+        return effect
+
+    def remove(self, effect):
+        """Drop an effect now; its heap entry is discarded when it surfaces"""
+        if not effect.live:
+            return
+        effect.live = False
+        del self._active[effect]
+        self._totals[effect.type_id] -= effect.value
+        stack = self._by_name[effect.name]
+        if stack[-1] is effect:
+            # Fall back to the newest older effect of the same name still active
+            stack.pop()
+            while stack and not stack[-1].live:
+                stack.pop()
+            if not stack:
+                del self._by_name[effect.name]
+
+    def advance(self):
+        """Move to the next turn and return the effects that expired, oldest first"""
+        self.turn += 1
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= self.turn:
+            effect = heapq.heappop(heap)[2]
+            if effect.live:
+                self.remove(effect)
+                expired.append(effect)
+        return expired
+
+    def clear(self):
+        for effect in list(self._active):
+            self.remove(effect)
+        self._heap.clear()
+
+    def ticking(self):
+        """Active effects that act every turn, e.g. damage or healing over time"""
+        return [effect for effect in self._active if EFFECT_TYPES[effect.type_id].ticks]
+
+    def to_dicts(self):
+        """Effects in the old list-of-dicts form"""
+        return [{"name": e.name, e.field: e.value, "duration": e.duration} for e in self._active]
+
+    @classmethod
+    def from_dicts(cls, effects):
+        """Build from the old list-of-dicts form, stacking duplicate names"""
+        result = cls()
+        for effect in effects:
+            for field, type_id in FIELD_TYPES.items():
+                if effect.get(field) is not None:
+                    result.add(effect["name"], type_id, effect[field], effect["duration"], replace=False)
+                    break
+        return result
@@ -0,0 +1,475 @@
+import math
+import random
+from collections import namedtuple
+from enum import Enum, auto
+
+import pygame
+
+from collision import swept_hits
+from enemy_batch import AMBUSH_BOOST, CIRCLE_SPEED, EnemyBatch
+from pool import SpritePool, shared_surface
+from spatial import SpatialGroup
+
+WINDOW_WIDTH = 1000
+WINDOW_HEIGHT = 800
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+
+PLAYER_ATTACK_RANGE = 50
+ENEMY_ATTACK_RANGE = 100
+
+# Simulation rates are per second of game time, the old per-frame constants
+# times the 60 FPS they were tuned at
+STEP = 1 / 60                # Seconds per fixed simulation step
+MAX_STEPS = 5                # Steps per rendered frame before the simulation falls behind
+PLAYER_SPEED = 300           # Pixels per second
+SPRINT_MULTIPLIER = 1.5
+STAMINA_DRAIN = 60           # Stamina per second while sprinting
+STAMINA_REGEN = 30           # Stamina per second otherwise
+ENEMY_SPEED = (90, 180)      # Pixels per second, picked per enemy
+HEAL_SPAWN_RATE = 1.2        # Healing items per second, on average
+CONTACT_DAMAGE = 60          # Health per second while touching an enemy
+CIRCLE_RADIUS = 150
+# No enemy moves faster than this: ambushers charge at twice their speed and
+# circlers follow the player while going round
+ENEMY_MAX_SPEED = max(ENEMY_SPEED[1] * AMBUSH_BOOST,
+                      PLAYER_SPEED * SPRINT_MULTIPLIER + CIRCLE_SPEED * CIRCLE_RADIUS)
+
+
+class Direction(Enum):
+    NORTH = auto()
+    SOUTH = auto()
+    EAST = auto()
+    WEST = auto()
+
+
+class Controls(namedtuple("Controls", "left right up down sprint attack")):
+    """Player input for one simulation step"""
+    __slots__ = ()
+
+    @classmethod
+    def from_keys(cls, keys, attack=False):
+        return cls(keys[pygame.K_LEFT] or keys[pygame.K_a],
+                   keys[pygame.K_RIGHT] or keys[pygame.K_d],
+                   keys[pygame.K_UP] or keys[pygame.K_w],
+                   keys[pygame.K_DOWN] or keys[pygame.K_s],
+                   keys[pygame.K_LSHIFT], attack)
+
+
+IDLE = Controls(False, False, False, False, False, False)
+
+
+class Mover(pygame.sprite.DirtySprite):
+    """Sprite with a float position and the one from the previous step
+
+    The simulation moves x and y; place() puts the rect somewhere between
+    the previous and the current position for drawing.
+    """
+    def set_position(self, x, y):
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+        self.rect.topleft = (int(x), int(y))
+
+    def save_position(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def place(self, alpha=1.0):
+        x = int(self.prev_x + (self.x - self.prev_x) * alpha)
+        y = int(self.prev_y + (self.y - self.prev_y) * alpha)
+        if self.rect.x != x or self.rect.y != y:
+            self.rect.x = x
+            self.rect.y = y
+            self.dirty = 1
+
+
+# Player class
+class Player(Mover):
+    def __init__(self, x, y):
+        super().__init__()
+        self.image = pygame.Surface([30, 30])
+        self.image.fill(BLUE)
+        self.rect = self.image.get_rect()
+        self.set_position(x, y)
+
+        # Enhanced stats
+        self.health = 100
+        self.max_health = 100
+        self.stamina = 100
+        self.max_stamina = 100
+        self.base_speed = PLAYER_SPEED
+        self.speed = self.base_speed
+        self.attack_power = 10
+        self.defense = 5
+        self.level = 1
+        self.experience = 0
+
+        # Movement state
+        self.sprinting = False
+        self.direction = Direction.SOUTH
+        self.last_attack = -math.inf
+        self.attack_cooldown = 500  # milliseconds
+
+    def move(self, controls, dt):
+        dx = dy = 0
+
+        # Sprint mechanic
+        self.sprinting = controls.sprint and self.stamina > 0
+        self.speed = self.base_speed * (SPRINT_MULTIPLIER if self.sprinting else 1)
+        step = self.speed * dt
+
+        # Diagonal movement
+        if controls.left:
+            dx -= step
+            self.direction = Direction.WEST
+        if controls.right:
+            dx += step
+            self.direction = Direction.EAST
+        if controls.up:
+            dy -= step
+            self.direction = Direction.NORTH
+        if controls.down:
+            dy += step
+            self.direction = Direction.SOUTH
+
+        # Normalize diagonal movement
+        if dx != 0 and dy != 0:
+            dx *= 0.707  # 1/√2
+            dy *= 0.707
+
+        # Update position with boundary checking
+        self.x = max(0, min(WINDOW_WIDTH - self.rect.width, self.x + dx))
+        self.y = max(0, min(WINDOW_HEIGHT - self.rect.height, self.y + dy))
+        self.place()
+
+        # Update stamina
+        if self.sprinting:
+            self.stamina = max(0, self.stamina - STAMINA_DRAIN * dt)
+        else:
+            self.stamina = min(self.max_stamina, self.stamina + STAMINA_REGEN * dt)
+
+    def attack(self, current_time):
+        if current_time - self.last_attack >= self.attack_cooldown:
+            self.last_attack = current_time
+            return True
+        return False
+
+    def level_up(self):
+        if self.experience >= 100:
+            self.level += 1
+            self.experience -= 100
+            self.max_health += 20
+            self.health = self.max_health
+            self.attack_power += 5
+            self.defense += 2
+            return True
+        return False
+
+# Enemy class
+class Enemy(Mover):
+    batch = None  # EnemyBatch moving this enemy, if any
+    slot = None
+
+    def __init__(self, x, y, rng=random):
+        super().__init__()
+        self.image = shared_surface((20, 20), RED)
+        self.rect = self.image.get_rect()
+        self.reset(x, y, rng)
+
+    def reset(self, x, y, rng=random):
+        """(Re)initialize a new or pooled enemy"""
+        self.set_position(x, y)
+        self.dirty = 1
+
+        # Enhanced stats
+        self.health = 50
+        self.max_health = 50
+        self.speed = rng.uniform(*ENEMY_SPEED)
+        self.damage = 10
+        self.behavior_type = rng.choice(['chase', 'circle', 'ambush'])
+        self.attack_range = ENEMY_ATTACK_RANGE
+        self.circle_radius = CIRCLE_RADIUS
+        self.circle_angle = rng.uniform(0, 2 * math.pi)
+        self.last_attack = 0
+        self.attack_cooldown = 1000
+
+    def move_towards_player(self, player, dt, in_range=None):
+        """Move by behavior; `in_range` is the broad-phase answer to the attack range check"""
+        dx = player.x - self.x
+        dy = player.y - self.y
+
+        if self.behavior_type == 'chase':
+            distance = math.hypot(dx, dy)
+            if distance > 0:
+                self.x += (dx / distance) * self.speed * dt
+                self.y += (dy / distance) * self.speed * dt
+
+        elif self.behavior_type == 'circle':
+            self.circle_angle += CIRCLE_SPEED * dt
+            self.x = player.x + math.cos(self.circle_angle) * self.circle_radius
+            self.y = player.y + math.sin(self.circle_angle) * self.circle_radius
+
+        elif self.behavior_type == 'ambush':
+            if in_range is None:
+                in_range = math.hypot(dx, dy) < self.attack_range
+            if not in_range or (dx == 0 and dy == 0):
+                # Stay still when far
+                pass
+            else:
+                # Charge at player when in range
+                distance = math.hypot(dx, dy)
+                self.x += (dx / distance) * self.speed * AMBUSH_BOOST * dt
+                self.y += (dy / distance) * self.speed * AMBUSH_BOOST * dt
+
+        # Keep enemy within screen bounds
+        self.x = max(0, min(WINDOW_WIDTH - self.rect.width, self.x))
+        self.y = max(0, min(WINDOW_HEIGHT - self.rect.height, self.y))
+        self.place()
+
+    def attack_player(self, player, current_time):
+        distance = math.hypot(player.x - self.x, player.y - self.y)
+        if distance < self.attack_range and current_time - self.last_attack >= self.attack_cooldown:
+            player.health -= self.damage
+            self.last_attack = current_time
+            return True
+        return False
+
+    def take_damage(self, amount):
+        self.health -= amount
+        if self.health <= 0:
+            self.kill()
+            return True
+        return False
+
+    def join_batch(self, batch):
+        self.batch = batch
+        self.slot = batch.add(self)
+
+    def kill(self):
+        if self.batch is not None:
+            self.batch.remove(self.slot)
+            self.batch = None
+        super().kill()
+
+
+class HealingItem(pygame.sprite.DirtySprite):
+    def __init__(self, x, y):
+        super().__init__()
+        self.image = shared_surface((15, 15), GREEN)
+        self.rect = self.image.get_rect()
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.rect.x = x
+        self.rect.y = y
+        self.dirty = 1
+
+
+class World:
+    """Action-mode simulation, advanced by an explicit dt and never drawn
+
+    step() moves everything by dt seconds of game time with rates rather
+    than per-frame constants, so the game plays the same at any frame rate
+    and runs headless as fast as the CPU allows. The caller runs it on a
+    fixed timestep and calls interpolate() before drawing. Contacts are
+    found by sweeping the player's box along its move against everything
+    that moved near it, so fast movers and long steps cannot tunnel through
+    each other. What happened during a step (hits, kills, pickups) is
+    queued in `events` for the presentation layer to drain. Enemies and
+    healing items come from sprite pools and go back to them when killed
+    or picked up.
+    """
+    def __init__(self, rng=None, batch=False, enemy_count=5):
+        self.rng = rng or random.Random()
+        self.time = 0.0          # Milliseconds of game time, the cooldown clock
+        self.score = 0
+        self.game_over = False
+        self.events = []
+        # all_sprites is drawn, enemies and pickups are spatially hashed for
+        # range and collision queries
+        self.all_sprites = pygame.sprite.LayeredDirty()
+        self.enemies = SpatialGroup()
+        self.healing_items = SpatialGroup()
+        self.enemy_batch = EnemyBatch(WINDOW_WIDTH, WINDOW_HEIGHT) if batch else None
+        self.enemy_pool = SpritePool(Enemy)
+        self.healing_pool = SpritePool(HealingItem)
+        self._interpolated = False
+
+        self.player = Player(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+        self.all_sprites.add(self.player)
+        for _ in range(enemy_count):
+            self.spawn_enemy(self.rng.randint(0, WINDOW_WIDTH), self.rng.randint(0, WINDOW_HEIGHT))
+
+    def spawn_enemy(self, x, y):
+        enemy = self.enemy_pool.acquire(x, y, self.rng)
+        if self.enemy_batch is not None:
+            enemy.join_batch(self.enemy_batch)
+        self.all_sprites.add(enemy)
+        self.enemies.add(enemy)
+        return enemy
+
+    def spawn_healing(self, x, y):
+        healing = self.healing_pool.acquire(x, y)
+        self.healing_items.add(healing)
+        self.all_sprites.add(healing)
+        return healing
+
+    def interpolate(self, alpha):
+        """Place sprites `alpha` of the way from the last step to this one"""
+        self.player.place(alpha)
+        if self.enemy_batch is not None:
+            self.enemy_batch.sync(alpha)
+        else:
+            for enemy in self.enemies:
+                enemy.place(alpha)
+        self._interpolated = alpha != 1.0
+
+    def step(self, dt, controls=IDLE):
+        """Advance the simulation by dt seconds"""
+        if self.game_over:
+            return
+        if self._interpolated:
+            self.interpolate(1.0)
+        self.time += dt * 1000
+        player = self.player
+        enemies = self.enemies
+        rng = self.rng
+
+        if controls.attack and player.attack(self.time):
+            # Check for enemies in range
+            for enemy in enemies.query_radius(player.rect.x, player.rect.y, PLAYER_ATTACK_RANGE):
+                self.events.append(("damage", enemy, player.attack_power))
+                if enemy.take_damage(player.attack_power):
+                    self.enemy_pool.release(enemy)
+                    self.score += 20
+                    self.events.append(("kill", enemy, 20))
+
+        player.save_position()
+        player.move(controls, dt)
+        if self.enemy_batch is not None:
+            self.enemy_batch.update(player.x, player.y, dt)
+            self.enemy_batch.sync()
+        else:
+            in_range = set(enemies.query_radius(player.rect.x, player.rect.y, ENEMY_ATTACK_RANGE))
+            for enemy in enemies:
+                enemy.save_position()
+                enemy.move_towards_player(player, dt, enemy in in_range)
+        enemies.refresh()
+
+        # Spawn healing items
+        if rng.random() < HEAL_SPAWN_RATE * dt:
+            self.spawn_healing(rng.randint(0, WINDOW_WIDTH), rng.randint(0, WINDOW_HEIGHT))
+
+        # Check collisions along the whole step, not just where it ended
+        box = (player.prev_x, player.prev_y, player.rect.width, player.rect.height)
+        dx = player.x - player.prev_x
+        dy = player.y - player.prev_y
+        if swept_hits(enemies, box, dx, dy, self._enemy_motion, ENEMY_MAX_SPEED * dt):
+            player.health -= CONTACT_DAMAGE * dt
+            self.events.append(("hit", player, CONTACT_DAMAGE * dt))
+            if player.health <= 0:
+                self.game_over = True
+                self.events.append(("game_over", player, self.score))
+
+        # Check for healing item collisions
+        healing_hits = [healing for _, healing in swept_hits(self.healing_items, box, dx, dy, _resting)]
+        for healing in healing_hits:
+            self.healing_pool.release(healing)
+        if healing_hits:
+            player.health = min(100, player.health + 20)
+            self.score += 10
+            self.events.append(("pickup", healing_hits[0], 10))
+
+    def _enemy_motion(self, enemy):
+        """Where an enemy started this step and how far it moved"""
+        batch = enemy.batch
+        if batch is not None:
+            x = float(batch.prev_x[enemy.slot])
+            y = float(batch.prev_y[enemy.slot])
+        else:
+            x = enemy.prev_x
+            y = enemy.prev_y
+        return (x, y, enemy.x - x, enemy.y - y)
+
+    def pools(self):
+        return (self.enemy_pool, self.healing_pool)
+
+    def drain_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+
+def _resting(sprite):
+    return (sprite.rect.x, sprite.rect.y, 0, 0)
+
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into whole simulation steps"""
+    def __init__(self, step=STEP, max_steps=MAX_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0   # Seconds skipped because the simulation fell behind
+
+    def advance(self, frame_time):
+        """Add frame_time seconds, returns how many steps to run now"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.step
+            self.accumulator -= (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a step left over, for interpolating the drawn frame"""
+        return self.accumulator / self.step
+
+
+if __name__ == "__main__":
+    # Headless fast-forward for balance testing: simulated minutes of a bot
+    # wandering and swinging at whatever comes close
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Fast-forward the action-mode simulation")
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch", action="store_true", help="move enemies with the NumPy batch")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    steps = int(args.minutes * 60 / STEP)
+    lives = []
+    world = World(random.Random(rng.random()), args.batch)
+    controls = IDLE
+    start = time.perf_counter()
+    for i in range(steps):
+        if i % 30 == 0:
+            move = [rng.random() < 0.5 for _ in range(4)]
+            controls = Controls(*move, rng.random() < 0.3, True)
+        world.step(STEP, controls)
+        if world.game_over:
+            lives.append((world.time / 1000, world.score))
+            world = World(random.Random(rng.random()), args.batch)
+    elapsed = time.perf_counter() - start
+    if not lives or world.time:
+        lives.append((world.time / 1000, world.score))
+
+    simulated = steps * STEP
+    print(f"{args.minutes:g} simulated minutes in {elapsed:.2f} s "
+          f"({simulated / elapsed:.0f}x real time), {len(lives)} lives")
+    for pool in world.pools():
+        print(f"  {pool.report()}")
+    survived = [seconds for seconds, _ in lives]
+    scores = [score for _, score in lives]
+    print(f"  survival: mean {sum(survived) / len(survived):.1f} s, max {max(survived):.1f} s")
+    print(f"  score:    mean {sum(scores) / len(scores):.1f}, max {max(scores)}")